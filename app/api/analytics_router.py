@@ -4,11 +4,14 @@ from datetime import date
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.data.sql_alchemey_repository_impl import SQLAlchemyStudentRepositoryImpl
-from app.services.analytics_service import AnalyticsService
+from app.core.async_db import get_async_db
+from app.data.sql_alchemey_repository_impl import (SQLAlchemyStudentRepositoryImpl,
+                                                   SQLAlchemyDailyStatsRepositoryImpl)
+from app.data.season_snapshot import current_season_snapshot
+from app.services.analytics_cache import analytics_cache
+from app.services.analytics_service import AnalyticsService, AsyncAnalyticsService
 from app.utils.date_utils import TimePeriod
 
 logger = logging.getLogger(__name__)
@@ -16,11 +19,18 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
+def get_analytics_service(session: AsyncSession, season_snapshot=None) -> AsyncAnalyticsService:
+    """Analytics service answering period statistics from the daily stats rollup."""
+    return AsyncAnalyticsService(session, lambda sync_session: AnalyticsService(
+        SQLAlchemyStudentRepositoryImpl(sync_session), analytics_cache,
+        SQLAlchemyDailyStatsRepositoryImpl(sync_session), season_snapshot))
+
+
 @router.get("/age-groups")
-def get_age_group_statistics(
+async def get_age_group_statistics(
     start_date: Optional[date] = Query(None, description="Start date for analysis"),
     end_date: Optional[date] = Query(None, description="End date for analysis"),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Get count of guests by age group (Adults, Teens, Kids).
@@ -44,15 +54,15 @@ def get_age_group_statistics(
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
     
-    analytics_service = AnalyticsService(SQLAlchemyStudentRepositoryImpl(session))
-    return analytics_service.get_age_group_statistics(start_date, end_date)
+    analytics_service = get_analytics_service(session)
+    return await analytics_service.get_age_group_statistics(start_date, end_date)
 
 
 @router.get("/surf-lessons")
-def get_surf_lesson_statistics(
+async def get_surf_lesson_statistics(
     start_date: Optional[date] = Query(None, description="Start date for analysis"),
     end_date: Optional[date] = Query(None, description="End date for analysis"),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Get comprehensive surf lesson statistics.
@@ -77,15 +87,15 @@ def get_surf_lesson_statistics(
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
     
-    analytics_service = AnalyticsService(SQLAlchemyStudentRepositoryImpl(session))
-    return analytics_service.get_surf_lesson_statistics(start_date, end_date)
+    analytics_service = get_analytics_service(session)
+    return await analytics_service.get_surf_lesson_statistics(start_date, end_date)
 
 
 @router.get("/skill-levels")
-def get_skill_level_distribution(
+async def get_skill_level_distribution(
     start_date: Optional[date] = Query(None, description="Start date for analysis"),
     end_date: Optional[date] = Query(None, description="End date for analysis"),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Get distribution of surf skill levels (only counts guests who have booked lessons).
@@ -109,14 +119,14 @@ def get_skill_level_distribution(
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
     
-    analytics_service = AnalyticsService(SQLAlchemyStudentRepositoryImpl(session))
-    return analytics_service.get_level_distribution(start_date, end_date)
+    analytics_service = get_analytics_service(session)
+    return await analytics_service.get_level_distribution(start_date, end_date)
 
 
 @router.get("/monthly/{year}")
-def get_monthly_overview(
+async def get_monthly_overview(
     year: int,
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Get monthly overview for an entire year.
@@ -134,15 +144,42 @@ def get_monthly_overview(
     if year < 2020 or year > 2100:
         raise HTTPException(status_code=400, detail="Year must be between 2020 and 2100")
     
-    analytics_service = AnalyticsService(SQLAlchemyStudentRepositoryImpl(session))
-    return analytics_service.get_monthly_overview(year)
+    analytics_service = get_analytics_service(session)
+    return await analytics_service.get_monthly_overview(year)
+
+
+@router.get("/year-over-year")
+async def get_year_over_year(
+    years: List[int] = Query(..., description="Years to compare, e.g. years=2024&years=2025"),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Compare the monthly overview of several years.
+    
+    Parameters:
+    - years: The years to compare (at most 10)
+    
+    Returns:
+    - List with the monthly statistics of each year; months after the first year include
+      total_guests_change and total_lessons_change compared to the previous listed year
+    """
+    logger.info(f"GET /analytics/year-over-year called with years={years}")
+    
+    # Validate years
+    if len(years) > 10:
+        raise HTTPException(status_code=400, detail="At most 10 years can be compared")
+    if any(year < 2020 or year > 2100 for year in years):
+        raise HTTPException(status_code=400, detail="Year must be between 2020 and 2100")
+    
+    analytics_service = get_analytics_service(session)
+    return await analytics_service.get_year_over_year(years)
 
 
 @router.get("/comprehensive")
-def get_comprehensive_statistics(
+async def get_comprehensive_statistics(
     start_date: Optional[date] = Query(None, description="Start date for analysis"),
     end_date: Optional[date] = Query(None, description="End date for analysis"),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all statistics combined.
@@ -166,12 +203,39 @@ def get_comprehensive_statistics(
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
     
-    analytics_service = AnalyticsService(SQLAlchemyStudentRepositoryImpl(session))
-    return analytics_service.get_comprehensive_statistics(start_date, end_date)
+    analytics_service = get_analytics_service(session)
+    return await analytics_service.get_comprehensive_statistics(start_date, end_date)
+
+
+@router.get("/lessons-per-day")
+async def get_lessons_per_day_forecast(
+    start_date: date = Query(..., description="Start date for the forecast"),
+    end_date: date = Query(..., description="End date for the forecast"),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the number of planned surf lessons for each day.
+    
+    Parameters:
+    - start_date: Start date for the forecast
+    - end_date: End date for the forecast
+    
+    Returns:
+    - List of dictionaries with date and number of planned lessons
+    """
+    logger.info(f"GET /analytics/lessons-per-day called with start_date={start_date}, end_date={end_date}")
+    
+    # Validate dates
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
+    
+    season_snapshot = await session.run_sync(current_season_snapshot)
+    analytics_service = get_analytics_service(session, season_snapshot)
+    return await analytics_service.get_lessons_per_day_forecast(start_date, end_date)
 
 
 @router.get("/flexible")
-def get_flexible_analytics(
+async def get_flexible_analytics(
     start_date: date = Query(..., description="Start date for analysis"),
     end_date: date = Query(..., description="End date for analysis"),
     period: TimePeriod = Query(TimePeriod.WEEKLY, description="Time period granularity (daily, weekly, monthly)"),
@@ -181,7 +245,7 @@ def get_flexible_analytics(
                    "surf_lessons, yoga_lessons, skate_lessons, beginner, beginner_plus, "
                    "intermediate, advanced, teen_students, kid_students"
     ),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Get flexible analytics data with customizable time periods and filters.
@@ -231,5 +295,5 @@ def get_flexible_analytics(
                 detail=f"Invalid filters: {invalid_filters}. Valid filters are: {valid_filters}"
             )
     
-    analytics_service = AnalyticsService(SQLAlchemyStudentRepositoryImpl(session))
-    return analytics_service.get_flexible_analytics(start_date, end_date, period, filter_set)
+    analytics_service = get_analytics_service(session)
+    return await analytics_service.get_flexible_analytics(start_date, end_date, period, filter_set)
@@ -1,12 +1,20 @@
 from datetime import date
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.api.pagination import (page_response, is_page_request, FIELDS_DESCRIPTION, CURSOR_DESCRIPTION,
+                                LIMIT_DESCRIPTION)
+from app.core.async_db import get_async_db
 from app.core.db import get_db
+from app.core.profiling import ProfiledRoute
 from app.domain.models import Team
-from app.services.crew_service import CrewService
+from app.services.crew_reference_cache import crew_reference_cache
+from app.services.crew_service import CrewService, AsyncCrewService
+from app.services.html_renderer import render_crew_calendar
 from app.data.sql_alchemey_repository_impl import (
     SQLAlchemyCrewMemberRepositoryImpl,
     SQLAlchemyPositionRepositoryImpl,
@@ -14,8 +22,15 @@ from app.data.sql_alchemey_repository_impl import (
     SQLAlchemyAccommodationRepositoryImpl,
     SQLAlchemyAccommodationAssignmentRepositoryImpl
 )
+from app.data.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidPageRequest
+from app.data.async_repository_impl import (
+    AsyncSQLAlchemyCrewMemberRepositoryImpl,
+    AsyncSQLAlchemyPositionRepositoryImpl,
+    AsyncSQLAlchemyCrewAssignmentRepositoryImpl,
+    AsyncSQLAlchemyAccommodationRepositoryImpl
+)
 
-router = APIRouter(prefix="/crew", tags=["crew"])
+router = APIRouter(prefix="/crew", tags=["crew"], route_class=ProfiledRoute)
 
 
 # Pydantic models for request/response validation
@@ -136,7 +151,18 @@ def get_crew_service(session: Session = Depends(get_db)) -> CrewService:
         position_repo=SQLAlchemyPositionRepositoryImpl(session),
         crew_assignment_repo=SQLAlchemyCrewAssignmentRepositoryImpl(session),
         accommodation_repo=SQLAlchemyAccommodationRepositoryImpl(session),
-        accommodation_assignment_repo=SQLAlchemyAccommodationAssignmentRepositoryImpl(session)
+        accommodation_assignment_repo=SQLAlchemyAccommodationAssignmentRepositoryImpl(session),
+        reference_cache=crew_reference_cache
+    )
+
+
+def get_async_crew_service(session: AsyncSession = Depends(get_async_db)) -> AsyncCrewService:
+    return AsyncCrewService(
+        crew_assignment_repo=AsyncSQLAlchemyCrewAssignmentRepositoryImpl(session),
+        position_repo=AsyncSQLAlchemyPositionRepositoryImpl(session),
+        crew_member_repo=AsyncSQLAlchemyCrewMemberRepositoryImpl(session),
+        accommodation_repo=AsyncSQLAlchemyAccommodationRepositoryImpl(session),
+        reference_cache=crew_reference_cache
     )
 
 
@@ -145,10 +171,15 @@ def get_crew_service(session: Session = Depends(get_db)) -> CrewService:
 @router.get("/crew", response_model=List[CrewMemberResponse])
 def get_crew_members(
     team: Optional[Team] = Query(None, description="Filter by team"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description=LIMIT_DESCRIPTION),
     crew_service: CrewService = Depends(get_crew_service)
 ):
-    """Get all crew members, optionally filtered by team"""
+    """Get all crew members, optionally filtered by team, or one page of them if fields, cursor or limit is set"""
     try:
+        if is_page_request(fields, cursor, limit):
+            return page_response(*crew_service.get_crew_members_page(fields, cursor, limit or DEFAULT_PAGE_SIZE, team))
         crew_members = crew_service.get_crew_members(team)
         return [
             CrewMemberResponse(
@@ -163,6 +194,8 @@ def get_crew_members(
             )
             for cm in crew_members
         ]
+    except InvalidPageRequest as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -274,10 +307,15 @@ def delete_crew_member(
 @router.get("/positions", response_model=List[PositionResponse])
 def get_positions(
     team: Optional[Team] = Query(None, description="Filter by team"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description=LIMIT_DESCRIPTION),
     crew_service: CrewService = Depends(get_crew_service)
 ):
-    """Get all positions, optionally filtered by team"""
+    """Get all positions, optionally filtered by team, or one page of them if fields, cursor or limit is set"""
     try:
+        if is_page_request(fields, cursor, limit):
+            return page_response(*crew_service.get_positions_page(fields, cursor, limit or DEFAULT_PAGE_SIZE, team))
         positions = crew_service.get_positions(team)
         return [
             PositionResponse(
@@ -288,6 +326,8 @@ def get_positions(
             )
             for pos in positions
         ]
+    except InvalidPageRequest as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -422,18 +462,18 @@ def delete_crew_assignment(
 
 
 @router.get("/crew-calendar")
-def get_crew_calendar(
+async def get_crew_calendar(
     start: date = Query(..., description="Start date (yyyy-mm-dd)"),
     end: date = Query(..., description="End date (yyyy-mm-dd)"),
     team: Optional[Team] = Query(None, description="Filter by team"),
-    crew_service: CrewService = Depends(get_crew_service)
+    crew_service: AsyncCrewService = Depends(get_async_crew_service)
 ):
     """Get daily crew planning overview for a date range, filterable by team"""
     try:
         if start > end:
             raise HTTPException(status_code=400, detail="Start date must be before end date")
         
-        calendar = crew_service.get_crew_calendar(start, end, team)
+        calendar = await crew_service.get_crew_calendar(start, end, team)
         return calendar
     except HTTPException:
         raise
@@ -441,14 +481,36 @@ def get_crew_calendar(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/crew-calendar/html", response_class=Response)
+def get_crew_calendar_html(
+    start: date = Query(..., description="Start date (yyyy-mm-dd)"),
+    end: date = Query(..., description="End date (yyyy-mm-dd)"),
+    team: Optional[Team] = Query(None, description="Filter by team"),
+    crew_service: CrewService = Depends(get_crew_service)
+):
+    """Get a printable crew calendar for a date range, filterable by team"""
+    if start > end:
+        raise HTTPException(status_code=400, detail="Start date must be before end date")
+    try:
+        calendar = crew_service.get_crew_calendar(start, end, team)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(render_crew_calendar(calendar), media_type="text/html; charset=utf-8")
+
+
 # Accommodation Endpoints
 
 @router.get("/accommodations", response_model=List[AccommodationResponse])
 def get_accommodations(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description=LIMIT_DESCRIPTION),
     crew_service: CrewService = Depends(get_crew_service)
 ):
-    """Get all accommodations"""
+    """Get all accommodations, or one page of them if fields, cursor or limit is set"""
     try:
+        if is_page_request(fields, cursor, limit):
+            return page_response(*crew_service.get_accommodations_page(fields, cursor, limit or DEFAULT_PAGE_SIZE))
         accommodations = crew_service.get_accommodations()
         return [
             AccommodationResponse(
@@ -460,6 +522,8 @@ def get_accommodations(
             )
             for acc in accommodations
         ]
+    except InvalidPageRequest as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,105 @@
+"""Internal endpoints for operating the service (not used by the frontend)."""
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from app.core.config import INTERNAL_TOKEN
+from app.core.data_version import bump_data_version
+from app.core.db import get_db, get_pool_status
+from app.core.profiling import (ProfiledRoute, PROFILE_TOKEN_HEADER, PSTATS_SUFFIX, is_authorized,
+                                list_profiles, load_profile)
+from app.core.query_stats import route_query_stats
+from app.data.sql_alchemey_repository_impl import SQLAlchemyDailyStatsRepositoryImpl
+from app.services.analytics_cache import analytics_cache
+
+router = APIRouter(prefix="/internal", tags=["internal"], route_class=ProfiledRoute)
+
+INTERNAL_TOKEN_HEADER = "X-Internal-Token"
+
+
+def require_internal_token(token: Optional[str] = Header(None, alias=INTERNAL_TOKEN_HEADER)):
+    if not INTERNAL_TOKEN or token is None or not hmac.compare_digest(token, INTERNAL_TOKEN):
+        raise HTTPException(status_code=403, detail="Internal endpoints are not enabled or the token is invalid")
+
+
+@router.get("/db/pool", dependencies=[Depends(require_internal_token)])
+def get_db_pool_status():
+    """
+    Get connection pool usage and activity counters.
+
+    Returns:
+    - pool_size, checked_in, checked_out and overflow (QueuePool only)
+    - checkouts, connects, invalidations (stale connections detected by pre-ping), waits
+    """
+    return get_pool_status()
+
+
+@router.get("/db/queries", dependencies=[Depends(require_internal_token)])
+def get_db_query_stats():
+    """
+    Get the SQL queries issued per route since startup.
+
+    Returns:
+    - slow_query_threshold_ms and the number of slow_queries logged
+    - routes: requests, queries, max_queries, queries_per_request and db_seconds per route,
+      routes with the most queries first
+    """
+    return route_query_stats.as_dict()
+
+
+@router.get("/cache/analytics", dependencies=[Depends(require_internal_token)])
+def get_analytics_cache_stats():
+    """
+    Get analytics cache statistics.
+
+    Returns:
+    - hits, misses, hit_ratio, evictions (LRU) and expirations (TTL)
+    - size, max_entries and ttl_seconds
+    """
+    return analytics_cache.stats()
+
+
+@router.post("/daily-stats/rebuild", dependencies=[Depends(require_internal_token)])
+def rebuild_daily_stats(session: Session = Depends(get_db)):
+    """
+    Rebuild the daily stats rollup from all students.
+
+    Only needed after students were changed outside of the application.
+    """
+    SQLAlchemyDailyStatsRepositoryImpl(session).rebuild()
+    bump_data_version()
+    return {"status": "rebuilt"}
+
+
+def require_profiling_token(token: Optional[str] = Header(None, alias=PROFILE_TOKEN_HEADER)):
+    if not is_authorized(token):
+        raise HTTPException(status_code=403, detail="Profiling is not enabled or the token is invalid")
+
+
+@router.get("/profiles", dependencies=[Depends(require_profiling_token)])
+def get_profiles():
+    """
+    List the stored request profiles, newest first.
+
+    Profile a request by sending the profiling token in the X-Profile-Token header
+    (or the profile_token query parameter), the response has the profile id in X-Profile-Id.
+    """
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_profiling_token)])
+def get_profile(profile_id: str):
+    """
+    Get a stored profile.
+
+    Returns:
+    - collapsed stacks as text (pyinstrument), ready for flamegraph.pl, inferno or speedscope
+    - a pstats dump (cProfile), for snakeviz or flameprof
+    """
+    content = load_profile(profile_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    media_type = "application/octet-stream" if profile_id.endswith(PSTATS_SUFFIX) else "text/plain; charset=utf-8"
+    return Response(content=content, media_type=media_type)
@@ -0,0 +1,12 @@
+"""Prometheus metrics endpoint."""
+from fastapi import APIRouter, Response
+
+from app.core.metrics import registry, CONTENT_TYPE
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Get request, import and export metrics of this worker in the Prometheus text format."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
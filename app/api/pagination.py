@@ -0,0 +1,25 @@
+"""Response helpers for keyset paginated list endpoints (see app.data.pagination)."""
+from typing import Dict, List, Optional
+
+from app.api.responses import DomainJSONResponse
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+FIELDS_DESCRIPTION = "Comma separated fields to return, e.g. id,first_name"
+CURSOR_DESCRIPTION = f"Cursor of the next page, taken from the {NEXT_CURSOR_HEADER} header"
+LIMIT_DESCRIPTION = "Maximum number of items per page"
+
+
+def is_page_request(fields: Optional[str], cursor: Optional[str], limit: Optional[int]) -> bool:
+    """Whether a list endpoint was called with any pagination or projection parameter."""
+    return fields is not None or cursor is not None or limit is not None
+
+
+def page_response(items: List[Dict], next_cursor: Optional[str]) -> DomainJSONResponse:
+    """
+    Return a page as a JSON list, with the cursor of the next page in the X-Next-Cursor header.
+
+    The header is omitted on the last page.
+    """
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return DomainJSONResponse(content=items, headers=headers)
@@ -0,0 +1,37 @@
+"""Fast JSON responses for domain objects.
+
+FastAPI walks every returned object through jsonable_encoder, which inspects
+each dataclass, field and value in Python before the result is dumped. orjson
+serializes the domain dataclasses (Student, SurfPlan, Slot, Group, ...),
+dates, datetimes and enums natively in C with the same output, so routes
+returning large domain graphs return a DomainJSONResponse directly and skip
+jsonable_encoder altogether.
+"""
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Non string keys: analytics use ints as keys (e.g. the lesson distribution)
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types orjson does not know (Decimal, sets, pydantic models, ...)"""
+    encoded = jsonable_encoder(value)
+    if encoded is value:
+        raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+    return encoded
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize domain objects to JSON bytes"""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class DomainJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, for domain dataclasses and plain data."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,27 +1,96 @@
 import logging
-import pandas as pd
+import time
 from collections import defaultdict
 from datetime import date, timedelta, datetime
-from fastapi import APIRouter, Depends, Query, Response, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, Header, Query, Response, UploadFile, File, HTTPException
 from io import BytesIO
 from sqlalchemy.orm import Session
 from typing import Optional
 from fastapi.responses import StreamingResponse
+from app.api.responses import DomainJSONResponse
+from app.api.pagination import page_response, FIELDS_DESCRIPTION, CURSOR_DESCRIPTION, LIMIT_DESCRIPTION
 from app.core.db import get_db
+from app.core.metrics import export_duration_seconds
+from app.core.profiling import ProfiledRoute
+from app.data.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidPageRequest
+from app.data.season_snapshot import build_season_snapshot, current_season_snapshot
 from app.data.sql_alchemey_repository_impl import SQLAlchemyStudentRepositoryImpl, SQLAlchemyBookingRawRepositoryImpl
 from app.data.sql_alchemey_repository_impl import SQLAlchemySurfPlanRepositoryImpl
+from app.services.presence_index import presence_index
 from app.services.student_service import StudentService
 from app.services.surf_plan_service import SurfPlanService
 from app.services.tide_service_interface import TideServiceMockImpl
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from app.services.student_transformer_service import StudentTransformerService
+from app.services.export_cache import ExportCache, etag_matches
+from app.services.html_renderer import render_student_groups, render_surf_plan
 from app.utils.date_utils import get_next_sunday, get_saturday_after_sunday, is_sunday
 
 from app.domain.models import SurfPlan, Slot, Group
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+export_cache = ExportCache()
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def cached_export_response(if_none_match: Optional[str], export_type: str, params: dict,
+                           media_type: str, build, filename: Optional[str] = None) -> Response:
+    """
+    Serve an export from the export cache, building it only on a cache miss.
+
+    The cache key doubles as ETag, so clients sending If-None-Match get a 304
+    as long as neither the parameters nor the underlying data changed.
+    """
+    key = export_cache.make_key(export_type, params)
+    headers = {"ETag": f'"{key}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, key):
+        return Response(status_code=304, headers=headers)
+
+    content = export_cache.get(key)
+    if content is None:
+        logger.debug(f"Export cache miss for {export_type} {params}")
+        with export_duration_seconds.time(export_type=export_type):
+            content = build()
+        export_cache.put(key, content)
+
+    if filename:
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+def cached_streaming_export_response(if_none_match: Optional[str], export_type: str, params: dict,
+                                     media_type: str, render) -> Response:
+    """
+    Like cached_export_response, but streams the export on a cache miss.
+
+    The rendered chunks are collected while streaming and stored once the
+    whole document has been sent.
+    """
+    key = export_cache.make_key(export_type, params)
+    headers = {"ETag": f'"{key}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, key):
+        return Response(status_code=304, headers=headers)
+
+    content = export_cache.get(key)
+    if content is not None:
+        return Response(content=content, media_type=media_type, headers=headers)
+
+    logger.debug(f"Export cache miss for {export_type} {params}")
+
+    def stream_and_store(chunks):
+        parts = []
+        with export_duration_seconds.time(export_type=export_type):
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                parts.append(data)
+                yield data
+        export_cache.put(key, b"".join(parts))
+
+    return StreamingResponse(stream_and_store(render()), media_type=media_type, headers=headers)
 
 
 @router.get("/test-cors")
@@ -32,14 +101,16 @@ def test_cors():
 @router.post("/import-bookings")
 async def import_bookings(file: UploadFile = File(...),
                           session: Session = Depends(get_db)):
-    if not file.filename.endswith(".csv"):
-        raise HTTPException(status_code=400, detail="Only CSV files are allowed.")
+    if not file.filename.lower().endswith((".csv", ".xlsx")):
+        raise HTTPException(status_code=400, detail="Only CSV and XLSX files are allowed.")
     try:
         student_transformer_service = \
             StudentTransformerService(SQLAlchemyBookingRawRepositoryImpl(session),
-                                      SQLAlchemyStudentRepositoryImpl(session))
+                                      SQLAlchemyStudentRepositoryImpl(session),
+                                      presence_index)
         student_transformer_service.import_csv_file(file)
-        return {"message": "CSV imported successfully"}
+        build_season_snapshot(session)
+        return {"message": "Bookings imported successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
@@ -96,16 +167,25 @@ def get_diets_summary_of_next_week(date: Optional[date] = Query(None),
 @router.get("/students/oncamp")
 def get_surf_plan(date: Optional[date] = date.today(),
                   session: Session = Depends(get_db)):
-    student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session))
-    return student_service.get_all_students_for_date(date)
+    student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session),
+                                     presence_index=presence_index.ensure_current(session))
+    return DomainJSONResponse(student_service.get_all_students_for_date(date))
+
+
+@router.get("/students/manifest")
+def get_manifest(day: date = Query(default_factory=date.today), session: Session = Depends(get_db)):
+    """Get the students arriving and departing on a day and the number of students present."""
+    student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session),
+                                     presence_index=presence_index.ensure_current(session))
+    return DomainJSONResponse(student_service.get_manifest(day))
 
 
 @router.get("/students")
 def get_surf_plan(start: Optional[date] = date.today(),
                   end: Optional[date] = date.today(),
                   session: Session = Depends(get_db)):
-    student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session))
-    return student_service.get_students_with_booked_lessons_by_date_range(start, end)
+    student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session), current_season_snapshot(session))
+    return DomainJSONResponse(student_service.get_students_with_booked_lessons_by_date_range(start, end))
 
 
 # @router.get("/surfplan")
@@ -128,18 +208,18 @@ def surf_groups_for_week(sunday: date, session: Session = Depends(get_db)):
 
     surf_plan_service = SurfPlanService(
         SQLAlchemySurfPlanRepositoryImpl(session),
-        StudentService(SQLAlchemyStudentRepositoryImpl(session)),
+        StudentService(SQLAlchemyStudentRepositoryImpl(session), current_season_snapshot(session)),
         TideServiceMockImpl())
 
-    return surf_plan_service.generate_surf_groups_for_week(sunday);
+    return DomainJSONResponse(surf_plan_service.generate_surf_groups_for_week(sunday))
 
 
-@router.get("/surfplan")
-def surf_groups_for_surf_plan(day: date, session: Session = Depends(get_db)):
-    """Get surf plan for a specific day."""
+def surf_groups_for_surf_plan(day: date, session: Session) -> SurfPlan:
+    """Build the surf plan for a specific day."""
     surf_plan_service = SurfPlanService(
         SQLAlchemySurfPlanRepositoryImpl(session),
-        StudentService(SQLAlchemyStudentRepositoryImpl(session)),
+        StudentService(SQLAlchemyStudentRepositoryImpl(session),
+                       presence_index=presence_index.ensure_current(session)),
         TideServiceMockImpl())
 
     surf_groups = surf_plan_service.generate_surf_groups_for_day(day)
@@ -164,21 +244,46 @@ def surf_groups_for_surf_plan(day: date, session: Session = Depends(get_db)):
     return SurfPlan(plan_date=day, slots=slots, non_participating_guests=surf_groups["non_participating_guests"])
 
 
+@router.get("/surfplan")
+def get_surf_plan_for_day(day: date, session: Session = Depends(get_db)):
+    """Get surf plan for a specific day."""
+    return DomainJSONResponse(surf_groups_for_surf_plan(day, session))
+
+
+@router.get("/surfplan/html", response_class=Response)
+def surf_plan_as_html(day: date, session: Session = Depends(get_db)):
+    """Get a printable surf plan for a specific day."""
+    surf_plan = surf_groups_for_surf_plan(day, session)
+    return StreamingResponse(render_surf_plan(surf_plan), media_type="text/html; charset=utf-8")
+
+
 @router.get("/students/groups/export")
-def export_students_to_excel(sunday: date, session: Session = Depends(get_db)):
+def export_students_to_excel(sunday: date,
+                             if_none_match: Optional[str] = Header(None),
+                             session: Session = Depends(get_db)):
     """Export students groups for a week to Excel."""
     if not is_sunday(sunday):
         raise HTTPException(status_code=400, detail=f"{sunday} is not a sunday!")
+    # Ages are computed for today, so a cached workbook is only valid until midnight
+    today = date.today()
 
-    surf_plan_service = SurfPlanService(
-        SQLAlchemySurfPlanRepositoryImpl(session),
-        StudentService(SQLAlchemyStudentRepositoryImpl(session)),
-        TideServiceMockImpl())
-    surf_groups = surf_plan_service.generate_surf_groups_for_week(sunday)
+    def build():
+        surf_plan_service = SurfPlanService(
+            SQLAlchemySurfPlanRepositoryImpl(session),
+            StudentService(SQLAlchemyStudentRepositoryImpl(session), current_season_snapshot(session)),
+            TideServiceMockImpl())
+        surf_groups = surf_plan_service.generate_surf_groups_for_week(sunday)
+        return create_excel_week_overview(sunday, surf_groups, today)
 
-    return create_excel_week_overview(sunday, surf_groups)
+    return cached_export_response(if_none_match, "week_overview_xlsx",
+                                  {"sunday": sunday.isoformat(), "today": today.isoformat()},
+                                  XLSX_MEDIA_TYPE, build, filename="weekly_surf_plan.xlsx")
+
+
+def create_excel_week_overview(sunday, surf_groups, today: Optional[date] = None) -> bytes:
+    import pandas as pd
+    from app.utils.lesson_allocation import planned_lesson_days, ages_on
 
-def create_excel_week_overview(sunday, surf_groups):
     output = BytesIO()
     with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
         workbook = writer.book
@@ -187,9 +292,10 @@ def create_excel_week_overview(sunday, surf_groups):
 
         weekdays = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
         for i, day in enumerate(weekdays):
-            date = sunday + timedelta(days=i)
-            worksheet.write(0, i + 3, f"{day} ({date.strftime('%d.%m.%Y')})")
+            day_date = sunday + timedelta(days=i)
+            worksheet.write(0, i + 3, f"{day} ({day_date.strftime('%d.%m.%Y')})")
 
+        today = today or date.today()
         row = 2
         for level in ["beginner", "beginner_plus", "intermediate", "advanced", "teens", "kids"]:
             students = surf_groups[level]
@@ -205,24 +311,15 @@ def create_excel_week_overview(sunday, surf_groups):
                                  "Arrival", "Departure", "Tent"])
             row += 1
 
-            for student in students:
-                age = (datetime.now().date() - student.birthday).days // 365 if student.birthday else ""
+            lesson_days = planned_lesson_days(students, sunday, 7)
+            ages = ages_on(students, today)
+            for student, age, student_lesson_days in zip(students, ages, lesson_days):
                 student_row = [
                     student.first_name,
                     student.last_name,
                     age,
+                    *(1 if planned else "" for planned in student_lesson_days),
                 ]
-                lesson_start = student.arrival + timedelta(days=1)
-                planned_lessons = 0
-
-                for i in range(7):
-                    current_day = sunday + timedelta(days=i)
-                    if lesson_start <= current_day < student.departure and planned_lessons < student.number_of_surf_lessons:
-                        student_row.append(1)
-                        planned_lessons += 1
-                    else:
-                        student_row.append("")
-
                 student_row.extend([student.number_of_surf_lessons, level, student.arrival.strftime('%d.%m.%Y'),
                                     student.departure.strftime('%d.%m.%Y'), student.tent])
                 worksheet.write_row(row, 0, student_row)
@@ -230,21 +327,31 @@ def create_excel_week_overview(sunday, surf_groups):
 
             row += 2
 
-    output.seek(0)
-    return StreamingResponse(output, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                             headers={"Content-Disposition": "attachment; filename=weekly_surf_plan.xlsx"})
+    return output.getvalue()
 
 
+@router.get("/students/students")
 def get_students(
-        start_date: Optional[date] = date.today(),
-        end_date: Optional[date] = date.today(),
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+        cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description=LIMIT_DESCRIPTION),
+        order_by: str = Query("id", pattern="^(id|arrival)$", description="Sort by id or by arrival, then id"),
         session: Session = Depends(get_db)):
-    student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session))
+    """
+    Get one page of students whose stay overlaps start_date..end_date (all students if not set).
 
-    if start_date and end_date:
-        return student_service.get_students_with_booked_lessons_by_date_range(start_date, end_date)
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    """
+    student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session))
 
-    return student_service.get_all_students()
+    try:
+        items, next_cursor = student_service.get_students_page(fields, cursor, limit, order_by,
+                                                               start_date, end_date)
+    except InvalidPageRequest as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_response(items, next_cursor)
 
 
 @router.get("/kids")
@@ -256,8 +363,8 @@ def get_kids(
 
     students = student_service.get_students_by_date_range(start, end)
 
-    return [kid for kid in students if
-            kid.age_group and kid.age_group != "" and kid.age_group != "Adults >18 years"]
+    return DomainJSONResponse([kid for kid in students if
+                               kid.age_group and kid.age_group != "" and kid.age_group != "Adults >18 years"])
 
 
 @router.get("/students/export")
@@ -265,6 +372,7 @@ def export_students_to_excel(
         start: Optional[date] = date.today(),
         end: Optional[date] = date.today(),
         session: Session = Depends(get_db)):
+    started = time.perf_counter()
     student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session))
 
     if start:
@@ -272,6 +380,8 @@ def export_students_to_excel(
     else:
         students = student_service.get_all_students()
 
+    import pandas as pd
+
     # Grouping logic
     beginner = []
     beginner_plus = []
@@ -335,6 +445,7 @@ def export_students_to_excel(
             write_sheet("Kids", kids)
 
     output.seek(0)
+    export_duration_seconds.observe(time.perf_counter() - started, export_type="students_xlsx")
     return Response(
         content=output.read(),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -346,9 +457,18 @@ def export_students_to_excel(
 @router.get("/students/export/html", response_class=Response)
 def export_students_as_html(
         date: Optional[date] = Query(None),
+        if_none_match: Optional[str] = Header(None),
         session: Session = Depends(get_db)):
-    student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session))
+    def render():
+        student_service = StudentService(SQLAlchemyStudentRepositoryImpl(session))
+        return render_student_groups(group_students_for_html_export(student_service, date))
+
+    return cached_streaming_export_response(if_none_match, "students_html",
+                                            {"date": date.isoformat() if date else None},
+                                            "text/html; charset=utf-8", render)
 
+
+def group_students_for_html_export(student_service: StudentService, date: Optional[date]):
     if date:
         students = student_service.get_students_with_booked_lessons_by_date_range(date, date)
     else:
@@ -371,25 +491,7 @@ def export_students_as_html(
                 level = "BEGINNER"
             groups[level].append(student)
 
-    html = "<html><head><title>Students Export</title></head><body>"
-    for group_name, group_students in groups.items():
-        df = pd.DataFrame([{
-            "first name": s.first_name,
-            "last name": s.last_name,
-            "age group": s.age_group,
-            "birthday": s.birthday,
-            "gender": s.gender,
-            "booking bumber": s.booking_number,
-            "arrival": s.arrival,
-            "departure": s.departure,
-            "number of surflessons booked": s.number_of_surf_lessons,
-            "level": s.level
-        } for s in group_students])
-        html += f"<h2>{group_name}</h2>"
-        html += df.to_html(index=False)
-
-    html += "</body></html>"
-    return html
+    return groups
 
     @router.get("/transform/students")
     def transform_students(session: Session = Depends(get_db)):
@@ -411,6 +513,8 @@ def export_bookings_to_excel(
     bookings = booking_repository.get_for_date_inclusive(start, end)
     logger.debug(f"Found {len(bookings)} bookings")
 
+    import pandas as pd
+
     output = BytesIO()
     with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
         def write_sheet(name, bookings):
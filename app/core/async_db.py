@@ -0,0 +1,98 @@
+"""Async database access with SQLAlchemy AsyncSession.
+
+The async engine is created on first use so that the async drivers
+(aiomysql, aiosqlite) are only imported when an async route is called.
+"""
+import logging
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.engine import make_url, URL
+
+from app.core.config import (DATABASE_URL, ASYNC_DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW,
+                             DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING)
+from app.core.db import apply_sqlite_pragmas, is_sqlite_memory_url, to_shared_memory_url
+from app.core.query_stats import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine = None
+_async_session_factory = None
+
+
+def to_async_url(database_url: str) -> URL:
+    """
+    Convert a sync database URL to its async driver counterpart.
+
+    Args:
+        database_url: Sync URL such as mysql+pymysql://... or sqlite:///...
+
+    Returns:
+        URL using aiomysql or aiosqlite
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    if is_sqlite_memory_url(url):
+        url = to_shared_memory_url(url)
+    return url.set(drivername=_ASYNC_DRIVERS[backend])
+
+
+def create_async_db_engine(database_url: Optional[str] = None):
+    """
+    Create an async engine with the same pool settings as the sync engine.
+
+    Args:
+        database_url: Async URL, defaults to ASYNC_DATABASE_URL or one derived from DATABASE_URL
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = make_url(database_url) if database_url else (
+        make_url(ASYNC_DATABASE_URL) if ASYNC_DATABASE_URL else to_async_url(DATABASE_URL))
+
+    if url.get_backend_name() == "sqlite":
+        kwargs = {}
+    else:
+        kwargs = {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        }
+
+    logger.info(f"Creating async engine for {url.drivername}")
+    async_engine = create_async_engine(url, **kwargs)
+    if url.get_backend_name() == "sqlite":
+        apply_sqlite_pragmas(async_engine.sync_engine, url)
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+
+def get_async_engine():
+    """Get the shared async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+    return _async_engine
+
+
+def get_async_session_factory():
+    """Get the shared async session factory, creating it on first use."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _async_session_factory = async_sessionmaker(get_async_engine(), expire_on_commit=False,
+                                                    autoflush=False)
+    return _async_session_factory
+
+
+# Dependency to get an async database session
+async def get_async_db() -> AsyncIterator:
+    async with get_async_session_factory()() as session:
+        yield session
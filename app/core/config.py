@@ -1,8 +1,57 @@
+import logging
 import os
+import tempfile
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-print(f"DATABASE_URL: {DATABASE_URL}")
+logger.debug(f"DATABASE_URL configured for dialect: {DATABASE_URL.split(':', 1)[0] if DATABASE_URL else None}")
+
+# Async driver URL, derived from DATABASE_URL if not set (mysql+pymysql -> mysql+aiomysql, sqlite -> sqlite+aiosqlite)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Connection pool (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+# MySQL closes idle connections after wait_timeout (8h by default), recycle well before that
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# SQLite profile for single-node deployments (file databases): WAL lets readers run while the import writes,
+# synchronous=NORMAL is durable in WAL mode, mmap and a larger page cache speed up reads
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Export cache: generated export files are stored on local disk and evicted LRU once the size limit is reached
+EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "surfplanner-export-cache"))
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Columnar season snapshot (.npy per column), memory-mapped by every worker
+SEASON_SNAPSHOT_DIR = os.getenv("SEASON_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "surfplanner-season-snapshot"))
+
+# Analytics results are memoized in process, invalidated by the data version and bounded by TTL and entry count
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "300"))
+ANALYTICS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "256"))
+
+# Queries slower than this are logged with the route that issued them; at most QUERY_STATS_MAX_ROUTES routes are tracked
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+QUERY_STATS_MAX_ROUTES = int(os.getenv("QUERY_STATS_MAX_ROUTES", "200"))
+
+# The /internal operations endpoints (pool, query and cache stats, rollup rebuild) require INTERNAL_TOKEN in the
+# X-Internal-Token header; they are disabled if no token is set
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN")
+
+# Requests carrying PROFILING_TOKEN (X-Profile-Token header or profile_token query parameter) are profiled with
+# PROFILER ("pyinstrument" or "cprofile"); profiling is disabled if no token is set
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+PROFILER = os.getenv("PROFILER", "pyinstrument").lower()
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "surfplanner-profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
 
 # if DB_TYPE == "sqlite":
 #     DATABASE_URL = "sqlite:///:memory:"  # In-memory SQLite (for testing)
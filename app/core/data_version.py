@@ -0,0 +1,99 @@
+"""Data version counters used to invalidate artifacts derived from stored data."""
+import fcntl
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from app.core.config import EXPORT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bumped by student and booking writes
+DATA_VERSION = "data_version"
+# Bumped by writes to any crew planner table
+CREW_DATA_VERSION = "crew_data_version"
+# Bumped only by writes to crew members, positions and accommodations
+CREW_REFERENCE_VERSION = "crew_reference_version"
+
+_lock = threading.Lock()
+# Last value read per counter with the (inode, mtime, size) of the file it was read from
+_read_cache: Dict[str, Tuple[Tuple[int, int, int], int]] = {}
+
+
+def _version_file(counter: str) -> str:
+    return os.path.join(EXPORT_CACHE_DIR, counter)
+
+
+def _read_version(version_file: str) -> int:
+    try:
+        with open(version_file, "r") as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+@contextmanager
+def _counter_lock(counter: str):
+    """Hold an exclusive lock on a counter, across threads and worker processes."""
+    os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+    with _lock, open(f"{_version_file(counter)}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def get_data_version(counter: str = DATA_VERSION) -> int:
+    """
+    Get the current data version.
+
+    The version is kept in a small file next to the export cache so that all
+    workers (and restarts) agree on it. Every bump replaces the file, so the
+    value is only read again when a stat of the file shows a change.
+
+    Args:
+        counter: Name of the version counter
+
+    Returns:
+        The current data version, 0 if no write has been recorded yet
+    """
+    version_file = _version_file(counter)
+    try:
+        stat = os.stat(version_file)
+    except FileNotFoundError:
+        return 0
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _read_cache.get(counter)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    version = _read_version(version_file)
+    _read_cache[counter] = (signature, version)
+    return version
+
+
+def bump_data_version(counter: str = DATA_VERSION) -> int:
+    """
+    Record that the data behind a counter has changed.
+
+    The read-modify-write runs under an exclusive file lock, so concurrent
+    bumps from several worker processes are never lost.
+
+    Args:
+        counter: Name of the version counter
+
+    Returns:
+        The new data version
+    """
+    with _counter_lock(counter):
+        version_file = _version_file(counter)
+        new_version = _read_version(version_file) + 1
+        tmp_file = f"{version_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            f.write(str(new_version))
+        os.replace(tmp_file, version_file)
+
+    logger.debug(f"Data version {counter} bumped to {new_version}")
+    return new_version
@@ -1,10 +1,179 @@
+import logging
+import threading
+import time
+from typing import Dict
+
 from app.data.orm_models import Base
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL
+from sqlalchemy.pool import QueuePool, StaticPool
+from app.core.query_stats import instrument_engine
+from app.core.config import (DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+                             DB_POOL_RECYCLE, DB_POOL_PRE_PING, SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS,
+                             SQLITE_MMAP_SIZE, SQLITE_CACHE_SIZE_KB, SQLITE_BUSY_TIMEOUT_MS)
+
+logger = logging.getLogger(__name__)
+
+# In-memory SQLite is opened as a named shared-cache database so that the
+# sync engine and the async engine (see app.core.async_db) see the same data
+SQLITE_SHARED_MEMORY_DATABASE = "file:surfplanner"
+SQLITE_SHARED_MEMORY_QUERY = {"mode": "memory", "cache": "shared", "uri": "true"}
+
+
+def is_sqlite_memory_url(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def to_shared_memory_url(url):
+    """Point an in-memory SQLite URL to the named shared-cache memory database."""
+    return url.set(database=SQLITE_SHARED_MEMORY_DATABASE, query=SQLITE_SHARED_MEMORY_QUERY)
+
+
+def sqlite_pragmas(url) -> Dict[str, object]:
+    """
+    PRAGMAs of the SQLite profile for a database URL.
+
+    File databases run in WAL mode with synchronous=NORMAL, memory-mapped I/O and a
+    larger page cache; in-memory databases only get the cache size and busy timeout.
+    """
+    pragmas = {
+        # Negative cache_size is in KiB
+        "cache_size": -SQLITE_CACHE_SIZE_KB,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+    }
+    if not is_sqlite_memory_url(url) and url.query.get("mode") != "memory":
+        pragmas.update({
+            "journal_mode": SQLITE_JOURNAL_MODE,
+            "synchronous": SQLITE_SYNCHRONOUS,
+            "mmap_size": SQLITE_MMAP_SIZE,
+        })
+    return pragmas
+
+
+def apply_sqlite_pragmas(db_engine: Engine, url):
+    """Set the SQLite profile PRAGMAs on every new connection of an engine (sync or async_engine.sync_engine)."""
+    pragmas = sqlite_pragmas(url)
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    event.listen(db_engine, "connect", set_pragmas)
+
+
+class PoolStats:
+    """Counters for connection pool activity, exposed on the internal pool endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_time_seconds = 0.0
+
+    def increment(self, counter: str, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "waits": self.waits,
+                "wait_time_seconds": round(self.wait_time_seconds, 6),
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that counts checkouts which had to wait for a connection to be returned."""
+
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kwargs):
+        # Configured overflow limit, -1 for no limit
+        self.max_overflow = max_overflow
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kwargs)
+
+    def _do_get(self):
+        must_wait = self.checkedin() == 0 and -1 < self.max_overflow <= self.overflow()
+        if not must_wait:
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.increment("waits")
+            pool_stats.increment("wait_time_seconds", time.perf_counter() - started)
+
+
+def create_db_engine(database_url: str = DATABASE_URL) -> Engine:
+    """
+    Create the database engine with pool settings from the environment.
+
+    SQLite runs without a connection pool limit (in-memory databases share one
+    connection so that all sessions see the same schema) with the PRAGMAs of the
+    SQLite profile (see sqlite_pragmas); every other backend
+    uses a QueuePool with pre-ping and recycling to avoid stale MySQL connections.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        kwargs = {"connect_args": {"check_same_thread": False}}
+        if is_sqlite_memory_url(url):
+            url = to_shared_memory_url(url)
+            kwargs["poolclass"] = StaticPool
+    else:
+        kwargs = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        }
+
+    new_engine = create_engine(url, **kwargs)
+
+    if url.get_backend_name() == "sqlite":
+        apply_sqlite_pragmas(new_engine, url)
+    event.listen(new_engine, "connect", lambda *args: pool_stats.increment("connects"))
+    event.listen(new_engine, "checkout", lambda *args: pool_stats.increment("checkouts"))
+    event.listen(new_engine, "invalidate", lambda *args: pool_stats.increment("invalidations"))
+    instrument_engine(new_engine)
+
+    logger.info(f"Created {url.get_backend_name()} engine with {type(new_engine.pool).__name__}")
+    return new_engine
+
+
+def get_pool_status(db_engine: Engine = None) -> Dict:
+    """
+    Get the current state of the connection pool.
+
+    Returns:
+        Dictionary with pool configuration, current usage and activity counters
+    """
+    pool = (db_engine or engine).pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "pool_size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    status.update(pool_stats.as_dict())
+    return status
+
 
 # Create the database engine
-engine = create_engine(DATABASE_URL, connect_args={})
+engine = create_db_engine()
 
 # Create session factory
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
@@ -18,7 +187,3 @@ def get_db():
         yield db
     finally:
         db.close()
-
-
-if __name__ == "__main__":
-    create_schema()
@@ -0,0 +1,236 @@
+"""Request, import and export metrics in the Prometheus text format.
+
+Metric values are kept in per-thread shards: a thread only ever writes to its
+own shard, so recording needs no lock. Rendering sums the shards of all
+threads. The event loop thread records the async routes and the middleware,
+the threadpool threads record sync code such as exports.
+
+Every worker process keeps its own metrics, Prometheus scrapes each worker.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class _Shards:
+    """Per-thread dictionaries of label values to metric values."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._all: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> Dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            # Only taken once per thread
+            with self._lock:
+                self._all.append(values)
+            return values
+
+    def all(self) -> List[Dict]:
+        with self._lock:
+            return list(self._all)
+
+
+def _format_labels(labelnames: Sequence[str], labels: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._shards = _Shards()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        totals: Dict[Tuple, float] = {}
+        for shard in self._shards.all():
+            for key, value in list(shard.items()):
+                totals[key] = totals.get(key, 0) + value
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(totals.items())]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        values = self._shards.local()
+        key = self._key(labels)
+        values[key] = values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, such as requests in flight."""
+    type = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        values = self._shards.local()
+        key = self._key(labels)
+        values[key] = values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        values = self._shards.local()
+        key = self._key(labels)
+        state = values.get(key)
+        if state is None:
+            # Bucket counts (the last one is +Inf), then sum
+            state = values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+                break
+        else:
+            state[len(self.buckets)] += 1
+        state[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the with block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        totals: Dict[Tuple, List] = {}
+        for shard in self._shards.all():
+            for key, state in list(shard.items()):
+                total = totals.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+                for i, value in enumerate(state):
+                    total[i] += value
+
+        lines = []
+        for key, total in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), total[:-1]):
+                cumulative += count
+                le = f'le="{bound if bound == "+Inf" else _format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status")))
+http_request_errors_total = registry.register(Counter(
+    "http_request_errors_total", "HTTP requests that failed with a server error.", ("method", "route")))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route"), LATENCY_BUCKETS))
+http_response_size_bytes = registry.register(Histogram(
+    "http_response_size_bytes", "HTTP response body size in bytes.", ("method", "route"), SIZE_BUCKETS))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests being handled."))
+import_job_duration_seconds = registry.register(Histogram(
+    "import_job_duration_seconds", "Duration of booking import jobs in seconds.", ("kind",), JOB_BUCKETS))
+export_duration_seconds = registry.register(Histogram(
+    "export_duration_seconds", "Duration of building an export in seconds.", ("export_type",), JOB_BUCKETS))
+
+# Requests that did not match a route are recorded under one label, so random paths cannot add series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, response size, status and errors per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_and_measure(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            http_requests_in_flight.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_request_duration_seconds.observe(time.perf_counter() - started, method=method, route=route)
+            http_response_size_bytes.observe(size, method=method, route=route)
+            http_requests_total.inc(method=method, route=route, status=status)
+            if status >= 500:
+                http_request_errors_total.inc(method=method, route=route)
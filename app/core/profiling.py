@@ -0,0 +1,278 @@
+"""On-demand profiling of single requests.
+
+A request is profiled when it carries the configured PROFILING_TOKEN in the
+X-Profile-Token header or the profile_token query parameter. Without a token
+configured the middleware is not installed at all.
+
+Async routes run in the event loop thread, which the middleware profiles.
+Sync routes run in the threadpool, so ProfiledRoute wraps their endpoints to
+profile the worker thread too; for requests that are not profiled the wrapper
+only reads a context variable.
+
+With pyinstrument (sampling, the default) the profile is stored as collapsed
+stacks ("frame;frame;frame microseconds" per line), which flamegraph.pl,
+speedscope and inferno read directly. With cProfile (deterministic) the
+pstats dump is stored, which snakeviz or flameprof turn into a flame graph.
+The id of the stored profile is returned in the X-Profile-Id header.
+"""
+import contextvars
+import functools
+import hmac
+import inspect
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Callable, List, Optional
+from urllib.parse import parse_qs
+
+from fastapi.routing import APIRoute
+
+from app.core.config import PROFILING_TOKEN, PROFILER, PROFILE_DIR, PROFILE_MAX_FILES
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_TOKEN_QUERY = "profile_token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+COLLAPSED_SUFFIX = ".collapsed"
+PSTATS_SUFFIX = ".prof"
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """Check a token against PROFILING_TOKEN, always False when profiling is not configured"""
+    return bool(PROFILING_TOKEN) and token is not None and hmac.compare_digest(token, PROFILING_TOKEN)
+
+
+class _Profiler:
+    """Profiler of the current thread, either pyinstrument or cProfile."""
+
+    def __init__(self, kind: str, async_mode: str = "enabled"):
+        self.kind = kind
+        if kind == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler(interval=0.001, async_mode=async_mode)
+        else:
+            import cProfile
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        if self.kind == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self):
+        if self.kind == "pyinstrument":
+            return self._profiler.stop()
+        self._profiler.disable()
+        return self._profiler
+
+
+def _profiler_kind() -> str:
+    if PROFILER == "pyinstrument":
+        try:
+            import pyinstrument  # noqa: F401
+            return "pyinstrument"
+        except ImportError:
+            logger.warning("pyinstrument is not installed, profiling with cProfile")
+    return "cprofile"
+
+
+class RequestProfile:
+    """Profiles collected while handling one request."""
+
+    def __init__(self, route: str):
+        self.route = route
+        self.kind = _profiler_kind()
+        self._lock = threading.Lock()
+        self._results = []
+
+    def profiler(self, async_mode: str = "enabled") -> _Profiler:
+        return _Profiler(self.kind, async_mode)
+
+    def add(self, result):
+        with self._lock:
+            self._results.append(result)
+
+    def save(self, directory: Optional[str] = None) -> str:
+        """
+        Store the collected profiles as one file.
+
+        Returns:
+            Id of the profile, see load_profile
+        """
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        suffix = COLLAPSED_SUFFIX if self.kind == "pyinstrument" else PSTATS_SUFFIX
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}{suffix}"
+        path = os.path.join(directory, profile_id)
+
+        if self.kind == "pyinstrument":
+            stacks = Counter()
+            for session in self._results:
+                stacks.update(collapsed_stacks(session))
+            with open(path, "w") as f:
+                f.write(f"# {self.route}\n")
+                for stack, microseconds in stacks.most_common():
+                    f.write(f"{stack} {microseconds}\n")
+        else:
+            import pstats
+            stats = pstats.Stats(*self._results)
+            stats.dump_stats(path)
+
+        _evict(directory)
+        logger.info(f"Stored profile {profile_id} of {self.route}")
+        return profile_id
+
+
+_current_profile: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar(
+    "current_request_profile", default=None)
+
+
+def _frame_name(frame) -> str:
+    file_name = os.path.basename(frame.file_path or "")
+    # ";" separates the frames of a stack
+    return f"{frame.function} ({file_name}:{frame.line_no})".replace(";", ":")
+
+
+def collapsed_stacks(session) -> Counter:
+    """
+    Convert a pyinstrument session to collapsed stacks.
+
+    Args:
+        session: pyinstrument Session
+
+    Returns:
+        Counter of "frame;frame;frame" to self time in microseconds
+    """
+    stacks = Counter()
+    root = session.root_frame()
+    if root is None:
+        return stacks
+
+    pending = [(root, _frame_name(root))]
+    while pending:
+        frame, stack = pending.pop()
+        microseconds = int(frame.total_self_time * 1_000_000)
+        if microseconds > 0:
+            stacks[stack] += microseconds
+        for child in frame.children:
+            if not child.is_synthetic:
+                pending.append((child, f"{stack};{_frame_name(child)}"))
+    return stacks
+
+
+def _evict(directory: str, max_files: int = None):
+    """Keep only the newest max_files profiles"""
+    max_files = PROFILE_MAX_FILES if max_files is None else max_files
+    profiles = sorted((entry for entry in os.scandir(directory) if entry.is_file()),
+                      key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in profiles[max_files:]:
+        os.remove(entry.path)
+
+
+def list_profiles(directory: Optional[str] = None) -> List[str]:
+    """Get the ids of the stored profiles, newest first"""
+    directory = directory or PROFILE_DIR
+    if not os.path.isdir(directory):
+        return []
+    return [entry.name for entry in sorted(os.scandir(directory), key=lambda e: e.stat().st_mtime, reverse=True)]
+
+
+def load_profile(profile_id: str, directory: Optional[str] = None) -> Optional[bytes]:
+    """Get a stored profile, None if it does not exist"""
+    directory = directory or PROFILE_DIR
+    if os.path.basename(profile_id) != profile_id or not profile_id.endswith((COLLAPSED_SUFFIX, PSTATS_SUFFIX)):
+        return None
+    path = os.path.join(directory, profile_id)
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _profile_sync_endpoint(endpoint: Callable) -> Callable:
+    """Wrap a sync endpoint so it is profiled in its worker thread when the request is profiled"""
+
+    @functools.wraps(endpoint)
+    def profiled_endpoint(*args, **kwargs):
+        request_profile = _current_profile.get()
+        if request_profile is None:
+            return endpoint(*args, **kwargs)
+
+        # The worker thread runs in a copy of the request context, in which the
+        # middleware's profiler is already active
+        profiler = request_profile.profiler(async_mode="disabled")
+        try:
+            profiler.start()
+        except ValueError:
+            # Since Python 3.12 only one cProfile can be active per process
+            logger.debug("Could not start a second profiler, the worker thread is not profiled")
+            return endpoint(*args, **kwargs)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            request_profile.add(profiler.stop())
+
+    return profiled_endpoint
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute that makes sync endpoints profileable in the threadpool."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if PROFILING_TOKEN and not inspect.iscoroutinefunction(endpoint):
+            endpoint = _profile_sync_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that carry the profiling token."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_authorized(_request_token(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        request_profile = RequestProfile(f"{scope['method']} {scope['path']}")
+        token = _current_profile.set(request_profile)
+        profiler = request_profile.profiler()
+
+        # The response is buffered until the profile is stored, so its id can be returned as header
+        messages = []
+
+        async def collect(message):
+            messages.append(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, collect)
+        finally:
+            request_profile.add(profiler.stop())
+            _current_profile.reset(token)
+        profile_id = request_profile.save()
+
+        for message in messages:
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), (PROFILE_ID_HEADER.lower().encode(), profile_id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+
+def _request_token(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == PROFILE_TOKEN_HEADER.lower().encode():
+            return value.decode("latin-1")
+    query = scope.get("query_string", b"").decode("latin-1")
+    if PROFILE_TOKEN_QUERY in query:
+        values = parse_qs(query).get(PROFILE_TOKEN_QUERY)
+        if values:
+            return values[0]
+    return None
@@ -0,0 +1,173 @@
+"""Per-request SQL query counting and slow query logging.
+
+Engines are instrumented with the SQLAlchemy before/after_cursor_execute
+events. QueryStatsMiddleware starts a RequestQueryStats for every HTTP request
+in a context variable, so the events can attribute statements to the request
+that issued them, including from the threadpool of sync routes and from the
+greenlets of AsyncSession. The totals are returned in response headers and
+aggregated per route for the internal query stats endpoint.
+"""
+import contextvars
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import SLOW_QUERY_THRESHOLD_MS, QUERY_STATS_MAX_ROUTES
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+# Longest statement text written to the slow query log
+_MAX_LOGGED_STATEMENT = 1000
+
+
+class RequestQueryStats:
+    """Queries issued while handling one request."""
+
+    def __init__(self, scope: Optional[Dict] = None):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        """Method and route template of the request, known once the router matched it"""
+        if self.scope is None:
+            return "-"
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "")
+        return f"{self.scope.get('method', '')} {path}".strip()
+
+
+_current_request: contextvars.ContextVar[Optional[RequestQueryStats]] = contextvars.ContextVar(
+    "current_request_query_stats", default=None)
+
+
+class RouteQueryStats:
+    """Query totals per route, exposed on the internal query stats endpoint."""
+
+    def __init__(self, max_routes: int = QUERY_STATS_MAX_ROUTES):
+        self._lock = threading.Lock()
+        self.max_routes = max_routes
+        self._routes: Dict[str, Dict] = {}
+        self.slow_queries = 0
+
+    def record(self, request: RequestQueryStats):
+        route = request.route
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                if len(self._routes) >= self.max_routes:
+                    return
+                stats = self._routes[route] = {"requests": 0, "queries": 0, "max_queries": 0, "db_seconds": 0.0}
+            stats["requests"] += 1
+            stats["queries"] += request.count
+            stats["max_queries"] = max(stats["max_queries"], request.count)
+            stats["db_seconds"] += request.seconds
+
+    def record_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            routes = {
+                route: {
+                    **stats,
+                    "db_seconds": round(stats["db_seconds"], 6),
+                    "queries_per_request": round(stats["queries"] / stats["requests"], 2),
+                }
+                for route, stats in sorted(self._routes.items(), key=lambda item: -item[1]["queries"])
+            }
+            return {"slow_query_threshold_ms": SLOW_QUERY_THRESHOLD_MS, "slow_queries": self.slow_queries,
+                    "routes": routes}
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+            self.slow_queries = 0
+
+
+route_query_stats = RouteQueryStats()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is discarded with a statement that raises
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+
+    request = _current_request.get()
+    if request is not None:
+        request.count += 1
+        request.seconds += elapsed
+
+    if elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+        route_query_stats.record_slow_query()
+        route = request.route if request is not None else "-"
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms) on {route}: {statement[:_MAX_LOGGED_STATEMENT]}")
+
+
+def instrument_engine(engine: Engine):
+    """
+    Count and time the statements executed on an engine.
+
+    Args:
+        engine: Sync engine, or the sync_engine of an AsyncEngine
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def start_request(scope: Optional[Dict] = None) -> RequestQueryStats:
+    """Start counting the queries of a request in the current context"""
+    request = RequestQueryStats(scope)
+    _current_request.set(request)
+    return request
+
+
+def current_request() -> Optional[RequestQueryStats]:
+    """Get the query stats of the request handled in the current context"""
+    return _current_request.get()
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware adding the query count and database time of each request as response headers.
+
+    Queries of streamed responses that run after the headers were sent are only
+    included in the per-route totals.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = start_request(scope)
+
+        async def send_with_query_stats(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.lower().encode(), str(request.count).encode()))
+                headers.append((QUERY_TIME_HEADER.lower().encode(), f"{request.seconds * 1000:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_query_stats)
+        finally:
+            route_query_stats.record(request)
@@ -0,0 +1,166 @@
+"""Async read repositories mirroring the SQLAlchemy *RepositoryImpl classes.
+
+Like the sync repositories they read through the row mappers of
+app.data.row_mappers; related objects are selected with outer joins because
+lazy loading is not available on an AsyncSession.
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data.orm_models import (StudentORM, CrewMemberORM, PositionORM, CrewAssignmentORM, AccommodationORM,
+                                 AccommodationAssignmentORM)
+from app.data.row_mappers import (STUDENT, CREW_MEMBER, POSITION, CREW_ASSIGNMENT, CREW_ASSIGNMENT_WITH_RELATED,
+                                  ACCOMMODATION, ACCOMMODATION_ASSIGNMENT_WITH_RELATED, select_crew_assignments,
+                                  select_accommodation_assignments)
+from app.domain.models import (Student, CrewMember, Position, CrewAssignment, Accommodation,
+                               AccommodationAssignment, Team)
+
+
+async def _execute(session: AsyncSession, statement):
+    """Execute a mapper select on the connection of the session, see app.data.row_mappers"""
+    return await (await session.connection()).execute(statement)
+
+
+class AsyncSQLAlchemyStudentRepositoryImpl:
+    """Async counterpart of SQLAlchemyStudentRepositoryImpl (read operations)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_all_by_date_range(self, start_date: date, end_date: date) -> List[Student]:
+        rows = await _execute(self.session, 
+            STUDENT.select().where(and_(StudentORM.arrival < start_date, StudentORM.departure > end_date))
+        )
+        return STUDENT.all(rows)
+
+    async def get_by_id(self, id: int) -> Optional[Student]:
+        rows = await _execute(self.session, STUDENT.select().where(StudentORM.id == id))
+        return STUDENT.first(rows)
+
+    async def get_by_booking_number(self, booking_number: str) -> List[Student]:
+        rows = await _execute(self.session, 
+            STUDENT.select().where(StudentORM.booking_number == booking_number)
+        )
+        return STUDENT.all(rows)
+
+    async def get_all(self) -> List[Student]:
+        return STUDENT.all(await _execute(self.session, STUDENT.select()))
+
+    async def get_students_with_booked_lessons(self) -> List[Student]:
+        rows = await _execute(self.session, 
+            STUDENT.select().where(StudentORM.number_of_surf_lessons > 0)
+        )
+        return STUDENT.all(rows)
+
+
+class AsyncSQLAlchemyCrewMemberRepositoryImpl:
+    """Async counterpart of SQLAlchemyCrewMemberRepositoryImpl (read operations)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_all(self) -> List[CrewMember]:
+        """Get all crew members"""
+        return CREW_MEMBER.all(await _execute(self.session, CREW_MEMBER.select()))
+
+    async def get_by_id(self, id: int) -> Optional[CrewMember]:
+        """Get a crew member by ID"""
+        return CREW_MEMBER.first(await _execute(self.session, CREW_MEMBER.select().where(CrewMemberORM.id == id)))
+
+    async def get_by_team(self, team: Team) -> List[CrewMember]:
+        """Get all crew members for a specific team"""
+        rows = await _execute(self.session, CREW_MEMBER.select().where(CrewMemberORM.team == team))
+        return CREW_MEMBER.all(rows)
+
+
+class AsyncSQLAlchemyPositionRepositoryImpl:
+    """Async counterpart of SQLAlchemyPositionRepositoryImpl (read operations)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_all(self) -> List[Position]:
+        """Get all positions"""
+        return POSITION.all(await _execute(self.session, POSITION.select()))
+
+    async def get_by_id(self, id: int) -> Optional[Position]:
+        """Get a position by ID"""
+        return POSITION.first(await _execute(self.session, POSITION.select().where(PositionORM.id == id)))
+
+    async def get_by_team(self, team: Team) -> List[Position]:
+        """Get all positions for a specific team"""
+        rows = await _execute(self.session, POSITION.select().where(PositionORM.team == team))
+        return POSITION.all(rows)
+
+
+class AsyncSQLAlchemyCrewAssignmentRepositoryImpl:
+    """Async counterpart of SQLAlchemyCrewAssignmentRepositoryImpl (read operations)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_all(self) -> List[CrewAssignment]:
+        """Get all crew assignments"""
+        return CREW_ASSIGNMENT_WITH_RELATED.all(await _execute(self.session, select_crew_assignments()))
+
+    async def get_by_id(self, id: int) -> Optional[CrewAssignment]:
+        """Get a crew assignment by ID"""
+        rows = await _execute(self.session, select_crew_assignments().where(CrewAssignmentORM.id == id))
+        return CREW_ASSIGNMENT_WITH_RELATED.first(rows)
+
+    async def get_by_date_range(self, start_date: date, end_date: date, with_related: bool = True) -> List[CrewAssignment]:
+        """Get crew assignments within a date range, without crew member and position if with_related is False"""
+        in_range = and_(
+            CrewAssignmentORM.assignment_date >= start_date,
+            CrewAssignmentORM.assignment_date <= end_date
+        )
+        if not with_related:
+            return CREW_ASSIGNMENT.all(await _execute(self.session, CREW_ASSIGNMENT.select().where(in_range)))
+        rows = await _execute(self.session, select_crew_assignments().where(in_range))
+        return CREW_ASSIGNMENT_WITH_RELATED.all(rows)
+
+    async def get_by_crew_member(self, crew_member_id: int) -> List[CrewAssignment]:
+        """Get all assignments for a specific crew member"""
+        rows = await _execute(self.session, 
+            select_crew_assignments().where(CrewAssignmentORM.crew_member_id == crew_member_id)
+        )
+        return CREW_ASSIGNMENT_WITH_RELATED.all(rows)
+
+
+class AsyncSQLAlchemyAccommodationRepositoryImpl:
+    """Async counterpart of SQLAlchemyAccommodationRepositoryImpl (read operations)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_all(self) -> List[Accommodation]:
+        """Get all accommodations"""
+        return ACCOMMODATION.all(await _execute(self.session, ACCOMMODATION.select()))
+
+    async def get_by_id(self, id: int) -> Optional[Accommodation]:
+        """Get an accommodation by ID"""
+        rows = await _execute(self.session, ACCOMMODATION.select().where(AccommodationORM.id == id))
+        return ACCOMMODATION.first(rows)
+
+
+class AsyncSQLAlchemyAccommodationAssignmentRepositoryImpl:
+    """Async counterpart of SQLAlchemyAccommodationAssignmentRepositoryImpl (read operations)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_all(self) -> List[AccommodationAssignment]:
+        """Get all accommodation assignments"""
+        return ACCOMMODATION_ASSIGNMENT_WITH_RELATED.all(await _execute(self.session, select_accommodation_assignments()))
+
+    async def get_by_date_range(self, start_date: date, end_date: date) -> List[AccommodationAssignment]:
+        """Get accommodation assignments that overlap with the given date range"""
+        rows = await _execute(self.session, select_accommodation_assignments().where(and_(
+            AccommodationAssignmentORM.start_date <= end_date,
+            AccommodationAssignmentORM.end_date >= start_date
+        )))
+        return ACCOMMODATION_ASSIGNMENT_WITH_RELATED.all(rows)
+
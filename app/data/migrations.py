@@ -0,0 +1,76 @@
+"""Idempotent schema migrations for existing databases.
+
+create_all only creates missing tables; indexes declared later on tables that
+already exist are never added. run_migrations creates missing tables and then
+adds the declared indexes an existing table lacks, on SQLite and MySQL alike.
+Running it again changes nothing.
+
+Usage:
+    python -m app.data.migrations
+"""
+import logging
+from typing import List
+
+from sqlalchemy import Index, inspect
+from sqlalchemy.engine import Engine
+
+from app.data.orm_models import Base
+
+logger = logging.getLogger(__name__)
+
+
+def missing_indexes(engine: Engine, metadata=Base.metadata) -> List[Index]:
+    """
+    Find the declared indexes missing from existing tables.
+
+    An index counts as present if the table has an index of the same name or on
+    the same columns (MySQL, for example, indexes foreign key columns itself).
+
+    Args:
+        engine: Engine of the database to inspect
+        metadata: Metadata declaring the indexes
+
+    Returns:
+        Indexes to create, tables that do not exist yet are skipped
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = inspector.get_indexes(table.name)
+        names = {index["name"] for index in existing}
+        columns = {tuple(index["column_names"]) for index in existing}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in names and tuple(column.name for column in index.columns) not in columns:
+                missing.append(index)
+    return missing
+
+
+def run_migrations(engine: Engine, metadata=Base.metadata) -> List[str]:
+    """
+    Create missing tables and add missing indexes.
+
+    Args:
+        engine: Engine of the database to migrate
+        metadata: Metadata declaring the schema
+
+    Returns:
+        Names of the created indexes
+    """
+    indexes = missing_indexes(engine, metadata)
+    # New tables are created together with their indexes
+    metadata.create_all(bind=engine)
+    for index in indexes:
+        logger.info(f"Creating index {index.name} on {index.table.name}")
+        index.create(bind=engine)
+    return [index.name for index in indexes]
+
+
+if __name__ == "__main__":
+    from app.core.db import engine
+
+    logging.basicConfig(level=logging.INFO)
+    created = run_migrations(engine)
+    print(f"Created {len(created)} indexes" + (f": {', '.join(created)}" if created else ""))
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Table, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Table, DateTime, Enum, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from datetime import date, datetime
 
 from app.domain.models import (Booking, Student, Instructor, Group, Slot, SurfPlan,
                                 CrewMember, Position, CrewAssignment, Accommodation, AccommodationAssignment, Team)
@@ -10,25 +10,32 @@ from app.domain.models import (Booking, Student, Instructor, Group, Slot, SurfPl
 Base = declarative_base()
 
 # Association tables for many-to-many relationships
+# Indexes are declared on the models; app.data.migrations adds missing ones to existing databases
 student_group_association = Table(
     'student_group',
     Base.metadata,
     Column('student_id', Integer, ForeignKey('students.id')),
-    Column('group_id', Integer, ForeignKey('groups.id'))
+    Column('group_id', Integer, ForeignKey('groups.id')),
+    Index('ix_student_group_student_id', 'student_id'),
+    Index('ix_student_group_group_id', 'group_id')
 )
 
 instructor_group_association = Table(
     'instructor_group',
     Base.metadata,
     Column('instructor_id', Integer, ForeignKey('instructors.id')),
-    Column('group_id', Integer, ForeignKey('groups.id'))
+    Column('group_id', Integer, ForeignKey('groups.id')),
+    Index('ix_instructor_group_instructor_id', 'instructor_id'),
+    Index('ix_instructor_group_group_id', 'group_id')
 )
 
 group_slot_association = Table(
     'group_slot',
     Base.metadata,
     Column('group_id', Integer, ForeignKey('groups.id')),
-    Column('slot_id', Integer, ForeignKey('slots.id'))
+    Column('slot_id', Integer, ForeignKey('slots.id')),
+    Index('ix_group_slot_group_id', 'group_id'),
+    Index('ix_group_slot_slot_id', 'slot_id')
 )
 
 
@@ -37,6 +44,10 @@ group_slot_association = Table(
 
 class StudentORM(Base):
     __tablename__ = 'students'
+    __table_args__ = (
+        Index('ix_students_booking_number', 'booking_number'),
+        Index('ix_students_arrival_departure', 'arrival', 'departure'),
+    )
 
     id = Column(Integer, primary_key=True)
     first_name = Column(String(100), nullable=True)
@@ -269,57 +280,83 @@ class RawBookingORM(Base):
 
     def to_domain(self) -> Booking:
         """Convert ORM model to domain model"""
-        def get_package_name():
-            if self.surf_lesson_adults_main_season_package.lower() == "yes":
-                return "surf lesson adult main season package"
-            if self.surf_lesson_kids_main_season_package.lower() == "yes":
-                return "surf lesson kids main season package"
-            if self.surf_course_adults.lower() == "yes":
-                return "surf course adult"
-            if self.surf_course_kids.lower() == "yes":
-                return "surf course kids"
-            if self.surf_lessons.lower() == "yes":
-                return "surf lessons"
-            if self.surf_course.lower() == "yes":
-                return "surf course"
-            if self._5_day_surf_course_teens.lower() == "yes":
-                return "5 day surf course teens from 14 - 18 years old"
-            if self.trial_surf_lesson_kids.lower() == "yes":
-                return "trial surf lesson kids"
-
-            return "No package booked"
-
-        return Booking(
-            booking_id=self.booking_id,
-            booker_id=self.booker_id,
-            first_name=self.guest_first_name,
-            last_name=self.guest_last_name,
-            birthday=self.extract_date(self.guest_birthday),
-            gender=self.guest_gender,
-            group=self.guest_group,
-            level=self.guest_level,
-            arrival=self.extract_date(self.guest_arrival_date),
-            departure=self.extract_date(self.guest_departure_date),
-            booking_status=self.booking_status,
-            number_of_surf_lessons=sum([
-                 int(self.surf_lesson_adults_main_season_package_qty),
-                 int(self.surf_lesson_kids_main_season_package_qty),
-                 int(self.surf_course_adults_qty),
-                 int(self.surf_course_kids_qty),
-                 int(self.surf_lessons_qty),
-                 int(self.surf_course_qty),
-                 int(self._5_day_surf_course_teens_from_14____18_years_old_qty),
-                 int(self.trial_surf_lesson_kids_qty)
-             ]),
-            surf_lesson_package_name=get_package_name(),
-            diet=self.guest_diet,
-            notes_one=self.notes_one,
-            tent=self.accommodations
-        )
-
-    def extract_date(self, str_to_date):
-
-        return None if not str_to_date else datetime.strptime(str_to_date, '%Y-%m-%d').date()
+        return booking_from_row(*(getattr(self, name) for name in RAW_BOOKING_ATTRIBUTES))
+
+
+# Surf package flag attributes of RawBookingORM and the package name they stand for, in order of precedence
+BOOKING_PACKAGES = (
+    ("surf_lesson_adults_main_season_package", "surf lesson adult main season package"),
+    ("surf_lesson_kids_main_season_package", "surf lesson kids main season package"),
+    ("surf_course_adults", "surf course adult"),
+    ("surf_course_kids", "surf course kids"),
+    ("surf_lessons", "surf lessons"),
+    ("surf_course", "surf course"),
+    ("_5_day_surf_course_teens", "5 day surf course teens from 14 - 18 years old"),
+    ("trial_surf_lesson_kids", "trial surf lesson kids"),
+)
+# Lesson quantity attributes of RawBookingORM, summed up to the number of surf lessons
+BOOKING_LESSON_QUANTITIES = (
+    "surf_lesson_adults_main_season_package_qty",
+    "surf_lesson_kids_main_season_package_qty",
+    "surf_course_adults_qty",
+    "surf_course_kids_qty",
+    "surf_lessons_qty",
+    "surf_course_qty",
+    "_5_day_surf_course_teens_from_14____18_years_old_qty",
+    "trial_surf_lesson_kids_qty",
+)
+_BOOKING_FIELDS = (
+    "booking_id", "booker_id", "guest_first_name", "guest_last_name", "guest_birthday", "guest_gender",
+    "guest_group", "guest_level", "guest_arrival_date", "guest_departure_date", "booking_status", "guest_diet",
+    "notes_one", "accommodations",
+)
+# Attributes of RawBookingORM in the argument order of booking_from_row
+RAW_BOOKING_ATTRIBUTES = (*_BOOKING_FIELDS, *(flag for flag, _ in BOOKING_PACKAGES), *BOOKING_LESSON_QUANTITIES)
+_PACKAGE_NAMES = tuple(name for _, name in BOOKING_PACKAGES)
+_PACKAGES_START = len(_BOOKING_FIELDS)
+_PACKAGES_END = _PACKAGES_START + len(BOOKING_PACKAGES)
+
+
+def extract_date(value):
+    """Parse a yyyy-mm-dd booking date, dates read through a typed column are returned as is."""
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def booking_from_row(*row) -> Booking:
+    """
+    Build a Booking from the values of RAW_BOOKING_ATTRIBUTES.
+
+    Used by RawBookingORM.to_domain and by the read path mapper selecting
+    just these columns.
+    """
+    package_name = "No package booked"
+    for flag, name in zip(row[_PACKAGES_START:_PACKAGES_END], _PACKAGE_NAMES):
+        if flag.lower() == "yes":
+            package_name = name
+            break
+
+    return Booking(
+        booking_id=row[0],
+        booker_id=row[1],
+        first_name=row[2],
+        last_name=row[3],
+        birthday=extract_date(row[4]),
+        gender=row[5],
+        group=row[6],
+        level=row[7],
+        arrival=extract_date(row[8]),
+        departure=extract_date(row[9]),
+        booking_status=row[10],
+        number_of_surf_lessons=sum(int(quantity) for quantity in row[_PACKAGES_END:]),
+        surf_lesson_package_name=package_name,
+        diet=row[11],
+        notes_one=row[12],
+        tent=row[13]
+    )
 
 
 # Crew Planner ORM Models
@@ -401,6 +438,10 @@ class PositionORM(Base):
 
 class CrewAssignmentORM(Base):
     __tablename__ = 'crew_assignments'
+    __table_args__ = (
+        Index('ix_crew_assignments_assignment_date', 'assignment_date'),
+        Index('ix_crew_assignments_crew_member_id', 'crew_member_id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     crew_member_id = Column(Integer, ForeignKey('crew_members.id'), nullable=False)
@@ -469,6 +510,10 @@ class AccommodationORM(Base):
 
 class AccommodationAssignmentORM(Base):
     __tablename__ = 'accommodation_assignments'
+    __table_args__ = (
+        Index('ix_accommodation_assignments_accommodation_dates', 'accommodation_id', 'start_date', 'end_date'),
+        Index('ix_accommodation_assignments_crew_member_id', 'crew_member_id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     crew_member_id = Column(Integer, ForeignKey('crew_members.id'), nullable=False)
@@ -502,3 +547,36 @@ class AccommodationAssignmentORM(Base):
             start_date=assignment.start_date,
             end_date=assignment.end_date
         )
+
+
+# Analytics rollups (see app.utils.daily_stats)
+
+class DailyStatsORM(Base):
+    """Per-day counts of active students arriving ('arrival') or departing ('departure') on that day"""
+    __tablename__ = 'daily_stats'
+
+    day = Column(Date, primary_key=True)
+    event = Column(String(10), primary_key=True)
+    guests = Column(Integer, nullable=False, default=0)
+    adults = Column(Integer, nullable=False, default=0)
+    teens = Column(Integer, nullable=False, default=0)
+    kids = Column(Integer, nullable=False, default=0)
+    guests_with_lessons = Column(Integer, nullable=False, default=0)
+    guests_without_lessons = Column(Integer, nullable=False, default=0)
+    surf_lessons = Column(Integer, nullable=False, default=0)
+    beginner = Column(Integer, nullable=False, default=0)
+    beginner_plus = Column(Integer, nullable=False, default=0)
+    intermediate = Column(Integer, nullable=False, default=0)
+    advanced = Column(Integer, nullable=False, default=0)
+    teen_students = Column(Integer, nullable=False, default=0)
+    kid_students = Column(Integer, nullable=False, default=0)
+
+
+class DailyLessonStatsORM(Base):
+    """Per-day number of arriving/departing students by number of booked surf lessons"""
+    __tablename__ = 'daily_lesson_stats'
+
+    day = Column(Date, primary_key=True)
+    event = Column(String(10), primary_key=True)
+    number_of_lessons = Column(Integer, primary_key=True)
+    guests = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,127 @@
+"""Keyset (cursor) pagination with column projection for list endpoints.
+
+Pages are ordered by a list of key columns ending with the primary key. The
+cursor is the key of the last row of a page, so the next page is a range
+scan starting after it instead of an OFFSET. Only the requested columns are
+selected and rows are returned as dictionaries without building ORM or
+domain objects.
+"""
+import base64
+import json
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class InvalidPageRequest(ValueError):
+    """Raised for unknown fields, malformed cursors or invalid page sizes."""
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """
+    Parse a comma separated fields= parameter.
+
+    Args:
+        fields: Requested fields, e.g. "id,first_name", or None for all fields
+        allowed: Names of the fields that can be selected
+
+    Returns:
+        List of field names in the requested order
+    """
+    if not fields:
+        return list(allowed)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise InvalidPageRequest(f"Unknown fields: {', '.join(unknown)}. Valid fields are: {', '.join(allowed)}")
+    return list(dict.fromkeys(requested))
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the key values of the last row of a page as an opaque cursor."""
+    payload = [value.isoformat() if isinstance(value, date) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_columns: Sequence) -> List:
+    """Decode a cursor created by encode_cursor for the given key columns."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != len(key_columns):
+            raise ValueError("cursor does not match the sort key")
+        return [
+            date.fromisoformat(value) if value is not None and column.type.python_type is date else value
+            for value, column in zip(payload, key_columns)
+        ]
+    except (ValueError, TypeError) as e:
+        raise InvalidPageRequest(f"Invalid cursor: {e}") from e
+
+
+def _after(key_columns: Sequence, values: Sequence):
+    """
+    Build the condition for rows sorting after the given key.
+
+    NULLs sort first in ascending order (SQLite and MySQL), so a NULL key value
+    is followed by every non-NULL value.
+    """
+    column, value = key_columns[0], values[0]
+    greater = column.is_not(None) if value is None else column > value
+    if len(key_columns) == 1:
+        return greater
+    equal = column.is_(None) if value is None else column == value
+    return or_(greater, and_(equal, _after(key_columns[1:], values[1:])))
+
+
+def fetch_page(
+    session: Session,
+    columns: Dict[str, object],
+    key: Sequence[str],
+    fields: Optional[str],
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: Sequence = ()
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Select one page of rows ordered by key.
+
+    Args:
+        session: Database session
+        columns: Selectable columns by field name
+        key: Field names of the sort key, ending with the primary key
+        fields: Comma separated field names to return, None for all columns
+        cursor: Cursor returned with the previous page, None for the first page
+        limit: Maximum number of rows
+        filters: Additional WHERE conditions
+
+    Returns:
+        Tuple of (rows as dictionaries, cursor of the next page or None on the last page)
+    """
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise InvalidPageRequest(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    fields = parse_fields(fields, list(columns.keys()))
+    key_columns = [columns[name] for name in key]
+    # Key columns are always selected because the next cursor is built from them
+    selected = list(dict.fromkeys([*fields, *key]))
+
+    statement = select(*(columns[name].label(name) for name in selected)).where(*filters)
+    if cursor:
+        statement = statement.where(_after(key_columns, decode_cursor(cursor, key_columns)))
+    statement = statement.order_by(*key_columns).limit(limit + 1)
+
+    rows = session.execute(statement).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor([last[name] for name in key])
+
+    return [{name: row._mapping[name] for name in fields} for row in rows], next_cursor
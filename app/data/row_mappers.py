@@ -0,0 +1,130 @@
+"""Read-path mappers building domain objects straight from Core rows.
+
+Loading ORM entities puts every row into the session identity map, sets up
+change tracking and copies each attribute again in to_domain(). For reads the
+repositories instead select just the columns of a domain object, in the order
+of its constructor parameters, and pass every row tuple to the constructor.
+Nothing is tracked by the session, so the objects are plain values; writes
+still go through the ORM entities.
+
+The selects are executed on the connection of the session, which skips the
+ORM statement processing of Session.execute. That also skips autoflush, which
+is not needed as the repositories commit every write.
+"""
+from dataclasses import fields
+from itertools import starmap
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import func, select
+
+from app.data.orm_models import (StudentORM, RawBookingORM, CrewMemberORM, PositionORM, CrewAssignmentORM,
+                                 AccommodationORM, AccommodationAssignmentORM, RAW_BOOKING_ATTRIBUTES,
+                                 booking_from_row)
+from app.domain.models import (Student, CrewMember, Position, CrewAssignment, Accommodation,
+                               AccommodationAssignment)
+
+
+class RowMapper:
+    """
+    Columns of a domain object and the constructor building it from one row.
+
+    The constructor is called with the row values as positional arguments, so
+    the columns must be in the order of its parameters.
+    """
+    __slots__ = ("columns", "factory")
+
+    def __init__(self, columns: Sequence, factory: Callable[..., Any]):
+        self.columns = tuple(columns)
+        self.factory = factory
+
+    def select(self):
+        """Core select of the mapped columns."""
+        return select(*self.columns)
+
+    def all(self, rows: Iterable) -> List:
+        """Build the domain objects of rows."""
+        return list(starmap(self.factory, rows))
+
+    def first(self, rows: Iterable) -> Optional[Any]:
+        """Build the domain object of the first row, None without rows."""
+        for row in rows:
+            return self.factory(*row)
+        return None
+
+
+def dataclass_mapper(orm_class, domain_class, coalesce: Optional[Dict[str, Any]] = None,
+                     exclude: Sequence[str] = ()) -> RowMapper:
+    """
+    Map the fields of a domain dataclass to the ORM columns of the same name.
+
+    Args:
+        orm_class: ORM model with a column for every mapped field
+        domain_class: Domain dataclass, excluded fields must have defaults and come last
+        coalesce: Value of a field when its column is NULL, like the ``or ""`` in to_domain()
+        exclude: Fields left at their default
+
+    Returns:
+        RowMapper building domain_class objects
+    """
+    coalesce = coalesce or {}
+    names = [field.name for field in fields(domain_class) if field.name not in exclude]
+    columns = [getattr(orm_class, name) for name in names]
+    columns = [func.coalesce(column, coalesce[name]).label(name) if name in coalesce else column
+               for name, column in zip(names, columns)]
+    return RowMapper(columns, domain_class)
+
+
+def with_related(mapper: RowMapper, *related: RowMapper) -> RowMapper:
+    """
+    Mapper for the columns of mapper followed by the columns of related objects.
+
+    The related objects are passed to the factory of mapper after its own
+    columns; a related object whose first column (its ID) is NULL, as with an
+    outer join without a match, is passed as None.
+
+    Args:
+        mapper: Mapper of the main object
+        related: Mappers of the related objects in constructor order
+
+    Returns:
+        RowMapper building the main object with its related objects
+    """
+    factory = mapper.factory
+    size = len(mapper.columns)
+    spans = []
+    columns = list(mapper.columns)
+    for other in related:
+        spans.append((len(columns), len(columns) + len(other.columns), other.factory))
+        columns.extend(other.columns)
+
+    def build(*row):
+        return factory(*row[:size], *[None if row[start] is None else build_related(*row[start:end])
+                                      for start, end, build_related in spans])
+
+    return RowMapper(columns, build)
+
+
+STUDENT = dataclass_mapper(StudentORM, Student, exclude=("single_parent",))
+CREW_MEMBER = dataclass_mapper(CrewMemberORM, CrewMember, coalesce={"skills": "", "notes": ""})
+POSITION = dataclass_mapper(PositionORM, Position, coalesce={"description": ""})
+ACCOMMODATION = dataclass_mapper(AccommodationORM, Accommodation, coalesce={"notes": ""})
+CREW_ASSIGNMENT = dataclass_mapper(CrewAssignmentORM, CrewAssignment, exclude=("crew_member", "position"))
+CREW_ASSIGNMENT_WITH_RELATED = with_related(CREW_ASSIGNMENT, CREW_MEMBER, POSITION)
+ACCOMMODATION_ASSIGNMENT = dataclass_mapper(AccommodationAssignmentORM, AccommodationAssignment,
+                                            exclude=("crew_member", "accommodation"))
+ACCOMMODATION_ASSIGNMENT_WITH_RELATED = with_related(ACCOMMODATION_ASSIGNMENT, CREW_MEMBER, ACCOMMODATION)
+BOOKING = RowMapper([getattr(RawBookingORM, name) for name in RAW_BOOKING_ATTRIBUTES], booking_from_row)
+
+
+def select_crew_assignments():
+    """Select crew assignments with their crew member and position."""
+    return CREW_ASSIGNMENT_WITH_RELATED.select().select_from(CrewAssignmentORM) \
+        .outerjoin(CrewMemberORM, CrewAssignmentORM.crew_member_id == CrewMemberORM.id) \
+        .outerjoin(PositionORM, CrewAssignmentORM.position_id == PositionORM.id)
+
+
+def select_accommodation_assignments():
+    """Select accommodation assignments with their crew member and accommodation."""
+    return ACCOMMODATION_ASSIGNMENT_WITH_RELATED.select().select_from(AccommodationAssignmentORM) \
+        .outerjoin(CrewMemberORM, AccommodationAssignmentORM.crew_member_id == CrewMemberORM.id) \
+        .outerjoin(AccommodationORM, AccommodationAssignmentORM.accommodation_id == AccommodationORM.id)
@@ -0,0 +1,306 @@
+"""Columnar on-disk snapshot of the season's students.
+
+The attributes analytics and surf planning filter on are written as one NumPy
+.npy file per column. Every worker memory-maps the same files, so the data is
+shared through the page cache instead of being loaded per process.
+
+Snapshots are written to a new versioned directory and published by
+atomically replacing the CURRENT file, which names the directory. Readers
+that still map an older snapshot keep working; the two newest snapshots are
+kept on disk.
+
+The import publishes a new snapshot right after writing the students. Other
+writes only bump the data version: the first read noticing it starts a
+rebuild in a background thread and keeps answering from the previous
+snapshot until the new one is published.
+"""
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import SEASON_SNAPSHOT_DIR
+from app.core.data_version import get_data_version
+from app.data.orm_models import StudentORM
+from app.utils.student_utils import is_teen, is_kid
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+METADATA_FILE = "snapshot.json"
+BUILD_LOCK_FILE = "build.lock"
+KEEP_SNAPSHOTS = 2
+
+# Column name to NumPy dtype
+COLUMNS = {
+    "id": "int64",
+    "arrival": "int32",         # date ordinal, 0 if missing
+    "departure": "int32",       # date ordinal, 0 if missing
+    "age_class": "int8",        # ADULT, TEEN or KID
+    "level": "int8",            # LEVELS, OTHER_LEVEL for unknown levels
+    "lessons": "int16",
+    "status": "int8",           # ACTIVE, CANCELLED or EXPIRED
+}
+
+ADULT, TEEN, KID = 0, 1, 2
+LEVELS = {"BEGINNER": 0, "BEGINNER PLUS": 1, "INTERMEDIATE": 2, "ADVANCED": 3}
+OTHER_LEVEL = len(LEVELS)
+ACTIVE, CANCELLED, EXPIRED = 0, 1, 2
+STATUSES = {"cancelled": CANCELLED, "expired": EXPIRED}
+
+
+class SeasonSnapshot:
+    """Memory-mapped columns of a snapshot."""
+
+    def __init__(self, path: str, version: int, columns: Dict):
+        self.path = path
+        self.version = version
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def overlapping(self, start_date: date, end_date: date, active_only: bool = True):
+        """
+        Boolean mask of the students whose stay overlaps start_date..end_date.
+
+        Args:
+            start_date: First day of the period
+            end_date: Last day of the period
+            active_only: Exclude cancelled and expired bookings
+        """
+        mask = ((self.arrival > 0) & (self.departure > 0)
+                & (self.arrival <= end_date.toordinal()) & (self.departure >= start_date.toordinal()))
+        if active_only:
+            mask &= self.status == ACTIVE
+        return mask
+
+    def ids_overlapping(self, start_date: date, end_date: date, active_only: bool = True) -> List[int]:
+        """Ids of the students whose stay overlaps start_date..end_date"""
+        return self.id[self.overlapping(start_date, end_date, active_only)].tolist()
+
+    def lessons_per_day(self, start_date: date, end_date: date) -> List[Dict]:
+        """Same forecast as compute_lessons_per_day, computed from the columns"""
+        import numpy as np
+        from datetime import timedelta
+        from app.utils.lesson_allocation import allocate_lesson_days
+
+        mask = self.overlapping(start_date, end_date) & (self.lessons > 0)
+        days = (end_date - start_date).days + 1
+        matrix = allocate_lesson_days(self.arrival[mask].astype(np.int64), self.departure[mask].astype(np.int64),
+                                      self.lessons[mask].astype(np.int64), start_date, days,
+                                      count_from_window_start=False)
+        counts = matrix.sum(axis=0)
+        return [{"date": (start_date + timedelta(days=i)).isoformat(), "lessons": int(counts[i])}
+                for i in range(days)]
+
+
+def encode_students(students: Iterable) -> Dict:
+    """
+    Encode students (domain objects, ORM objects or rows) into snapshot columns.
+
+    Returns:
+        Dictionary of column name to NumPy array
+    """
+    import numpy as np
+
+    values = {name: [] for name in COLUMNS}
+    for student in students:
+        values["id"].append(student.id)
+        values["arrival"].append(student.arrival.toordinal() if student.arrival else 0)
+        values["departure"].append(student.departure.toordinal() if student.departure else 0)
+        values["age_class"].append(TEEN if is_teen(student) else KID if is_kid(student) else ADULT)
+        values["level"].append(LEVELS.get((student.level or "BEGINNER").strip().upper(), OTHER_LEVEL))
+        values["lessons"].append(student.number_of_surf_lessons or 0)
+        values["status"].append(STATUSES.get(student.booking_status, ACTIVE))
+    return {name: np.array(values[name], dtype=dtype) for name, dtype in COLUMNS.items()}
+
+
+def write_snapshot(columns: Dict, version: int, directory: Optional[str] = None) -> str:
+    """
+    Write a snapshot and publish it as the current one.
+
+    Args:
+        columns: Columns from encode_students
+        version: Data version the snapshot was built from
+        directory: Snapshot root directory, SEASON_SNAPSHOT_DIR if not set
+
+    Returns:
+        Path of the written snapshot
+    """
+    import numpy as np
+
+    directory = directory or SEASON_SNAPSHOT_DIR
+    os.makedirs(directory, exist_ok=True)
+    name = f"v{version}-{uuid.uuid4().hex[:8]}"
+    path = os.path.join(directory, name)
+    os.makedirs(path)
+
+    for column, values in columns.items():
+        np.save(os.path.join(path, f"{column}.npy"), values)
+    with open(os.path.join(path, METADATA_FILE), "w") as f:
+        json.dump({"version": version, "students": len(columns["id"])}, f)
+
+    tmp_current = os.path.join(directory, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+    with open(tmp_current, "w") as f:
+        f.write(name)
+    os.replace(tmp_current, os.path.join(directory, CURRENT_FILE))
+
+    _remove_old_snapshots(directory, name)
+    logger.info(f"Wrote season snapshot {name} with {len(columns['id'])} students")
+    return path
+
+
+def _remove_old_snapshots(directory: str, current: str):
+    snapshots = sorted((entry for entry in os.scandir(directory) if entry.is_dir() and entry.name != current),
+                       key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in snapshots[KEEP_SNAPSHOTS - 1:]:
+        # Workers mapping the files keep their data until they close the maps
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+_open_snapshots: Dict[str, SeasonSnapshot] = {}
+_open_lock = threading.Lock()
+
+
+def open_snapshot(directory: Optional[str] = None) -> Optional[SeasonSnapshot]:
+    """
+    Memory-map the current snapshot.
+
+    The mapped snapshot is reused until another one is published.
+
+    Returns:
+        The current snapshot, None if none was written yet
+    """
+    import numpy as np
+
+    directory = directory or SEASON_SNAPSHOT_DIR
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+
+    path = os.path.join(directory, name)
+    with _open_lock:
+        snapshot = _open_snapshots.get(directory)
+        if snapshot is not None and snapshot.path == path:
+            return snapshot
+        try:
+            with open(os.path.join(path, METADATA_FILE)) as f:
+                version = json.load(f)["version"]
+            columns = {column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r") for column in COLUMNS}
+        except FileNotFoundError:
+            # Replaced and removed while we were opening it
+            return None
+        snapshot = _open_snapshots[directory] = SeasonSnapshot(path, version, columns)
+        return snapshot
+
+
+def build_season_snapshot(session: Session, directory: Optional[str] = None) -> str:
+    """
+    Build the snapshot from the students table and publish it.
+
+    Args:
+        session: Database session
+        directory: Snapshot root directory, SEASON_SNAPSHOT_DIR if not set
+
+    Returns:
+        Path of the written snapshot
+    """
+    version = get_data_version()
+    rows = session.query(
+        StudentORM.id, StudentORM.arrival, StudentORM.departure, StudentORM.age_group, StudentORM.level,
+        StudentORM.number_of_surf_lessons, StudentORM.booking_status
+    ).all()
+    return write_snapshot(encode_students(rows), version, directory)
+
+
+# Background rebuilds running in this process by snapshot directory
+_rebuilds: Dict[str, threading.Thread] = {}
+
+
+def _rebuild(directory: str, session_factory: Callable[[], Session]):
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, BUILD_LOCK_FILE), "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another worker is rebuilding, its snapshot is picked up by the next read
+                return
+            snapshot = open_snapshot(directory)
+            if snapshot is not None and snapshot.version == get_data_version():
+                return
+            session = session_factory()
+            try:
+                build_season_snapshot(session, directory)
+            finally:
+                session.close()
+    except Exception:
+        logger.exception("Rebuilding the season snapshot failed")
+    finally:
+        with _open_lock:
+            _rebuilds.pop(directory, None)
+
+
+def _start_rebuild(directory: str, session_factory: Callable[[], Session]):
+    with _open_lock:
+        if directory in _rebuilds:
+            return
+        thread = _rebuilds[directory] = threading.Thread(target=_rebuild, args=(directory, session_factory),
+                                                         name="season-snapshot-rebuild", daemon=True)
+    thread.start()
+
+
+def wait_for_rebuild(directory: Optional[str] = None, timeout: Optional[float] = None):
+    """Wait until the background rebuild of a snapshot directory, if any, has finished"""
+    with _open_lock:
+        thread = _rebuilds.get(directory or SEASON_SNAPSHOT_DIR)
+    if thread is not None:
+        thread.join(timeout)
+
+
+def current_season_snapshot(session: Session, directory: Optional[str] = None,
+                            session_factory: Optional[Callable[[], Session]] = None) -> Optional[SeasonSnapshot]:
+    """
+    Get the snapshot of the current data version.
+
+    Without any snapshot one is built right away. A snapshot older than the data
+    version is not returned: a new one is built in the background from a session
+    of its own, and callers answer from the database until it is published, so
+    nothing cached under the current data version is computed from stale data.
+
+    Args:
+        session: Database session used to build the first snapshot
+        directory: Snapshot root directory, SEASON_SNAPSHOT_DIR if not set
+        session_factory: Creates the session of a background rebuild, SessionLocal if not set
+
+    Returns:
+        The snapshot, None while a snapshot of the current data version is being built
+    """
+    directory = directory or SEASON_SNAPSHOT_DIR
+    snapshot = open_snapshot(directory)
+    if snapshot is None:
+        build_season_snapshot(session, directory)
+        snapshot = open_snapshot(directory)
+    if snapshot.version != get_data_version():
+        if session_factory is None:
+            from app.core.db import SessionLocal
+            session_factory = SessionLocal
+        _start_rebuild(directory, session_factory)
+        return None
+    return snapshot
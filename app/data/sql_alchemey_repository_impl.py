@@ -1,42 +1,53 @@
+import logging
+from dataclasses import replace
 from datetime import date
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.domain.repositories_interfaces import (
     BookingRawRepositoryInterface, SurfPlanRepositoryInterface,
     StudentRepositoryInterface, InstructorRepository, GroupRepository,
     SlotRepository, CrewMemberRepositoryInterface, PositionRepositoryInterface,
     CrewAssignmentRepositoryInterface, AccommodationRepositoryInterface,
-    AccommodationAssignmentRepositoryInterface
+    AccommodationAssignmentRepositoryInterface, DailyStatsRepositoryInterface
 )
-from app.domain.models import SurfPlan, Student, Instructor, Group, Slot, CrewMember, Position, CrewAssignment, Accommodation, AccommodationAssignment, Team
+from app.domain.models import Booking, SurfPlan, Student, Instructor, Group, Slot, CrewMember, Position, CrewAssignment, Accommodation, AccommodationAssignment, Team
 from app.data.orm_models import SurfPlanORM, StudentORM, InstructorORM, GroupORM, SlotORM, RawBookingORM, CrewMemberORM, PositionORM, CrewAssignmentORM, AccommodationORM, AccommodationAssignmentORM
-from sqlalchemy import and_
+from app.data.orm_models import DailyStatsORM, DailyLessonStatsORM
+from sqlalchemy import (Integer, and_, bindparam, cast, func, insert, literal, null, or_, select, union_all,
+                        update)
+from app.core.data_version import CREW_DATA_VERSION, bump_data_version
+from app.data.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from app.data.row_mappers import (STUDENT, BOOKING, CREW_MEMBER, POSITION, CREW_ASSIGNMENT,
+                                  CREW_ASSIGNMENT_WITH_RELATED, ACCOMMODATION, ACCOMMODATION_ASSIGNMENT_WITH_RELATED,
+                                  select_crew_assignments, select_accommodation_assignments)
+from app.utils.daily_stats import BUILT, BUILT_MARKER_DAY, ROLLUP_METRICS, build_rollup_rows, built_marker_row
+
+logger = logging.getLogger(__name__)
 
 
 class SQLAlchemyBookingRawRepositoryImpl(BookingRawRepositoryInterface):
     def __init__(self, session: Session):
         self.session = session
 
-    def get_all(self) -> List[RawBookingORM]:
-        raw_booking_orms = self.session.query(RawBookingORM).all()
-        return [raw_booking_orm.to_domain() for raw_booking_orm in raw_booking_orms]
+    def get_all(self) -> List[Booking]:
+        return BOOKING.all(self.session.connection().execute(BOOKING.select()))
 
     def get_for_date(self, start_date: date, end_date: date):
-        orm_bookings = self.session.query(RawBookingORM).filter(
+        rows = self.session.connection().execute(BOOKING.select().where(
             and_(RawBookingORM.guest_arrival_date < start_date, RawBookingORM.guest_departure_date > end_date)
-        ).all()
+        ))
 
-        return [bookings.to_domain() for bookings in orm_bookings]
+        return BOOKING.all(rows)
 
     def get_for_date_inclusive(self, start_date: date, end_date: date):
-        orm_bookings = self.session.query(RawBookingORM).filter(
+        rows = self.session.connection().execute(BOOKING.select().where(
             and_(
                 RawBookingORM.guest_arrival_date < end_date,
                 RawBookingORM.guest_departure_date > start_date
             )
-        ).all()
+        ))
 
-        return [bookings.to_domain() for bookings in orm_bookings]
+        return BOOKING.all(rows)
 
 
 class SQLAlchemySurfPlanRepositoryImpl(SurfPlanRepositoryInterface):
@@ -80,6 +91,11 @@ class SQLAlchemySurfPlanRepositoryImpl(SurfPlanRepositoryInterface):
         return result > 0
 
 
+# Sort keys for paging students, each ending with the primary key
+STUDENT_SORT_KEYS = {"id": ("id",), "arrival": ("arrival", "id")}
+ID_CHUNK_SIZE = 500
+
+
 class SQLAlchemyStudentRepositoryImpl(StudentRepositoryInterface):
 
     def __init__(self, session: Session):
@@ -87,37 +103,56 @@ class SQLAlchemyStudentRepositoryImpl(StudentRepositoryInterface):
 
     # TODO: include_arriving: bool = False, include_departing: bool = False
     def get_all_by_date_range(self, start_date: date, end_date: date) -> List[Student]:
-        orm_students = self.session.query(StudentORM).filter(
+        rows = self.session.connection().execute(STUDENT.select().where(
             and_(StudentORM.arrival < start_date, StudentORM.departure > end_date)
-        ).all()
+        ))
 
-        return [orm_student.to_domain() for orm_student in orm_students]
+        return STUDENT.all(rows)
 
     def get_by_id(self, id: int) -> Optional[Student]:
-        orm_student = self.session.query(StudentORM).filter(
+        rows = self.session.connection().execute(STUDENT.select().where(
             StudentORM.id == id
-        ).first()
+        ))
+
+        return STUDENT.first(rows)
 
-        return orm_student.to_domain() if orm_student else None
+    def get_by_ids(self, ids: List[int]) -> List[Student]:
+        students = []
+        # Chunked to stay below the bound parameter limit of SQLite
+        for i in range(0, len(ids), ID_CHUNK_SIZE):
+            rows = self.session.connection().execute(STUDENT.select().where(
+                StudentORM.id.in_(ids[i:i + ID_CHUNK_SIZE])
+            ).order_by(StudentORM.id))
+            students.extend(STUDENT.all(rows))
+        return students
 
     def get_by_booking_number(self, booking_number: str) -> List[Student]:
 
-        orm_students = self.session.query(StudentORM).filter(
+        rows = self.session.connection().execute(STUDENT.select().where(
             StudentORM.booking_number == booking_number
-        )
-        return [orm_student.to_domain() for orm_student in orm_students]
+        ))
+        return STUDENT.all(rows)
 
     def get_all(self) -> List[Student]:
-        orm_students = self.session.query(StudentORM).all()
-        return [orm_student.to_domain() for orm_student in orm_students]
+        return STUDENT.all(self.session.connection().execute(STUDENT.select()))
 
     def get_students_with_booked_lessons(self) -> List[Student]:
-        orm_students = self.session.query(StudentORM).filter(
+        rows = self.session.connection().execute(STUDENT.select().where(
             StudentORM.number_of_surf_lessons > 0
-        ).all()
+        ))
+
+        return STUDENT.all(rows)
 
-        result = [orm_student.to_domain() for orm_student in orm_students]
-        return result
+    def get_page(self, fields: Optional[str] = None, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                 order_by: str = "id", start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """Get a page of student columns ordered by id or (arrival, id), optionally overlapping a date range"""
+        filters = []
+        if start_date:
+            filters.append(StudentORM.departure >= start_date)
+        if end_date:
+            filters.append(StudentORM.arrival <= end_date)
+        return fetch_page(self.session, StudentORM.__table__.columns, STUDENT_SORT_KEYS[order_by],
+                          fields, cursor, limit, filters)
 
     # WRONG !!!!! need to find id
     def update(self, id: int, student: Student) -> Student:
@@ -126,8 +161,10 @@ class SQLAlchemyStudentRepositoryImpl(StudentRepositoryInterface):
         existing_student = self.session.query(StudentORM).filter(
             StudentORM.id == id
         ).first()
+        changed_days = {student.arrival, student.departure}
 
         if existing_student:
+            changed_days.update((existing_student.arrival, existing_student.departure))
             # Update existing student
             for key, value in vars(orm_student).items():
                 if key != '_sa_instance_state' and key != 'id':
@@ -137,14 +174,65 @@ class SQLAlchemyStudentRepositoryImpl(StudentRepositoryInterface):
             # Add new student
             self.session.add(orm_student)
 
+        self.session.flush()
+        SQLAlchemyDailyStatsRepositoryImpl(self.session).refresh_days(changed_days, commit=False)
         self.session.commit()
+        bump_data_version()
         return orm_student.to_domain()
 
+    def update_many(self, updates: List[Tuple[int, Student]], bump_version: bool = True) -> int:
+        """
+        Update many students with one executemany UPDATE in a single transaction.
+
+        The rollup rows of their old and new days are refreshed in the same transaction.
+
+        Args:
+            updates: (id, student with the new values) pairs; ids not in the table are skipped
+            bump_version: False if the caller bumps the data version once for several writes
+
+        Returns:
+            Number of updated rows
+        """
+        if not updates:
+            return 0
+        table = StudentORM.__table__
+        columns = [column.name for column in table.columns if column.name != "id"]
+        ids = [id for id, _ in updates]
+
+        changed_days = set()
+        for i in range(0, len(ids), ID_CHUNK_SIZE):
+            for stay in self.session.query(StudentORM.arrival, StudentORM.departure).filter(
+                    StudentORM.id.in_(ids[i:i + ID_CHUNK_SIZE])):
+                changed_days.update(stay)
+
+        statement = (update(table)
+                     .where(table.c.id == bindparam("student_id"))
+                     .values({column: bindparam(column) for column in columns}))
+        params = []
+        for id, student in updates:
+            params.append(dict({column: getattr(student, column) for column in columns}, student_id=id))
+            changed_days.update((student.arrival, student.departure))
+
+        result = self.session.execute(statement, params)
+        SQLAlchemyDailyStatsRepositoryImpl(self.session).refresh_days(changed_days, commit=False)
+        self.session.commit()
+        # Rows updated in place are not refreshed by the executemany; drop them from the identity map
+        self.session.expire_all()
+        if bump_version:
+            bump_data_version()
+        return result.rowcount
+
     def delete(self, id: int) -> bool:
+        stay = self.session.query(StudentORM.arrival, StudentORM.departure).filter(
+            StudentORM.id == id
+        ).first()
         result = self.session.query(StudentORM).filter(
             StudentORM.id == id
         ).delete()
+        if stay:
+            SQLAlchemyDailyStatsRepositoryImpl(self.session).refresh_days(stay, commit=False)
         self.session.commit()
+        bump_data_version()
         return result > 0
 
     def save(self, student: Student) -> Student:
@@ -152,14 +240,45 @@ class SQLAlchemyStudentRepositoryImpl(StudentRepositoryInterface):
         print("💾 save student:")
         print(orm_student)
         self.session.add(orm_student)
+        self.session.flush()
+        SQLAlchemyDailyStatsRepositoryImpl(self.session).refresh_days((orm_student.arrival, orm_student.departure),
+                                                                      commit=False)
         self.session.commit()
+        bump_data_version()
         return orm_student.to_domain()
 
-    def save_all(self, students: List[Student]) -> List[Student]:
-        saved_students = []
+    def save_all(self, students: List[Student], bump_version: bool = True) -> List[Student]:
+        """
+        Add many students in a single transaction.
+
+        The rollup of all their arrival and departure days is refreshed once, in the
+        same transaction, and the data version bumped once, however many students
+        are saved.
+
+        Args:
+            students: New students, their ids are assigned by the database
+            bump_version: False if the caller bumps the data version once for several writes
+
+        Returns:
+            The saved students with their ids
+        """
+        if not students:
+            return []
+        columns = [column.name for column in StudentORM.__table__.columns if column.name != "id"]
+        orm_students = [StudentORM(**{column: getattr(student, column) for column in columns}) for student in students]
+        self.session.add_all(orm_students)
+        self.session.flush()
+        # Read the ids before the commit expires the objects, which would reload every row; like to_domain()
+        saved_students = [replace(student, id=orm_student.id, single_parent=False)
+                          for student, orm_student in zip(students, orm_students)]
+
+        changed_days = set()
         for student in students:
-            saved_student = self.save(StudentORM.from_domain(student))
-            saved_students.append(saved_student)
+            changed_days.update((student.arrival, student.departure))
+        SQLAlchemyDailyStatsRepositoryImpl(self.session).refresh_days(changed_days, commit=False)
+        self.session.commit()
+        if bump_version:
+            bump_data_version()
         return saved_students
 
 
@@ -314,22 +433,27 @@ class SQLAlchemyCrewMemberRepositoryImpl(CrewMemberRepositoryInterface):
 
     def get_all(self) -> List[CrewMember]:
         """Get all crew members"""
-        orm_crew_members = self.session.query(CrewMemberORM).all()
-        return [crew.to_domain() for crew in orm_crew_members]
+        return CREW_MEMBER.all(self.session.connection().execute(CREW_MEMBER.select()))
 
     def get_by_id(self, id: int) -> Optional[CrewMember]:
         """Get a crew member by ID"""
-        orm_crew = self.session.query(CrewMemberORM).filter(
+        rows = self.session.connection().execute(CREW_MEMBER.select().where(
             CrewMemberORM.id == id
-        ).first()
-        return orm_crew.to_domain() if orm_crew else None
+        ))
+        return CREW_MEMBER.first(rows)
 
     def get_by_team(self, team: Team) -> List[CrewMember]:
         """Get all crew members for a specific team"""
-        orm_crew_members = self.session.query(CrewMemberORM).filter(
+        rows = self.session.connection().execute(CREW_MEMBER.select().where(
             CrewMemberORM.team == team
-        ).all()
-        return [crew.to_domain() for crew in orm_crew_members]
+        ))
+        return CREW_MEMBER.all(rows)
+
+    def get_page(self, fields: Optional[str] = None, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                 team: Optional[Team] = None):
+        """Get a page of crew member columns ordered by ID, optionally for a specific team"""
+        filters = [CrewMemberORM.team == team] if team else []
+        return fetch_page(self.session, CrewMemberORM.__table__.columns, ("id",), fields, cursor, limit, filters)
 
     def save(self, crew_member: CrewMember) -> CrewMember:
         """Save or update a crew member"""
@@ -339,6 +463,7 @@ class SQLAlchemyCrewMemberRepositoryImpl(CrewMemberRepositoryInterface):
         else:
             self.session.add(orm_crew)
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         self.session.refresh(orm_crew)
         return orm_crew.to_domain()
 
@@ -348,6 +473,7 @@ class SQLAlchemyCrewMemberRepositoryImpl(CrewMemberRepositoryInterface):
             CrewMemberORM.id == id
         ).delete()
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         return result > 0
 
 
@@ -359,22 +485,27 @@ class SQLAlchemyPositionRepositoryImpl(PositionRepositoryInterface):
 
     def get_all(self) -> List[Position]:
         """Get all positions"""
-        orm_positions = self.session.query(PositionORM).all()
-        return [pos.to_domain() for pos in orm_positions]
+        return POSITION.all(self.session.connection().execute(POSITION.select()))
 
     def get_by_id(self, id: int) -> Optional[Position]:
         """Get a position by ID"""
-        orm_position = self.session.query(PositionORM).filter(
+        rows = self.session.connection().execute(POSITION.select().where(
             PositionORM.id == id
-        ).first()
-        return orm_position.to_domain() if orm_position else None
+        ))
+        return POSITION.first(rows)
 
     def get_by_team(self, team: Team) -> List[Position]:
         """Get all positions for a specific team"""
-        orm_positions = self.session.query(PositionORM).filter(
+        rows = self.session.connection().execute(POSITION.select().where(
             PositionORM.team == team
-        ).all()
-        return [pos.to_domain() for pos in orm_positions]
+        ))
+        return POSITION.all(rows)
+
+    def get_page(self, fields: Optional[str] = None, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                 team: Optional[Team] = None):
+        """Get a page of position columns ordered by ID, optionally for a specific team"""
+        filters = [PositionORM.team == team] if team else []
+        return fetch_page(self.session, PositionORM.__table__.columns, ("id",), fields, cursor, limit, filters)
 
     def save(self, position: Position) -> Position:
         """Save or update a position"""
@@ -384,6 +515,7 @@ class SQLAlchemyPositionRepositoryImpl(PositionRepositoryInterface):
         else:
             self.session.add(orm_position)
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         self.session.refresh(orm_position)
         return orm_position.to_domain()
 
@@ -393,6 +525,7 @@ class SQLAlchemyPositionRepositoryImpl(PositionRepositoryInterface):
             PositionORM.id == id
         ).delete()
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         return result > 0
 
 
@@ -404,32 +537,31 @@ class SQLAlchemyCrewAssignmentRepositoryImpl(CrewAssignmentRepositoryInterface):
 
     def get_all(self) -> List[CrewAssignment]:
         """Get all crew assignments"""
-        orm_assignments = self.session.query(CrewAssignmentORM).all()
-        return [assign.to_domain() for assign in orm_assignments]
+        return CREW_ASSIGNMENT_WITH_RELATED.all(self.session.connection().execute(select_crew_assignments()))
 
     def get_by_id(self, id: int) -> Optional[CrewAssignment]:
         """Get a crew assignment by ID"""
-        orm_assignment = self.session.query(CrewAssignmentORM).filter(
+        rows = self.session.connection().execute(select_crew_assignments().where(
             CrewAssignmentORM.id == id
-        ).first()
-        return orm_assignment.to_domain() if orm_assignment else None
-
-    def get_by_date_range(self, start_date: date, end_date: date) -> List[CrewAssignment]:
-        """Get crew assignments within a date range"""
-        orm_assignments = self.session.query(CrewAssignmentORM).filter(
-            and_(
-                CrewAssignmentORM.assignment_date >= start_date,
-                CrewAssignmentORM.assignment_date <= end_date
-            )
-        ).all()
-        return [assign.to_domain() for assign in orm_assignments]
+        ))
+        return CREW_ASSIGNMENT_WITH_RELATED.first(rows)
+
+    def get_by_date_range(self, start_date: date, end_date: date, with_related: bool = True) -> List[CrewAssignment]:
+        """Get crew assignments within a date range, without crew member and position if with_related is False"""
+        in_range = and_(
+            CrewAssignmentORM.assignment_date >= start_date,
+            CrewAssignmentORM.assignment_date <= end_date
+        )
+        if not with_related:
+            return CREW_ASSIGNMENT.all(self.session.connection().execute(CREW_ASSIGNMENT.select().where(in_range)))
+        return CREW_ASSIGNMENT_WITH_RELATED.all(self.session.connection().execute(select_crew_assignments().where(in_range)))
 
     def get_by_crew_member(self, crew_member_id: int) -> List[CrewAssignment]:
         """Get all assignments for a specific crew member"""
-        orm_assignments = self.session.query(CrewAssignmentORM).filter(
+        rows = self.session.connection().execute(select_crew_assignments().where(
             CrewAssignmentORM.crew_member_id == crew_member_id
-        ).all()
-        return [assign.to_domain() for assign in orm_assignments]
+        ))
+        return CREW_ASSIGNMENT_WITH_RELATED.all(rows)
 
     def save(self, assignment: CrewAssignment) -> CrewAssignment:
         """Save or update a crew assignment"""
@@ -439,7 +571,11 @@ class SQLAlchemyCrewAssignmentRepositoryImpl(CrewAssignmentRepositoryInterface):
         else:
             self.session.add(orm_assignment)
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         self.session.refresh(orm_assignment)
+        if assignment.crew_member is not None and assignment.position is not None:
+            # Keep the crew member and position given by the caller instead of lazy loading them
+            return replace(assignment, id=orm_assignment.id)
         return orm_assignment.to_domain()
 
     def delete(self, id: int) -> bool:
@@ -448,6 +584,7 @@ class SQLAlchemyCrewAssignmentRepositoryImpl(CrewAssignmentRepositoryInterface):
             CrewAssignmentORM.id == id
         ).delete()
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         return result > 0
 
 
@@ -459,15 +596,18 @@ class SQLAlchemyAccommodationRepositoryImpl(AccommodationRepositoryInterface):
 
     def get_all(self) -> List[Accommodation]:
         """Get all accommodations"""
-        orm_accommodations = self.session.query(AccommodationORM).all()
-        return [acc.to_domain() for acc in orm_accommodations]
+        return ACCOMMODATION.all(self.session.connection().execute(ACCOMMODATION.select()))
+
+    def get_page(self, fields: Optional[str] = None, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Get a page of accommodation columns ordered by ID"""
+        return fetch_page(self.session, AccommodationORM.__table__.columns, ("id",), fields, cursor, limit)
 
     def get_by_id(self, id: int) -> Optional[Accommodation]:
         """Get an accommodation by ID"""
-        orm_accommodation = self.session.query(AccommodationORM).filter(
+        rows = self.session.connection().execute(ACCOMMODATION.select().where(
             AccommodationORM.id == id
-        ).first()
-        return orm_accommodation.to_domain() if orm_accommodation else None
+        ))
+        return ACCOMMODATION.first(rows)
 
     def save(self, accommodation: Accommodation) -> Accommodation:
         """Save or update an accommodation"""
@@ -477,6 +617,7 @@ class SQLAlchemyAccommodationRepositoryImpl(AccommodationRepositoryInterface):
         else:
             self.session.add(orm_accommodation)
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         self.session.refresh(orm_accommodation)
         return orm_accommodation.to_domain()
 
@@ -486,6 +627,7 @@ class SQLAlchemyAccommodationRepositoryImpl(AccommodationRepositoryInterface):
             AccommodationORM.id == id
         ).delete()
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         return result > 0
 
 
@@ -497,43 +639,42 @@ class SQLAlchemyAccommodationAssignmentRepositoryImpl(AccommodationAssignmentRep
 
     def get_all(self) -> List[AccommodationAssignment]:
         """Get all accommodation assignments"""
-        orm_assignments = self.session.query(AccommodationAssignmentORM).all()
-        return [assign.to_domain() for assign in orm_assignments]
+        return ACCOMMODATION_ASSIGNMENT_WITH_RELATED.all(self.session.connection().execute(select_accommodation_assignments()))
 
     def get_by_id(self, id: int) -> Optional[AccommodationAssignment]:
         """Get an accommodation assignment by ID"""
-        orm_assignment = self.session.query(AccommodationAssignmentORM).filter(
+        rows = self.session.connection().execute(select_accommodation_assignments().where(
             AccommodationAssignmentORM.id == id
-        ).first()
-        return orm_assignment.to_domain() if orm_assignment else None
+        ))
+        return ACCOMMODATION_ASSIGNMENT_WITH_RELATED.first(rows)
 
     def get_by_crew_member(self, crew_member_id: int) -> List[AccommodationAssignment]:
         """Get all accommodation assignments for a specific crew member"""
-        orm_assignments = self.session.query(AccommodationAssignmentORM).filter(
+        rows = self.session.connection().execute(select_accommodation_assignments().where(
             AccommodationAssignmentORM.crew_member_id == crew_member_id
-        ).all()
-        return [assign.to_domain() for assign in orm_assignments]
+        ))
+        return ACCOMMODATION_ASSIGNMENT_WITH_RELATED.all(rows)
 
     def get_by_date_range(self, start_date: date, end_date: date) -> List[AccommodationAssignment]:
         """Get accommodation assignments that overlap with the given date range"""
-        orm_assignments = self.session.query(AccommodationAssignmentORM).filter(
+        rows = self.session.connection().execute(select_accommodation_assignments().where(
             and_(
                 AccommodationAssignmentORM.start_date <= end_date,
                 AccommodationAssignmentORM.end_date >= start_date
             )
-        ).all()
-        return [assign.to_domain() for assign in orm_assignments]
+        ))
+        return ACCOMMODATION_ASSIGNMENT_WITH_RELATED.all(rows)
 
     def get_by_accommodation_and_date_range(self, accommodation_id: int, start_date: date, end_date: date) -> List[AccommodationAssignment]:
         """Get accommodation assignments for a specific accommodation that overlap with the given date range"""
-        orm_assignments = self.session.query(AccommodationAssignmentORM).filter(
+        rows = self.session.connection().execute(select_accommodation_assignments().where(
             and_(
                 AccommodationAssignmentORM.accommodation_id == accommodation_id,
                 AccommodationAssignmentORM.start_date <= end_date,
                 AccommodationAssignmentORM.end_date >= start_date
             )
-        ).all()
-        return [assign.to_domain() for assign in orm_assignments]
+        ))
+        return ACCOMMODATION_ASSIGNMENT_WITH_RELATED.all(rows)
 
     def save(self, assignment: AccommodationAssignment) -> AccommodationAssignment:
         """Save or update an accommodation assignment"""
@@ -543,7 +684,11 @@ class SQLAlchemyAccommodationAssignmentRepositoryImpl(AccommodationAssignmentRep
         else:
             self.session.add(orm_assignment)
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         self.session.refresh(orm_assignment)
+        if assignment.crew_member is not None and assignment.accommodation is not None:
+            # Keep the crew member and accommodation given by the caller instead of lazy loading them
+            return replace(assignment, id=orm_assignment.id)
         return orm_assignment.to_domain()
 
     def delete(self, id: int) -> bool:
@@ -552,4 +697,112 @@ class SQLAlchemyAccommodationAssignmentRepositoryImpl(AccommodationAssignmentRep
             AccommodationAssignmentORM.id == id
         ).delete()
         self.session.commit()
+        bump_data_version(CREW_DATA_VERSION)
         return result > 0
+
+
+class SQLAlchemyDailyStatsRepositoryImpl(DailyStatsRepositoryInterface):
+    """SQLAlchemy implementation of the DailyStatsRepository interface"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _load_students(self, *filters):
+        """Load the student columns the rollup is built from"""
+        return self.session.query(
+            StudentORM.arrival, StudentORM.departure, StudentORM.booking_status, StudentORM.age_group,
+            StudentORM.level, StudentORM.number_of_surf_lessons
+        ).filter(*filters).all()
+
+    def _insert(self, stats_rows: List[Dict], lesson_rows: List[Dict]):
+        if stats_rows:
+            self.session.execute(insert(DailyStatsORM), stats_rows)
+        if lesson_rows:
+            self.session.execute(insert(DailyLessonStatsORM), lesson_rows)
+
+    def ensure_built(self):
+        """
+        Build the rollup if it has not been built yet.
+
+        Only the BUILT marker row of the last rebuild is looked up, student
+        writes keep the rollup current in their own transactions. Students
+        written to the database directly need a rebuild.
+        """
+        built = self.session.query(DailyStatsORM.day).filter(
+            DailyStatsORM.day == BUILT_MARKER_DAY, DailyStatsORM.event == BUILT
+        ).first()
+        if built is None:
+            self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the rollup from all students and mark it built"""
+        logger.info("Rebuilding the daily stats rollup")
+        self.session.query(DailyLessonStatsORM).delete()
+        self.session.query(DailyStatsORM).delete()
+        stats_rows, lesson_rows = build_rollup_rows(self._load_students())
+        self._insert([*stats_rows, built_marker_row()], lesson_rows)
+        self.session.commit()
+
+    def refresh_days(self, days: Iterable[date], commit: bool = True):
+        """
+        Recompute the rollup rows of the given days from the students arriving or departing on them.
+
+        Args:
+            days: Days to recompute
+            commit: False to leave the commit to the caller, so that the rollup rows are
+                written in the same transaction as the student changes they reflect
+        """
+        days = {day for day in days if day}
+        if not days:
+            return
+
+        self.session.query(DailyLessonStatsORM).filter(DailyLessonStatsORM.day.in_(days)).delete()
+        self.session.query(DailyStatsORM).filter(DailyStatsORM.day.in_(days)).delete()
+
+        students = self._load_students(or_(StudentORM.arrival.in_(days), StudentORM.departure.in_(days)))
+        stats_rows, lesson_rows = build_rollup_rows(students)
+        # The other end of a loaded stay may lie on a day that is not refreshed
+        self._insert([row for row in stats_rows if row["day"] in days],
+                     [row for row in lesson_rows if row["day"] in days])
+        if commit:
+            self.session.commit()
+
+    def _daily_totals_select(self, end_date: date, *columns):
+        return select(
+            DailyStatsORM.day, DailyStatsORM.event, *columns,
+            *(func.sum(getattr(DailyStatsORM, metric)).label(metric) for metric in ROLLUP_METRICS)
+        ).where(
+            DailyStatsORM.day <= end_date
+        ).group_by(DailyStatsORM.day, DailyStatsORM.event)
+
+    def get_daily_totals(self, end_date: date) -> List[Dict]:
+        """Get the rollup rows up to and including end_date, with the BUILT marker row once the rollup is built"""
+        rows = self.session.execute(self._daily_totals_select(end_date)).all()
+        # MySQL returns SUM() as Decimal
+        return [{"day": row.day, "event": row.event, **{metric: int(row._mapping[metric]) for metric in ROLLUP_METRICS}}
+                for row in rows]
+
+    def get_daily_totals_with_lessons(self, end_date: date) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Get the rollup rows and the lesson rows up to and including end_date with one query.
+
+        Returns:
+            Tuple of (rows as returned by get_daily_totals, daily lesson stats rows)
+        """
+        lessons = select(
+            DailyLessonStatsORM.day, DailyLessonStatsORM.event, DailyLessonStatsORM.number_of_lessons,
+            DailyLessonStatsORM.guests, *(literal(0, Integer) for _ in ROLLUP_METRICS[1:])
+        ).where(DailyLessonStatsORM.day <= end_date)
+        # Rollup rows have no number of lessons, lesson rows carry their guests in the guests column
+        statement = union_all(
+            self._daily_totals_select(end_date, cast(null(), Integer).label("number_of_lessons")), lessons)
+
+        stats_rows, lesson_rows = [], []
+        for row in self.session.execute(statement).all():
+            if row.number_of_lessons is None:
+                stats_rows.append({"day": row.day, "event": row.event,
+                                   **{metric: int(row._mapping[metric]) for metric in ROLLUP_METRICS}})
+            else:
+                lesson_rows.append({"day": row.day, "event": row.event, "number_of_lessons": row.number_of_lessons,
+                                    "guests": int(row.guests)})
+        return stats_rows, lesson_rows
@@ -1,10 +1,24 @@
+import sys
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import List, Optional
 from enum import Enum
 
 
-@dataclass
+def intern_categories(obj, *names):
+    """
+    Intern string values of categorical fields.
+
+    Values such as age group, level or booking status repeat a handful of times
+    across a season; interned, all objects share one string per value.
+    """
+    for name in names:
+        value = getattr(obj, name)
+        if type(value) is str:
+            setattr(obj, name, sys.intern(value))
+
+
+@dataclass(slots=True)
 class Booking:
     booking_id: str
     booker_id: str
@@ -25,8 +39,12 @@ class Booking:
     number_of_yoga_lessons: int = 0
     number_of_skate_lessons: int = 0
 
+    def __post_init__(self):
+        intern_categories(self, "gender", "group", "level", "booking_status", "surf_lesson_package_name",
+                          "diet", "tent")
 
-@dataclass
+
+@dataclass(slots=True)
 class Student:
     id: int
     first_name: str
@@ -44,14 +62,18 @@ class Student:
     tent: str
     single_parent: bool = False
 
+    def __post_init__(self):
+        intern_categories(self, "gender", "age_group", "level", "booking_status", "surf_lesson_package_name",
+                          "tent")
+
 
-@dataclass
+@dataclass(slots=True)
 class Instructor:
     name: str
     certification: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Group:
     level: str
     age_group: str
@@ -59,13 +81,13 @@ class Group:
     instructors: List[Instructor] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Slot:
     slot_time: datetime
     groups: List[Group] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SurfPlan:
     plan_date: date
     slots: List[Slot] = field(default_factory=list)
@@ -85,7 +107,7 @@ class Team(str, Enum):
     RECEPTION = "RECEPTION"
 
 
-@dataclass
+@dataclass(slots=True)
 class CrewMember:
     """Crew member model"""
     id: Optional[int]
@@ -98,7 +120,7 @@ class CrewMember:
     notes: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Position model with team"""
     id: Optional[int]
@@ -107,7 +129,7 @@ class Position:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class CrewAssignment:
     """Crew assignment model - who is assigned to which position and when"""
     id: Optional[int]
@@ -118,7 +140,7 @@ class CrewAssignment:
     position: Optional[Position] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Accommodation:
     """Accommodation model - tent, caravan, etc."""
     id: Optional[int]
@@ -128,7 +150,7 @@ class Accommodation:
     notes: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class AccommodationAssignment:
     """Assignment of crew member to accommodation"""
     id: Optional[int]
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List, Tuple
 
 from app.domain.models import (
     Booking, SurfPlan, Student, Instructor, Group, Slot,
@@ -34,6 +34,10 @@ class StudentRepositoryInterface(ABC):
     def get_by_id(self, id: int) -> Optional[Student]:
         pass
 
+    @abstractmethod
+    def get_by_ids(self, ids: List[int]) -> List[Student]:
+        pass
+
     @abstractmethod
     def get_by_booking_number(self, booking_number: str) -> Optional[Student]:
         pass
@@ -46,17 +50,27 @@ class StudentRepositoryInterface(ABC):
     def get_students_with_booked_lessons(self) -> List[Student]:
         pass
 
+    @abstractmethod
+    def get_page(self, fields: Optional[str] = None, cursor: Optional[str] = None, limit: int = 100,
+                 order_by: str = "id", start_date: Optional[date] = None,
+                 end_date: Optional[date] = None) -> Tuple[List[Dict], Optional[str]]:
+        pass
+
     @abstractmethod
     def save(self, student: Student) -> Student:
         pass
 
     @abstractmethod
-    def save_all(self, students: List[Student]) -> List[Student]:
+    def save_all(self, students: List[Student], bump_version: bool = True) -> List[Student]:
         pass
     @abstractmethod
     def update(self, id: int, student: Student) -> Student:
         pass
 
+    @abstractmethod
+    def update_many(self, updates: List[Tuple[int, Student]], bump_version: bool = True) -> int:
+        pass
+
     @abstractmethod
     def delete(self, id: int) -> bool:
         pass
@@ -148,6 +162,12 @@ class CrewMemberRepositoryInterface(ABC):
         """Get all crew members for a specific team"""
         pass
     
+    @abstractmethod
+    def get_page(self, fields: Optional[str] = None, cursor: Optional[str] = None, limit: int = 100,
+                 team: Optional[Team] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get a page of crew member columns ordered by ID"""
+        pass
+    
     @abstractmethod
     def save(self, crew_member: CrewMember) -> CrewMember:
         """Save or update a crew member"""
@@ -177,6 +197,12 @@ class PositionRepositoryInterface(ABC):
         """Get all positions for a specific team"""
         pass
     
+    @abstractmethod
+    def get_page(self, fields: Optional[str] = None, cursor: Optional[str] = None, limit: int = 100,
+                 team: Optional[Team] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get a page of position columns ordered by ID"""
+        pass
+    
     @abstractmethod
     def save(self, position: Position) -> Position:
         """Save or update a position"""
@@ -202,8 +228,8 @@ class CrewAssignmentRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    def get_by_date_range(self, start_date: date, end_date: date) -> List[CrewAssignment]:
-        """Get crew assignments within a date range"""
+    def get_by_date_range(self, start_date: date, end_date: date, with_related: bool = True) -> List[CrewAssignment]:
+        """Get crew assignments within a date range, without crew member and position if with_related is False"""
         pass
     
     @abstractmethod
@@ -235,6 +261,12 @@ class AccommodationRepositoryInterface(ABC):
         """Get an accommodation by ID"""
         pass
     
+    @abstractmethod
+    def get_page(self, fields: Optional[str] = None, cursor: Optional[str] = None,
+                 limit: int = 100) -> Tuple[List[Dict], Optional[str]]:
+        """Get a page of accommodation columns ordered by ID"""
+        pass
+    
     @abstractmethod
     def save(self, accommodation: Accommodation) -> Accommodation:
         """Save or update an accommodation"""
@@ -285,3 +317,32 @@ class AccommodationAssignmentRepositoryInterface(ABC):
     def delete(self, id: int) -> bool:
         """Delete an accommodation assignment by ID"""
         pass
+
+
+class DailyStatsRepositoryInterface(ABC):
+    """Repository interface for the daily statistics rollup (see app.utils.daily_stats)"""
+    
+    @abstractmethod
+    def ensure_built(self):
+        """Build the rollup if it has not been built yet"""
+        pass
+    
+    @abstractmethod
+    def rebuild(self):
+        """Rebuild the rollup from all students"""
+        pass
+    
+    @abstractmethod
+    def refresh_days(self, days: Iterable[date], commit: bool = True):
+        """Recompute the rollup rows of the given days, committed unless commit is False"""
+        pass
+    
+    @abstractmethod
+    def get_daily_totals(self, end_date: date) -> List[Dict]:
+        """Get the rollup rows up to and including end_date, with the BUILT marker row once built"""
+        pass
+    
+    @abstractmethod
+    def get_daily_totals_with_lessons(self, end_date: date) -> Tuple[List[Dict], List[Dict]]:
+        """Get the rollup rows and the daily lesson stats rows up to and including end_date with one query"""
+        pass
@@ -0,0 +1,148 @@
+"""In-process memoization of analytics results."""
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import ANALYTICS_CACHE_TTL_SECONDS, ANALYTICS_CACHE_MAX_ENTRIES
+from app.core.data_version import get_data_version
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsCache:
+    """
+    TTL and LRU bounded cache for analytics results.
+
+    Keys include the data version, so entries computed before a CSV import or
+    a student write are never returned again; they age out through the TTL or
+    LRU eviction. Cached values are shared between callers and must not be
+    modified.
+    """
+
+    def __init__(self, ttl_seconds: float = ANALYTICS_CACHE_TTL_SECONDS,
+                 max_entries: int = ANALYTICS_CACHE_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Time after which an entry is recomputed
+            max_entries: Maximum number of entries, least recently used entries are evicted
+            clock: Monotonic time source (replaced in tests)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached value.
+
+        Returns:
+            Tuple of (hit, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries above max_entries."""
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+analytics_cache = AnalyticsCache()
+
+
+def _hashable(value):
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def make_key(method_name: str, args: tuple, kwargs: dict) -> Hashable:
+    """Build the cache key of a method call for the current data version."""
+    return (method_name, _hashable(args), tuple(sorted((k, _hashable(v)) for k, v in kwargs.items())),
+            get_data_version())
+
+
+def memoized(method):
+    """
+    Memoize an analytics service method in the service's cache.
+
+    The service instance must have a ``cache`` attribute; no caching is done
+    when it is None. Works for both sync and async methods.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            cache: Optional[AnalyticsCache] = self.cache
+            if cache is None:
+                return await method(self, *args, **kwargs)
+            key = make_key(method.__name__, args, kwargs)
+            hit, value = cache.get(key)
+            if not hit:
+                value = await method(self, *args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache: Optional[AnalyticsCache] = self.cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+        key = make_key(method.__name__, args, kwargs)
+        hit, value = cache.get(key)
+        if not hit:
+            value = method(self, *args, **kwargs)
+            cache.put(key, value)
+        return value
+
+    return wrapper
@@ -1,28 +1,318 @@
 """Analytics service for surf planner statistics."""
 import logging
-from datetime import date
-from typing import Dict, List, Optional, Set
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from collections import defaultdict
 
-from app.domain.repositories_interfaces import StudentRepositoryInterface
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.domain.repositories_interfaces import StudentRepositoryInterface, DailyStatsRepositoryInterface
+from app.services.analytics_cache import AnalyticsCache, memoized
+from app.data.season_snapshot import SeasonSnapshot
 from app.utils.student_utils import is_adult, is_teen, is_kid, is_level, filter_active_students, filter_students_with_lessons
 from app.utils.date_utils import TimePeriod, split_date_range_by_period
+from app.utils.daily_stats import (lesson_distribution, overlap_totals, rollup_is_built, statistics_from_totals,
+                                   period_metrics_from_totals, month_statistics_from_totals)
 
 logger = logging.getLogger(__name__)
 
+ALL_FLEXIBLE_FILTERS = {
+    'teens', 'adults', 'kids', 'total_guests',
+    'surf_lessons', 'yoga_lessons', 'skate_lessons',
+    'beginner', 'beginner_plus', 'intermediate', 'advanced',
+    'teen_students', 'kid_students'
+}
+
+
+def students_in_period(students: List, start_date: date, end_date: date) -> List:
+    """
+    Filter students whose stay overlaps with the specified period.
+
+    Args:
+        students: Students to filter
+        start_date: Start date of the period
+        end_date: End date of the period
+
+    Returns:
+        List of students
+    """
+    return [
+        student for student in students
+        if student.arrival <= end_date and student.departure >= start_date
+    ]
+
+
+def compute_age_group_statistics(students: List) -> Dict:
+    """Count active students by age group."""
+    active_students = filter_active_students(students)
+
+    adults = sum(1 for s in active_students if is_adult(s))
+    teens = sum(1 for s in active_students if is_teen(s))
+    kids = sum(1 for s in active_students if is_kid(s))
+
+    return {
+        "adults": adults,
+        "teens": teens,
+        "kids": kids,
+        "total": adults + teens + kids
+    }
+
+
+def compute_surf_lesson_statistics(students: List) -> Dict:
+    """Compute lesson statistics for the active students."""
+    active_students = filter_active_students(students)
+
+    with_lessons = filter_students_with_lessons(active_students)
+    without_lessons = [s for s in active_students if s.number_of_surf_lessons == 0]
+
+    # Calculate average lessons
+    total_lessons = sum(s.number_of_surf_lessons for s in with_lessons)
+    avg_lessons = total_lessons / len(with_lessons) if with_lessons else 0
+
+    # Calculate lesson distribution
+    lesson_counts = defaultdict(int)
+    for student in with_lessons:
+        lesson_counts[student.number_of_surf_lessons] += 1
+
+    return {
+        "total_guests": len(active_students),
+        "guests_with_lessons": len(with_lessons),
+        "guests_without_lessons": len(without_lessons),
+        "average_lessons": round(avg_lessons, 2),
+        "lesson_distribution": dict(lesson_counts)
+    }
+
+
+def compute_level_distribution(students: List) -> Dict:
+    """Count active students with lessons by skill level."""
+    active_students = filter_active_students(students)
+    with_lessons = filter_students_with_lessons(active_students)
+
+    # Count by level
+    beginner = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "BEGINNER"))
+    beginner_plus = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "BEGINNER PLUS"))
+    intermediate = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "INTERMEDIATE"))
+    advanced = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "ADVANCED"))
+    teens = sum(1 for s in with_lessons if is_teen(s))
+    kids = sum(1 for s in with_lessons if is_kid(s))
+
+    return {
+        "beginner": beginner,
+        "beginner_plus": beginner_plus,
+        "intermediate": intermediate,
+        "advanced": advanced,
+        "teens": teens,
+        "kids": kids
+    }
+
+
+def compute_comprehensive_statistics(students: List) -> Dict:
+    """
+    Compute age group, surf lesson and skill level statistics in a single pass.
+
+    Gives the same results as compute_age_group_statistics,
+    compute_surf_lesson_statistics and compute_level_distribution.
+
+    Returns:
+        Dictionary with "age_groups", "surf_lessons" and "skill_levels"
+    """
+    adults = teens = kids = 0
+    total_guests = guests_with_lessons = guests_without_lessons = total_lessons = 0
+    lesson_counts = defaultdict(int)
+    levels = {"BEGINNER": 0, "BEGINNER PLUS": 0, "INTERMEDIATE": 0, "ADVANCED": 0}
+    teen_students = kid_students = 0
+
+    for student in students:
+        if student.booking_status == "cancelled" or student.booking_status == "expired":
+            continue
+        total_guests += 1
+        adult, teen, kid = is_adult(student), is_teen(student), is_kid(student)
+        adults += adult
+        teens += teen
+        kids += kid
+
+        lessons = student.number_of_surf_lessons
+        if lessons == 0:
+            guests_without_lessons += 1
+        if not lessons > 0:
+            continue
+        guests_with_lessons += 1
+        total_lessons += lessons
+        lesson_counts[lessons] += 1
+        teen_students += teen
+        kid_students += kid
+        if adult:
+            level = (student.level or "BEGINNER").strip().upper()
+            if level in levels:
+                levels[level] += 1
+
+    return {
+        "age_groups": {
+            "adults": adults,
+            "teens": teens,
+            "kids": kids,
+            "total": adults + teens + kids
+        },
+        "surf_lessons": {
+            "total_guests": total_guests,
+            "guests_with_lessons": guests_with_lessons,
+            "guests_without_lessons": guests_without_lessons,
+            "average_lessons": round(total_lessons / guests_with_lessons, 2) if guests_with_lessons else 0,
+            "lesson_distribution": dict(lesson_counts)
+        },
+        "skill_levels": {
+            "beginner": levels["BEGINNER"],
+            "beginner_plus": levels["BEGINNER PLUS"],
+            "intermediate": levels["INTERMEDIATE"],
+            "advanced": levels["ADVANCED"],
+            "teens": teen_students,
+            "kids": kid_students
+        }
+    }
+
+
+def compute_year_over_year(students: List, years: List[int]) -> List[Dict]:
+    """
+    Compute the monthly overview of several years from one pass over the students.
+
+    Every month after the first year also contains the change of total guests
+    and total lessons compared to the same month of the previous listed year.
+
+    Args:
+        students: Students overlapping the years
+        years: Years to compare, in the order they are returned
+
+    Returns:
+        List of {"year": year, "months": [monthly statistics]} dictionaries
+    """
+    from app.utils.year_overview import year_overview
+
+    return add_year_over_year_changes(year_overview(filter_active_students(students), years), years)
+
+
+def year_overview_from_rollup(rows: List[Dict], years: List[int]) -> Dict[int, List[Dict]]:
+    """Build the monthly overview of each year from daily stats rollup rows."""
+    months = [(year, month) for year in years for month in range(1, 13)]
+    periods = [
+        (date(year, month, 1), (date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)) - timedelta(days=1))
+        for year, month in months
+    ]
+    overview = {year: [] for year in years}
+    for (year, month), totals in zip(months, overlap_totals(rows, periods)):
+        overview[year].append(month_statistics_from_totals(year, month, totals))
+    return overview
+
+
+def add_year_over_year_changes(overview: Dict[int, List[Dict]], years: List[int]) -> List[Dict]:
+    """
+    Turn a monthly overview per year into the year over year comparison.
+
+    Returns:
+        List of {"year": year, "months": [monthly statistics]} dictionaries
+    """
+    comparison = []
+    previous_months = None
+    for year in years:
+        months = [dict(month) for month in overview[year]]
+        if previous_months is not None:
+            for month, previous in zip(months, previous_months):
+                month["total_guests_change"] = month["total_guests"] - previous["total_guests"]
+                month["total_lessons_change"] = month["total_lessons"] - previous["total_lessons"]
+        comparison.append({"year": year, "months": months})
+        previous_months = months
+    return comparison
+
+
+def compute_period_metrics(period_start: date, period_end: date, students: List, filters: Set[str]) -> Dict:
+    """Compute the selected flexible analytics metrics for students overlapping one period."""
+    period_data = {
+        "period_start": period_start.isoformat(),
+        "period_end": period_end.isoformat(),
+    }
+
+    active_students = filter_active_students(students)
+
+    # Calculate metrics based on filters
+    if 'total_guests' in filters:
+        period_data['total_guests'] = len(active_students)
+
+    # Age group counts
+    if 'adults' in filters:
+        period_data['adults'] = sum(1 for s in active_students if is_adult(s))
+
+    if 'teens' in filters:
+        period_data['teens'] = sum(1 for s in active_students if is_teen(s))
+
+    if 'kids' in filters:
+        period_data['kids'] = sum(1 for s in active_students if is_kid(s))
+
+    # Lesson counts
+    if 'surf_lessons' in filters:
+        period_data['surf_lessons'] = sum(s.number_of_surf_lessons for s in active_students)
+
+    # Skill level breakdown (for students with surf lessons)
+    with_lessons = filter_students_with_lessons(active_students)
+
+    if 'beginner' in filters:
+        period_data['beginner'] = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "BEGINNER"))
+
+    if 'beginner_plus' in filters:
+        period_data['beginner_plus'] = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "BEGINNER PLUS"))
+
+    if 'intermediate' in filters:
+        period_data['intermediate'] = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "INTERMEDIATE"))
+
+    if 'advanced' in filters:
+        period_data['advanced'] = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "ADVANCED"))
+
+    if 'teen_students' in filters:
+        period_data['teen_students'] = sum(1 for s in with_lessons if is_teen(s))
+
+    if 'kid_students' in filters:
+        period_data['kid_students'] = sum(1 for s in with_lessons if is_kid(s))
+
+    return period_data
+
+
+def compute_lessons_per_day(students: List, start_date: date, end_date: date) -> List[Dict]:
+    """Forecast lessons per day for the active students with lessons."""
+    from app.utils.lesson_allocation import lessons_per_day
+
+    with_lessons = filter_students_with_lessons(filter_active_students(students))
+    return lessons_per_day(with_lessons, start_date, end_date)
+
+
+def period_dict(start_date: date, end_date: date) -> Dict:
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat()
+    }
+
 
 class AnalyticsService:
     """Service for generating analytics and statistics about surf students."""
 
-    def __init__(self, student_repository: StudentRepositoryInterface):
+    def __init__(self, student_repository: StudentRepositoryInterface, cache: Optional[AnalyticsCache] = None,
+                 daily_stats_repository: Optional[DailyStatsRepositoryInterface] = None,
+                 season_snapshot: Optional[SeasonSnapshot] = None):
         """
         Initialize the analytics service.
 
         Args:
             student_repository: Repository for accessing student data
+            cache: Cache for memoizing results, None to always recompute
+            daily_stats_repository: Daily stats rollup to answer period statistics from,
+                None to scan the students
+            season_snapshot: Columnar snapshot of the current data to forecast lessons from,
+                None to scan the students
         """
         self.student_repository = student_repository
+        self.cache = cache
+        self.daily_stats_repository = daily_stats_repository
+        self.season_snapshot = season_snapshot
 
+    @memoized
     def get_age_group_statistics(self, start_date: date, end_date: date) -> Dict:
         """
         Get count of guests by age group (Adults, Teens, Kids).
@@ -36,20 +326,11 @@ class AnalyticsService:
         """
         logger.info(f"Getting age group statistics from {start_date} to {end_date}")
 
-        students = self._get_students_for_period(start_date, end_date)
-        active_students = filter_active_students(students)
-
-        adults = sum(1 for s in active_students if is_adult(s))
-        teens = sum(1 for s in active_students if is_teen(s))
-        kids = sum(1 for s in active_students if is_kid(s))
-
-        return {
-            "adults": adults,
-            "teens": teens,
-            "kids": kids,
-            "total": adults + teens + kids
-        }
+        if self.daily_stats_repository:
+            return self._rollup_statistics(start_date, end_date)["age_groups"]
+        return compute_age_group_statistics(self._get_students_for_period(start_date, end_date))
 
+    @memoized
     def get_surf_lesson_statistics(self, start_date: date, end_date: date) -> Dict:
         """
         Get comprehensive surf lesson statistics.
@@ -68,29 +349,11 @@ class AnalyticsService:
         """
         logger.info(f"Getting surf lesson statistics from {start_date} to {end_date}")
 
-        students = self._get_students_for_period(start_date, end_date)
-        active_students = filter_active_students(students)
-
-        with_lessons = filter_students_with_lessons(active_students)
-        without_lessons = [s for s in active_students if s.number_of_surf_lessons == 0]
-
-        # Calculate average lessons
-        total_lessons = sum(s.number_of_surf_lessons for s in with_lessons)
-        avg_lessons = total_lessons / len(with_lessons) if with_lessons else 0
-
-        # Calculate lesson distribution
-        lesson_counts = defaultdict(int)
-        for student in with_lessons:
-            lesson_counts[student.number_of_surf_lessons] += 1
-
-        return {
-            "total_guests": len(active_students),
-            "guests_with_lessons": len(with_lessons),
-            "guests_without_lessons": len(without_lessons),
-            "average_lessons": round(avg_lessons, 2),
-            "lesson_distribution": dict(lesson_counts)
-        }
+        if self.daily_stats_repository:
+            return self._rollup_statistics(start_date, end_date, with_lesson_distribution=True)["surf_lessons"]
+        return compute_surf_lesson_statistics(self._get_students_for_period(start_date, end_date))
 
+    @memoized
     def get_level_distribution(self, start_date: date, end_date: date) -> Dict:
         """
         Get distribution of surf skill levels (only for students with lessons).
@@ -104,27 +367,11 @@ class AnalyticsService:
         """
         logger.info(f"Getting level distribution from {start_date} to {end_date}")
 
-        students = self._get_students_for_period(start_date, end_date)
-        active_students = filter_active_students(students)
-        with_lessons = filter_students_with_lessons(active_students)
-
-        # Count by level
-        beginner = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "BEGINNER"))
-        beginner_plus = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "BEGINNER PLUS"))
-        intermediate = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "INTERMEDIATE"))
-        advanced = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "ADVANCED"))
-        teens = sum(1 for s in with_lessons if is_teen(s))
-        kids = sum(1 for s in with_lessons if is_kid(s))
-
-        return {
-            "beginner": beginner,
-            "beginner_plus": beginner_plus,
-            "intermediate": intermediate,
-            "advanced": advanced,
-            "teens": teens,
-            "kids": kids
-        }
+        if self.daily_stats_repository:
+            return self._rollup_statistics(start_date, end_date)["skill_levels"]
+        return compute_level_distribution(self._get_students_for_period(start_date, end_date))
 
+    @memoized
     def get_monthly_overview(self, year: int) -> List[Dict]:
         """
         Get monthly overview for an entire year.
@@ -137,47 +384,31 @@ class AnalyticsService:
         """
         logger.info(f"Getting monthly overview for year {year}")
 
-        monthly_data = []
-
-        for month in range(1, 13):
-            # Get first and last day of the month
-            if month == 12:
-                start_date = date(year, month, 1)
-                end_date = date(year, month, 31)
-            else:
-                start_date = date(year, month, 1)
-                # Get last day of current month
-                next_month = date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)
-                end_date = date(next_month.year, next_month.month, 1)
-                # Move back one day to get last day of current month
-                from datetime import timedelta
-                end_date = end_date - timedelta(days=1)
-
-            students = self._get_students_for_period(start_date, end_date)
-            active_students = filter_active_students(students)
-            with_lessons = filter_students_with_lessons(active_students)
-
-            # Calculate age groups
-            adults = sum(1 for s in active_students if is_adult(s))
-            teens = sum(1 for s in active_students if is_teen(s))
-            kids = sum(1 for s in active_students if is_kid(s))
-
-            # Calculate total lessons
-            total_lessons = sum(s.number_of_surf_lessons for s in with_lessons)
-
-            monthly_data.append({
-                "month": month,
-                "month_name": date(year, month, 1).strftime("%B"),
-                "total_guests": len(active_students),
-                "guests_with_lessons": len(with_lessons),
-                "total_lessons": total_lessons,
-                "adults": adults,
-                "teens": teens,
-                "kids": kids
-            })
-
-        return monthly_data
+        if self.daily_stats_repository:
+            return self._rollup_year_overview([year])[year]
+        students = self._get_students_for_period(date(year, 1, 1), date(year, 12, 31))
+        return compute_year_over_year(students, [year])[0]["months"]
 
+    @memoized
+    def get_year_over_year(self, years: List[int]) -> List[Dict]:
+        """
+        Compare the monthly overview of several years.
+
+        Args:
+            years: Years to compare
+
+        Returns:
+            List of dictionaries with the year and its monthly statistics, including the
+            change compared to the previous listed year
+        """
+        logger.info(f"Getting year over year overview for years {years}")
+
+        if self.daily_stats_repository:
+            return add_year_over_year_changes(self._rollup_year_overview(years), years)
+        students = self._get_students_for_period(date(min(years), 1, 1), date(max(years), 12, 31))
+        return compute_year_over_year(students, years)
+
+    @memoized
     def get_comprehensive_statistics(self, start_date: date, end_date: date) -> Dict:
         """
         Get all statistics combined.
@@ -191,16 +422,35 @@ class AnalyticsService:
         """
         logger.info(f"Getting comprehensive statistics from {start_date} to {end_date}")
 
-        return {
-            "age_groups": self.get_age_group_statistics(start_date, end_date),
-            "surf_lessons": self.get_surf_lesson_statistics(start_date, end_date),
-            "skill_levels": self.get_level_distribution(start_date, end_date),
-            "period": {
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat()
-            }
-        }
+        if self.daily_stats_repository:
+            statistics = self._rollup_statistics(start_date, end_date, with_lesson_distribution=True)
+        else:
+            statistics = compute_comprehensive_statistics(self._get_students_for_period(start_date, end_date))
+        statistics["period"] = period_dict(start_date, end_date)
+        return statistics
+
+    @memoized
+    def get_lessons_per_day_forecast(self, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Forecast how many surf lessons take place on each day.
+
+        Lessons are planned on consecutive days starting the day after arrival
+        until all booked lessons are used up or the student departs.
 
+        Args:
+            start_date: Start date for the forecast
+            end_date: End date for the forecast (inclusive)
+
+        Returns:
+            List of dictionaries with "date" and "lessons" for each day
+        """
+        logger.info(f"Getting lessons per day forecast from {start_date} to {end_date}")
+
+        if self.season_snapshot is not None:
+            return self.season_snapshot.lessons_per_day(start_date, end_date)
+        return compute_lessons_per_day(self._get_students_for_period(start_date, end_date), start_date, end_date)
+
+    @memoized
     def get_flexible_analytics(
         self,
         start_date: date,
@@ -228,83 +478,127 @@ class AnalyticsService:
 
         # If no filters specified, include all metrics
         if filters is None:
-            filters = {
-                'teens', 'adults', 'kids', 'total_guests',
-                'surf_lessons', 'yoga_lessons', 'skate_lessons',
-                'beginner', 'beginner_plus', 'intermediate', 'advanced',
-                'teen_students', 'kid_students'
-            }
+            filters = ALL_FLEXIBLE_FILTERS
 
         # Split the date range into periods
         periods = split_date_range_by_period(start_date, end_date, period)
 
-        results = []
-        for period_start, period_end in periods:
-            period_data = {
-                "period_start": period_start.isoformat(),
-                "period_end": period_end.isoformat(),
-            }
+        if self.daily_stats_repository:
+            return [
+                period_metrics_from_totals(period_start, period_end, totals, filters)
+                for (period_start, period_end), totals in zip(periods, self._rollup_totals(periods))
+            ]
+        students = self._get_students_for_period(start_date, end_date)
+        return [
+            compute_period_metrics(period_start, period_end,
+                                   students_in_period(students, period_start, period_end), filters)
+            for period_start, period_end in periods
+        ]
+
+    def _get_students_for_period(self, start_date: date, end_date: date) -> List:
+        """
+        Get students whose stay overlaps with the specified period.
+
+        Args:
+            start_date: Start date of the period
+            end_date: End date of the period
+
+        Returns:
+            List of students
+        """
+        return students_in_period(self.student_repository.get_all(), start_date, end_date)
 
-            # Get students for this period
-            students = self._get_students_for_period(period_start, period_end)
-            active_students = filter_active_students(students)
+    def _read_rollup(self, end_date: date, with_lessons: bool):
+        if with_lessons:
+            return self.daily_stats_repository.get_daily_totals_with_lessons(end_date)
+        return self.daily_stats_repository.get_daily_totals(end_date), []
 
-            # Calculate metrics based on filters
-            if 'total_guests' in filters:
-                period_data['total_guests'] = len(active_students)
+    def _rollup_rows(self, end_date: date, with_lessons: bool = False) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Get the rollup rows up to end_date with one query, rebuilding the rollup first if it was never built.
 
-            # Age group counts
-            if 'adults' in filters:
-                period_data['adults'] = sum(1 for s in active_students if is_adult(s))
+        Returns:
+            Tuple of (rollup rows, lesson rows if with_lessons else [])
+        """
+        rows, lesson_rows = self._read_rollup(end_date, with_lessons)
+        if not rollup_is_built(rows):
+            self.daily_stats_repository.rebuild()
+            rows, lesson_rows = self._read_rollup(end_date, with_lessons)
+        return rows, lesson_rows
 
-            if 'teens' in filters:
-                period_data['teens'] = sum(1 for s in active_students if is_teen(s))
+    def _rollup_totals(self, periods: List) -> List[Dict]:
+        """Get the rollup totals of the students overlapping each (start, end) period with one query."""
+        rows, _ = self._rollup_rows(max(end for _, end in periods))
+        return overlap_totals(rows, periods)
 
-            if 'kids' in filters:
-                period_data['kids'] = sum(1 for s in active_students if is_kid(s))
+    def _rollup_statistics(self, start_date: date, end_date: date, with_lesson_distribution: bool = False) -> Dict:
+        rows, lesson_rows = self._rollup_rows(end_date, with_lessons=with_lesson_distribution)
+        totals = overlap_totals(rows, [(start_date, end_date)])[0]
+        return statistics_from_totals(totals, lesson_distribution(lesson_rows, start_date))
 
-            # Lesson counts
-            if 'surf_lessons' in filters:
-                period_data['surf_lessons'] = sum(s.number_of_surf_lessons for s in active_students)
+    def _rollup_year_overview(self, years: List[int]) -> Dict[int, List[Dict]]:
+        rows, _ = self._rollup_rows(date(max(years), 12, 31))
+        return year_overview_from_rollup(rows, years)
 
-            # Skill level breakdown (for students with surf lessons)
-            with_lessons = filter_students_with_lessons(active_students)
 
-            if 'beginner' in filters:
-                period_data['beginner'] = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "BEGINNER"))
+class AsyncAnalyticsService:
+    """
+    AnalyticsService for an AsyncSession.
 
-            if 'beginner_plus' in filters:
-                period_data['beginner_plus'] = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "BEGINNER PLUS"))
+    Every call runs the AnalyticsService method on the session's sync session
+    through AsyncSession.run_sync, so the async endpoints share the implementation
+    (and cache) of the sync service and only the session differs.
+    """
 
-            if 'intermediate' in filters:
-                period_data['intermediate'] = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "INTERMEDIATE"))
+    def __init__(self, session: AsyncSession, service_factory: Callable[[Session], AnalyticsService]):
+        """
+        Initialize the async analytics service.
 
-            if 'advanced' in filters:
-                period_data['advanced'] = sum(1 for s in with_lessons if is_adult(s) and is_level(s, "ADVANCED"))
+        Args:
+            session: Async session to run the calls on
+            service_factory: Creates the AnalyticsService, with its repositories, for the sync session
+        """
+        self.session = session
+        self.service_factory = service_factory
 
-            if 'teen_students' in filters:
-                period_data['teen_students'] = sum(1 for s in with_lessons if is_teen(s))
+    async def _run(self, method_name: str, *args):
+        return await self.session.run_sync(
+            lambda session: getattr(self.service_factory(session), method_name)(*args))
 
-            if 'kid_students' in filters:
-                period_data['kid_students'] = sum(1 for s in with_lessons if is_kid(s))
+    async def get_age_group_statistics(self, start_date: date, end_date: date) -> Dict:
+        """Async version of AnalyticsService.get_age_group_statistics"""
+        return await self._run("get_age_group_statistics", start_date, end_date)
 
-            results.append(period_data)
+    async def get_surf_lesson_statistics(self, start_date: date, end_date: date) -> Dict:
+        """Async version of AnalyticsService.get_surf_lesson_statistics"""
+        return await self._run("get_surf_lesson_statistics", start_date, end_date)
 
-        return results
+    async def get_level_distribution(self, start_date: date, end_date: date) -> Dict:
+        """Async version of AnalyticsService.get_level_distribution"""
+        return await self._run("get_level_distribution", start_date, end_date)
 
-    def _get_students_for_period(self, start_date: date, end_date: date) -> List:
-        """
-        Get students whose stay overlaps with the specified period.
+    async def get_monthly_overview(self, year: int) -> List[Dict]:
+        """Async version of AnalyticsService.get_monthly_overview"""
+        return await self._run("get_monthly_overview", year)
 
-        Args:
-            start_date: Start date of the period
-            end_date: End date of the period
+    async def get_year_over_year(self, years: List[int]) -> List[Dict]:
+        """Async version of AnalyticsService.get_year_over_year"""
+        return await self._run("get_year_over_year", years)
 
-        Returns:
-            List of students
-        """
-        all_students = self.student_repository.get_all()
-        return [
-            student for student in all_students
-            if student.arrival <= end_date and student.departure >= start_date
-        ]
+    async def get_comprehensive_statistics(self, start_date: date, end_date: date) -> Dict:
+        """Async version of AnalyticsService.get_comprehensive_statistics"""
+        return await self._run("get_comprehensive_statistics", start_date, end_date)
+
+    async def get_lessons_per_day_forecast(self, start_date: date, end_date: date) -> List[Dict]:
+        """Async version of AnalyticsService.get_lessons_per_day_forecast"""
+        return await self._run("get_lessons_per_day_forecast", start_date, end_date)
+
+    async def get_flexible_analytics(
+        self,
+        start_date: date,
+        end_date: date,
+        period: TimePeriod = TimePeriod.WEEKLY,
+        filters: Optional[Set[str]] = None
+    ) -> List[Dict]:
+        """Async version of AnalyticsService.get_flexible_analytics"""
+        return await self._run("get_flexible_analytics", start_date, end_date, period, filters)
@@ -0,0 +1,120 @@
+"""In-process cache of the crew reference data (crew members, positions, accommodations)."""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.core.data_version import CREW_REFERENCE_VERSION, bump_data_version, get_data_version
+from app.domain.models import Accommodation, CrewAssignment, CrewMember, Position, Team
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CrewReferenceData:
+    """Crew members, positions and accommodations by ID, loaded at one reference version."""
+    crew_members: Dict[int, CrewMember]
+    positions: Dict[int, Position]
+    accommodations: Dict[int, Accommodation]
+    version: int
+
+    def position_ids_for_team(self, team: Team) -> Set[int]:
+        """Get the IDs of the positions of a team."""
+        return {position.id for position in self.positions.values() if position.team == team}
+
+    def attach(self, assignments: Iterable[CrewAssignment]) -> List[CrewAssignment]:
+        """
+        Set crew member and position of assignments loaded without their relationships.
+
+        Args:
+            assignments: Crew assignments with crew_member_id and position_id set
+
+        Returns:
+            The same assignments as a list
+        """
+        assignments = list(assignments)
+        for assignment in assignments:
+            assignment.crew_member = self.crew_members.get(assignment.crew_member_id)
+            assignment.position = self.positions.get(assignment.position_id)
+        return assignments
+
+
+def _by_id(items) -> Dict:
+    return {item.id: item for item in items}
+
+
+class CrewReferenceCache:
+    """
+    Versioned cache of the crew reference tables.
+
+    The tables are small and change rarely, so they are loaded completely with
+    one query each and kept until CrewService invalidates them after a write.
+    Invalidation bumps the crew reference version shared by all workers rather
+    than the crew data version, which every crew or accommodation assignment moves.
+    Cached objects are shared between requests and must not be modified.
+    """
+
+    def __init__(self):
+        self._data: Optional[CrewReferenceData] = None
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    @property
+    def version(self) -> int:
+        """Current crew reference version."""
+        return get_data_version(CREW_REFERENCE_VERSION)
+
+    def current(self) -> Optional[CrewReferenceData]:
+        """Get the cached data, None if it has to be (re)loaded."""
+        data = self._data
+        if data is None or data.version != self.version:
+            return None
+        return data
+
+    def _store(self, crew_members, positions, accommodations, version: int) -> CrewReferenceData:
+        data = CrewReferenceData(_by_id(crew_members), _by_id(positions), _by_id(accommodations), version)
+        with self._lock:
+            # An invalidation during the load wins, the data is still returned to this caller
+            if version == self.version:
+                self._data = data
+            self.loads += 1
+        logger.debug(f"Loaded crew reference data: {len(data.crew_members)} crew members, "
+                     f"{len(data.positions)} positions, {len(data.accommodations)} accommodations")
+        return data
+
+    def get(self, crew_member_repo, position_repo, accommodation_repo) -> CrewReferenceData:
+        """
+        Get the reference data, loading it through the repositories when needed.
+
+        Args:
+            crew_member_repo: Crew member repository
+            position_repo: Position repository
+            accommodation_repo: Accommodation repository
+
+        Returns:
+            The current CrewReferenceData
+        """
+        data = self.current()
+        if data is not None:
+            return data
+        version = self.version
+        return self._store(crew_member_repo.get_all(), position_repo.get_all(), accommodation_repo.get_all(),
+                           version)
+
+    async def get_async(self, crew_member_repo, position_repo, accommodation_repo) -> CrewReferenceData:
+        """Async version of get for AsyncSession based repositories."""
+        data = self.current()
+        if data is not None:
+            return data
+        version = self.version
+        return self._store(await crew_member_repo.get_all(), await position_repo.get_all(),
+                           await accommodation_repo.get_all(), version)
+
+    def invalidate(self):
+        """Drop the cached data after a crew member, position or accommodation write."""
+        bump_data_version(CREW_REFERENCE_VERSION)
+        with self._lock:
+            self._data = None
+
+
+crew_reference_cache = CrewReferenceCache()
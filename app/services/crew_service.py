@@ -1,5 +1,6 @@
 from datetime import date
 from typing import List, Optional, Dict, Any
+from app.data.pagination import DEFAULT_PAGE_SIZE
 from app.domain.models import CrewMember, Position, CrewAssignment, Accommodation, AccommodationAssignment, Team
 from app.data.sql_alchemey_repository_impl import (
     SQLAlchemyCrewMemberRepositoryImpl,
@@ -8,6 +9,64 @@ from app.data.sql_alchemey_repository_impl import (
     SQLAlchemyAccommodationRepositoryImpl,
     SQLAlchemyAccommodationAssignmentRepositoryImpl
 )
+from app.services.crew_reference_cache import CrewReferenceCache, CrewReferenceData
+
+
+def build_crew_calendar(
+    assignments: List[CrewAssignment],
+    start_date: date,
+    end_date: date,
+    team: Optional[Team] = None,
+    position_ids: Optional[set] = None
+) -> Dict[str, Any]:
+    """
+    Group crew assignments by date into the calendar structure of CrewService.get_crew_calendar.
+
+    Args:
+        assignments: Assignments within the date range
+        start_date: Start date of the range
+        end_date: End date of the range (inclusive)
+        team: Team the calendar is filtered by, if any
+        position_ids: Only include assignments for these positions (None for all)
+
+    Returns:
+        Calendar dictionary (see CrewService.get_crew_calendar)
+    """
+    if position_ids is not None:
+        assignments = [a for a in assignments if a.position_id in position_ids]
+
+    calendar = {}
+    current_date = start_date
+    while current_date <= end_date:
+        calendar[current_date.isoformat()] = []
+        current_date = date.fromordinal(current_date.toordinal() + 1)
+
+    for a in assignments:
+        daily_assignments = calendar.get(a.assignment_date.isoformat())
+        if daily_assignments is None:
+            continue
+        daily_assignments.append({
+            "id": a.id,
+            "crew_member": {
+                "id": a.crew_member.id,
+                "first_name": a.crew_member.first_name,
+                "last_name": a.crew_member.last_name,
+                "team": a.crew_member.team.value
+            } if a.crew_member else None,
+            "position": {
+                "id": a.position.id,
+                "name": a.position.name,
+                "team": a.position.team.value
+            } if a.position else None,
+            "assignment_date": a.assignment_date.isoformat()
+        })
+
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "team": team.value if team else None,
+        "calendar": calendar
+    }
 
 
 class CrewService:
@@ -28,7 +87,8 @@ class CrewService:
         position_repo: SQLAlchemyPositionRepositoryImpl,
         crew_assignment_repo: SQLAlchemyCrewAssignmentRepositoryImpl,
         accommodation_repo: SQLAlchemyAccommodationRepositoryImpl,
-        accommodation_assignment_repo: SQLAlchemyAccommodationAssignmentRepositoryImpl
+        accommodation_assignment_repo: SQLAlchemyAccommodationAssignmentRepositoryImpl,
+        reference_cache: Optional[CrewReferenceCache] = None
     ):
         """
         Initialize the CrewService with repository dependencies.
@@ -39,12 +99,25 @@ class CrewService:
             crew_assignment_repo: Repository for crew assignment operations
             accommodation_repo: Repository for accommodation operations
             accommodation_assignment_repo: Repository for accommodation assignment operations
+            reference_cache: Cache of crew members, positions and accommodations used for
+                lookups and validation (None to query the repositories every time)
         """
         self.crew_member_repo = crew_member_repo
         self.position_repo = position_repo
         self.crew_assignment_repo = crew_assignment_repo
         self.accommodation_repo = accommodation_repo
         self.accommodation_assignment_repo = accommodation_assignment_repo
+        self.reference_cache = reference_cache
+
+    def _references(self) -> Optional[CrewReferenceData]:
+        """Get the cached reference data, None without a reference cache."""
+        if self.reference_cache is None:
+            return None
+        return self.reference_cache.get(self.crew_member_repo, self.position_repo, self.accommodation_repo)
+
+    def _invalidate_references(self):
+        if self.reference_cache is not None:
+            self.reference_cache.invalidate()
 
     def get_crew_members(self, team: Optional[Team] = None) -> List[CrewMember]:
         """
@@ -56,10 +129,29 @@ class CrewService:
         Returns:
             List of CrewMember objects
         """
+        references = self._references()
+        if references is not None:
+            return [cm for cm in references.crew_members.values() if not team or cm.team == team]
         if team:
             return self.crew_member_repo.get_by_team(team)
         return self.crew_member_repo.get_all()
 
+    def get_crew_members_page(self, fields: Optional[str] = None, cursor: Optional[str] = None,
+                              limit: int = DEFAULT_PAGE_SIZE, team: Optional[Team] = None):
+        """
+        Get a page of crew members, optionally filtered by team.
+        
+        Args:
+            fields: Comma separated columns to return, None for all
+            cursor: Cursor of the previous page, None for the first page
+            limit: Maximum number of crew members
+            team: Optional Team enum to filter by
+            
+        Returns:
+            Tuple of (crew member dictionaries, next cursor or None)
+        """
+        return self.crew_member_repo.get_page(fields, cursor, limit, team)
+
     def create_crew_member(self, crew_member: CrewMember) -> CrewMember:
         """
         Create a new crew member.
@@ -70,7 +162,9 @@ class CrewService:
         Returns:
             The created CrewMember with assigned ID
         """
-        return self.crew_member_repo.save(crew_member)
+        saved = self.crew_member_repo.save(crew_member)
+        self._invalidate_references()
+        return saved
 
     def get_crew_member_by_id(self, crew_member_id: int) -> Optional[CrewMember]:
         """
@@ -82,6 +176,9 @@ class CrewService:
         Returns:
             CrewMember object or None if not found
         """
+        references = self._references()
+        if references is not None:
+            return references.crew_members.get(crew_member_id)
         return self.crew_member_repo.get_by_id(crew_member_id)
 
     def update_crew_member(self, crew_member_id: int, update_data: Dict[str, Any]) -> Optional[CrewMember]:
@@ -107,7 +204,9 @@ class CrewService:
             if field in allowed_fields and value is not None:
                 setattr(crew_member, field, value)
         
-        return self.crew_member_repo.save(crew_member)
+        saved = self.crew_member_repo.save(crew_member)
+        self._invalidate_references()
+        return saved
 
     def delete_crew_member(self, crew_member_id: int) -> bool:
         """
@@ -119,7 +218,9 @@ class CrewService:
         Returns:
             True if deleted, False if not found
         """
-        return self.crew_member_repo.delete(crew_member_id)
+        deleted = self.crew_member_repo.delete(crew_member_id)
+        self._invalidate_references()
+        return deleted
 
     def get_positions(self, team: Optional[Team] = None) -> List[Position]:
         """
@@ -131,10 +232,29 @@ class CrewService:
         Returns:
             List of Position objects
         """
+        references = self._references()
+        if references is not None:
+            return [pos for pos in references.positions.values() if not team or pos.team == team]
         if team:
             return self.position_repo.get_by_team(team)
         return self.position_repo.get_all()
 
+    def get_positions_page(self, fields: Optional[str] = None, cursor: Optional[str] = None,
+                           limit: int = DEFAULT_PAGE_SIZE, team: Optional[Team] = None):
+        """
+        Get a page of positions, optionally filtered by team.
+        
+        Args:
+            fields: Comma separated columns to return, None for all
+            cursor: Cursor of the previous page, None for the first page
+            limit: Maximum number of positions
+            team: Optional Team enum to filter by
+            
+        Returns:
+            Tuple of (position dictionaries, next cursor or None)
+        """
+        return self.position_repo.get_page(fields, cursor, limit, team)
+
     def create_position(self, position: Position) -> Position:
         """
         Create a new position.
@@ -145,7 +265,9 @@ class CrewService:
         Returns:
             The created Position with assigned ID
         """
-        return self.position_repo.save(position)
+        saved = self.position_repo.save(position)
+        self._invalidate_references()
+        return saved
 
     def get_position_by_id(self, position_id: int) -> Optional[Position]:
         """
@@ -157,6 +279,9 @@ class CrewService:
         Returns:
             Position object or None if not found
         """
+        references = self._references()
+        if references is not None:
+            return references.positions.get(position_id)
         return self.position_repo.get_by_id(position_id)
 
     def update_position(self, position_id: int, update_data: Dict[str, Any]) -> Optional[Position]:
@@ -182,7 +307,9 @@ class CrewService:
             if field in allowed_fields and value is not None:
                 setattr(position, field, value)
         
-        return self.position_repo.save(position)
+        saved = self.position_repo.save(position)
+        self._invalidate_references()
+        return saved
 
     def delete_position(self, position_id: int) -> bool:
         """
@@ -194,7 +321,9 @@ class CrewService:
         Returns:
             True if deleted, False if not found
         """
-        return self.position_repo.delete(position_id)
+        deleted = self.position_repo.delete(position_id)
+        self._invalidate_references()
+        return deleted
 
     def assign_crew(self, crew_member_id: int, position_id: int, assignment_date: date) -> CrewAssignment:
         """
@@ -214,12 +343,12 @@ class CrewService:
             ValueError: If crew member or position not found
         """
         # Verify crew member exists
-        crew_member = self.crew_member_repo.get_by_id(crew_member_id)
+        crew_member = self.get_crew_member_by_id(crew_member_id)
         if not crew_member:
             raise ValueError(f"Crew member with id {crew_member_id} not found")
         
         # Verify position exists
-        position = self.position_repo.get_by_id(position_id)
+        position = self.get_position_by_id(position_id)
         if not position:
             raise ValueError(f"Position with id {position_id} not found")
         
@@ -302,49 +431,23 @@ class CrewService:
                 }
             }
         """
+        references = self._references()
+        if references is not None:
+            # Crew members and positions come from the reference data instead of a lookup per assignment
+            assignments = references.attach(
+                self.crew_assignment_repo.get_by_date_range(start_date, end_date, with_related=False))
+            position_ids = references.position_ids_for_team(team) if team else None
+            return build_crew_calendar(assignments, start_date, end_date, team, position_ids)
+
         # Get all assignments in the date range
         assignments = self.crew_assignment_repo.get_by_date_range(start_date, end_date)
         
         # Filter by team if specified
+        position_ids = None
         if team:
-            positions = self.position_repo.get_by_team(team)
-            position_ids = {pos.id for pos in positions}
-            assignments = [a for a in assignments if a.position_id in position_ids]
-        
-        # Group assignments by date
-        calendar = {}
-        current_date = start_date
-        while current_date <= end_date:
-            daily_assignments = [
-                a for a in assignments 
-                if a.assignment_date == current_date
-            ]
-            calendar[current_date.isoformat()] = [
-                {
-                    "id": a.id,
-                    "crew_member": {
-                        "id": a.crew_member.id,
-                        "first_name": a.crew_member.first_name,
-                        "last_name": a.crew_member.last_name,
-                        "team": a.crew_member.team.value
-                    } if a.crew_member else None,
-                    "position": {
-                        "id": a.position.id,
-                        "name": a.position.name,
-                        "team": a.position.team.value
-                    } if a.position else None,
-                    "assignment_date": a.assignment_date.isoformat()
-                }
-                for a in daily_assignments
-            ]
-            current_date = date.fromordinal(current_date.toordinal() + 1)
+            position_ids = {pos.id for pos in self.position_repo.get_by_team(team)}
         
-        return {
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "team": team.value if team else None,
-            "calendar": calendar
-        }
+        return build_crew_calendar(assignments, start_date, end_date, team, position_ids)
 
     def get_accommodations(self) -> List[Accommodation]:
         """
@@ -353,8 +456,26 @@ class CrewService:
         Returns:
             List of all Accommodation objects
         """
+        references = self._references()
+        if references is not None:
+            return list(references.accommodations.values())
         return self.accommodation_repo.get_all()
 
+    def get_accommodations_page(self, fields: Optional[str] = None, cursor: Optional[str] = None,
+                                limit: int = DEFAULT_PAGE_SIZE):
+        """
+        Get a page of accommodations.
+        
+        Args:
+            fields: Comma separated columns to return, None for all
+            cursor: Cursor of the previous page, None for the first page
+            limit: Maximum number of accommodations
+            
+        Returns:
+            Tuple of (accommodation dictionaries, next cursor or None)
+        """
+        return self.accommodation_repo.get_page(fields, cursor, limit)
+
     def create_accommodation(self, accommodation: Accommodation) -> Accommodation:
         """
         Create a new accommodation.
@@ -365,7 +486,9 @@ class CrewService:
         Returns:
             The created Accommodation with assigned ID
         """
-        return self.accommodation_repo.save(accommodation)
+        saved = self.accommodation_repo.save(accommodation)
+        self._invalidate_references()
+        return saved
 
     def get_accommodation_by_id(self, accommodation_id: int) -> Optional[Accommodation]:
         """
@@ -377,6 +500,9 @@ class CrewService:
         Returns:
             Accommodation object or None if not found
         """
+        references = self._references()
+        if references is not None:
+            return references.accommodations.get(accommodation_id)
         return self.accommodation_repo.get_by_id(accommodation_id)
 
     def update_accommodation(self, accommodation_id: int, update_data: Dict[str, Any]) -> Optional[Accommodation]:
@@ -402,7 +528,9 @@ class CrewService:
             if field in allowed_fields and value is not None:
                 setattr(accommodation, field, value)
         
-        return self.accommodation_repo.save(accommodation)
+        saved = self.accommodation_repo.save(accommodation)
+        self._invalidate_references()
+        return saved
 
     def delete_accommodation(self, accommodation_id: int) -> bool:
         """
@@ -414,7 +542,9 @@ class CrewService:
         Returns:
             True if deleted, False if not found
         """
-        return self.accommodation_repo.delete(accommodation_id)
+        deleted = self.accommodation_repo.delete(accommodation_id)
+        self._invalidate_references()
+        return deleted
 
     def assign_accommodation(
         self, 
@@ -444,12 +574,12 @@ class CrewService:
                        or crew member already assigned to different accommodation during this period
         """
         # Verify crew member exists
-        crew_member = self.crew_member_repo.get_by_id(crew_member_id)
+        crew_member = self.get_crew_member_by_id(crew_member_id)
         if not crew_member:
             raise ValueError(f"Crew member with id {crew_member_id} not found")
         
         # Verify accommodation exists
-        accommodation = self.accommodation_repo.get_by_id(accommodation_id)
+        accommodation = self.get_accommodation_by_id(accommodation_id)
         if not accommodation:
             raise ValueError(f"Accommodation with id {accommodation_id} not found")
         
@@ -527,3 +657,38 @@ class CrewService:
             True if deleted, False if not found
         """
         return self.accommodation_assignment_repo.delete(assignment_id)
+
+
+class AsyncCrewService:
+    """Async variant of the CrewService read operations for AsyncSession based repositories."""
+
+    def __init__(self, crew_assignment_repo, position_repo, crew_member_repo=None, accommodation_repo=None,
+                 reference_cache: Optional[CrewReferenceCache] = None):
+        self.crew_assignment_repo = crew_assignment_repo
+        self.position_repo = position_repo
+        self.crew_member_repo = crew_member_repo
+        self.accommodation_repo = accommodation_repo
+        self.reference_cache = reference_cache
+
+    async def get_crew_calendar(
+        self,
+        start_date: date,
+        end_date: date,
+        team: Optional[Team] = None
+    ) -> Dict[str, Any]:
+        """Async version of CrewService.get_crew_calendar"""
+        if self.reference_cache is not None:
+            references = await self.reference_cache.get_async(self.crew_member_repo, self.position_repo,
+                                                              self.accommodation_repo)
+            assignments = references.attach(
+                await self.crew_assignment_repo.get_by_date_range(start_date, end_date, with_related=False))
+            position_ids = references.position_ids_for_team(team) if team else None
+            return build_crew_calendar(assignments, start_date, end_date, team, position_ids)
+
+        assignments = await self.crew_assignment_repo.get_by_date_range(start_date, end_date)
+
+        position_ids = None
+        if team:
+            position_ids = {pos.id for pos in await self.position_repo.get_by_team(team)}
+
+        return build_crew_calendar(assignments, start_date, end_date, team, position_ids)
@@ -0,0 +1,156 @@
+"""Disk-backed, content-addressed cache for generated export files."""
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from app.core.config import EXPORT_CACHE_DIR, EXPORT_CACHE_MAX_BYTES
+from app.core.data_version import get_data_version
+
+logger = logging.getLogger(__name__)
+
+_ARTIFACT_SUFFIX = ".export"
+
+
+class ExportCache:
+    """
+    Cache for export artifacts (Excel, HTML) keyed by export type, parameters and data version.
+
+    Artifacts are stored as files in a local directory. Reading an artifact touches its
+    modification time, so eviction can drop the least recently used files once the
+    total size exceeds the configured limit.
+    """
+
+    def __init__(self, cache_dir: str = EXPORT_CACHE_DIR, max_bytes: int = EXPORT_CACHE_MAX_BYTES):
+        """
+        Initialize the export cache.
+
+        Args:
+            cache_dir: Directory where artifacts are stored
+            max_bytes: Maximum total size of all cached artifacts
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, export_type: str, params: Dict[str, Any], data_version: Optional[int] = None) -> str:
+        """
+        Build the cache key for an export.
+
+        Args:
+            export_type: Name of the export (e.g. "week_overview_xlsx")
+            params: Parameters the export was generated with
+            data_version: Data version to key on, defaults to the current one
+
+        Returns:
+            Hex digest identifying the artifact, also used as ETag
+        """
+        if data_version is None:
+            data_version = get_data_version()
+        payload = json.dumps(
+            {"type": export_type, "params": params, "data_version": data_version},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a cached artifact.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The artifact content or None if not cached
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return content
+
+    def put(self, key: str, content: bytes) -> None:
+        """
+        Store an artifact and evict least recently used ones if the cache is too large.
+
+        Args:
+            key: Cache key
+            content: Artifact content
+        """
+        if len(content) > self.max_bytes:
+            logger.info(f"Export artifact {key} ({len(content)} bytes) exceeds cache size, not caching")
+            return
+
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all cached artifacts."""
+        for path, _, _ in self._artifacts():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _ARTIFACT_SUFFIX)
+
+    def _artifacts(self):
+        artifacts = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(_ARTIFACT_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                artifacts.append((entry.path, stat.st_size, stat.st_mtime))
+        return artifacts
+
+    def _evict(self) -> None:
+        artifacts = self._artifacts()
+        total_size = sum(size for _, size, _ in artifacts)
+        if total_size <= self.max_bytes:
+            return
+
+        # Oldest modification time first = least recently used
+        for path, size, _ in sorted(artifacts, key=lambda artifact: artifact[2]):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total_size -= size
+            logger.debug(f"Evicted export artifact {path}")
+            if total_size <= self.max_bytes:
+                break
+
+
+def etag_matches(if_none_match: Optional[str], key: str) -> bool:
+    """
+    Check an If-None-Match header value against an artifact key.
+
+    Args:
+        if_none_match: Raw If-None-Match header value (may contain several ETags)
+        key: Artifact key
+
+    Returns:
+        True if the client already has this artifact
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")]
+    return "*" in tags or key in tags
@@ -0,0 +1,151 @@
+"""Lightweight streaming HTML renderer for printable exports."""
+from datetime import date, datetime
+from html import escape
+from string import Template
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from app.domain.models import Student, SurfPlan
+
+# Templates are compiled once at import time and only substituted per row
+_PAGE_START = Template(
+    "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>$title</title>"
+    "<style>table{border-collapse:collapse;margin-bottom:1em}"
+    "th,td{border:1px solid #999;padding:2px 6px;text-align:left}</style>"
+    "</head><body><h1>$title</h1>\n"
+)
+_PAGE_END = "</body></html>\n"
+_SECTION = Template("<h2>$heading</h2>\n")
+_TABLE_START = "<table>"
+_TABLE_END = "</table>\n"
+_EMPTY = "<p>-</p>\n"
+
+STUDENT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("first name", "first_name"),
+    ("last name", "last_name"),
+    ("age group", "age_group"),
+    ("birthday", "birthday"),
+    ("gender", "gender"),
+    ("booking number", "booking_number"),
+    ("arrival", "arrival"),
+    ("departure", "departure"),
+    ("number of surflessons booked", "number_of_surf_lessons"),
+    ("level", "level"),
+)
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return escape(str(value))
+
+
+def _header_row(labels: Sequence[str]) -> str:
+    return "<thead><tr>" + "".join(f"<th>{escape(label)}</th>" for label in labels) + "</tr></thead>"
+
+
+def _row(values: Iterable[Any]) -> str:
+    return "<tr>" + "".join(f"<td>{_cell(value)}</td>" for value in values) + "</tr>\n"
+
+
+def render_table(labels: Sequence[str], rows: Iterable[Iterable[Any]]) -> Iterator[str]:
+    """
+    Render a table row by row.
+
+    Args:
+        labels: Column headers
+        rows: Iterable of row values, consumed lazily
+
+    Yields:
+        HTML fragments
+    """
+    yield _TABLE_START + _header_row(labels) + "<tbody>\n"
+    for values in rows:
+        yield _row(values)
+    yield "</tbody>" + _TABLE_END
+
+
+def _student_rows(students: Iterable[Student]) -> Iterator[List[Any]]:
+    attributes = [attribute for _, attribute in STUDENT_COLUMNS]
+    for student in students:
+        yield [getattr(student, attribute) for attribute in attributes]
+
+
+def render_student_groups(groups: Dict[str, List[Student]], title: str = "Students Export") -> Iterator[str]:
+    """
+    Render students grouped by surf group as one table per group.
+
+    Args:
+        groups: Mapping of group name to students
+        title: Page title
+
+    Yields:
+        HTML fragments
+    """
+    yield _PAGE_START.substitute(title=escape(title))
+    labels = [label for label, _ in STUDENT_COLUMNS]
+    for group_name, group_students in groups.items():
+        yield _SECTION.substitute(heading=escape(group_name))
+        yield from render_table(labels, _student_rows(group_students))
+    yield _PAGE_END
+
+
+def render_surf_plan(surf_plan: SurfPlan) -> Iterator[str]:
+    """
+    Render a surf plan with one section per slot and one table per group.
+
+    Args:
+        surf_plan: The surf plan to render
+
+    Yields:
+        HTML fragments
+    """
+    yield _PAGE_START.substitute(title=f"Surf Plan {_cell(surf_plan.plan_date)}")
+    labels = [label for label, _ in STUDENT_COLUMNS]
+    for index, slot in enumerate(surf_plan.slots):
+        slot_time = slot.slot_time.strftime("%H:%M") if slot.slot_time else ""
+        yield _SECTION.substitute(heading=f"Slot {chr(ord('A') + index)} {slot_time}")
+        for group in slot.groups:
+            yield f"<h3>{escape(group.level or '')} ({len(group.students)})</h3>\n"
+            if group.students:
+                yield from render_table(labels, _student_rows(group.students))
+            else:
+                yield _EMPTY
+
+    yield _SECTION.substitute(heading="Not participating")
+    yield from render_table(labels, _student_rows(surf_plan.non_participating_guests))
+    yield _PAGE_END
+
+
+def render_crew_calendar(calendar: Dict[str, Any]) -> Iterator[str]:
+    """
+    Render a crew calendar as returned by CrewService.get_crew_calendar.
+
+    Args:
+        calendar: Calendar dictionary with a "calendar" mapping of ISO date to assignments
+
+    Yields:
+        HTML fragments
+    """
+    title = f"Crew Calendar {calendar['start_date']} - {calendar['end_date']}"
+    if calendar.get("team"):
+        title += f" ({calendar['team']})"
+    yield _PAGE_START.substitute(title=escape(title))
+
+    labels = ["first name", "last name", "team", "position"]
+    for day, assignments in calendar["calendar"].items():
+        yield _SECTION.substitute(heading=escape(day))
+        if not assignments:
+            yield _EMPTY
+            continue
+        yield from render_table(labels, (
+            [
+                a["crew_member"]["first_name"] if a["crew_member"] else None,
+                a["crew_member"]["last_name"] if a["crew_member"] else None,
+                a["crew_member"]["team"] if a["crew_member"] else None,
+                a["position"]["name"] if a["position"] else None,
+            ]
+            for a in assignments
+        ))
+    yield _PAGE_END
@@ -1,8 +1,12 @@
+from datetime import date, datetime, time
+
 import pandas as pd
-import pymysql
 import numpy as np
-from urllib.parse import urlparse
-from app.core.config import DATABASE_URL
+from sqlalchemy import Column, MetaData, Table, Text
+from sqlalchemy.engine import Engine
+from app.core.db import engine
+
+
 def clean_dataframe(df):
     df.columns = [col.strip().replace('%', 'percent')
                   .replace(' ', '_')
@@ -21,80 +25,156 @@ def clean_dataframe(df):
             pass
         return val
 
-    return df.applymap(clean_value)
+    # DataFrame.applymap was renamed to map in pandas 2.1 and removed in 3.0
+    return df.map(clean_value) if hasattr(df, "map") else df.applymap(clean_value)
+
+def bookings_table(df, table_name):
+    """Table with one nullable TEXT column per DataFrame column"""
+    # MySQL keeps the InnoDB dynamic row format for the wide bookings rows, other dialects ignore these options
+    return Table(table_name, MetaData(), *[Column(col, Text, nullable=True) for col in df.columns],
+                 mysql_engine="InnoDB", mysql_row_format="DYNAMIC")
+
 
 def create_table_from_df(df, table_name, connection):
-    columns_sql = [f"`{col}` TEXT NULL" for col in df.columns]
-    columns_block = ",\n  ".join(columns_sql)
-    create_stmt = f"CREATE TABLE `{table_name}` (\n  {columns_block}\n) ENGINE=InnoDB ROW_FORMAT=DYNAMIC;"
-
-    with connection.cursor() as cursor:
-        print(f"🧨 Dropping existing table `{table_name}` (if any)...")
-        cursor.execute(f"DROP TABLE IF EXISTS `{table_name}`")
-        print(f"🛠️ Creating new table `{table_name}`...")
-        cursor.execute(create_stmt)
-        connection.commit()
-        print("✅ Table created.")
-
-def insert_dataframe_raw(df, table_name, connection):
+    table = bookings_table(df, table_name)
+    print(f"🧨 Dropping existing table `{table_name}` (if any)...")
+    table.drop(connection, checkfirst=True)
+    print(f"🛠️ Creating new table `{table_name}`...")
+    table.create(connection)
+    print("✅ Table created.")
+    return table
+
+
+def insert_dataframe_raw(df, table, connection):
     if df.empty:
         print("🚫 DataFrame is empty. Nothing to insert.")
         return
 
-    with connection.cursor() as cursor:
-        columns = ', '.join(f"`{col}`" for col in df.columns)
-        placeholders = ', '.join(['%s'] * len(df.columns))
-        sql = f"INSERT INTO `{table_name}` ({columns}) VALUES ({placeholders})"
+    def to_safe_value(x):
+        return None if isinstance(x, float) and np.isnan(x) else x
 
-        def to_safe_tuple(row):
-            return tuple(None if isinstance(x, float) and np.isnan(x) else x for x in row)
+    columns = list(df.columns)
+    values = [dict(zip(columns, map(to_safe_value, row))) for row in df.values.tolist()]
 
-        values = [to_safe_tuple(row) for row in df.values.tolist()]
+    print(f"📥 Inserting {len(values)} records into `{table.name}`...")
+    # executemany, batched into multi-row INSERTs by the dialect
+    connection.execute(table.insert(), values)
+    print("✅ Insert complete.")
 
-        print(f"📥 Inserting {len(values)} records into `{table_name}`...")
-        cursor.executemany(sql, values)
-        connection.commit()
-        print("✅ Insert complete.")
 
-def parse_mysql_url(mysql_url):
-    parsed = urlparse(mysql_url.replace("mysql+pymysql://", "mysql://"))
-    return {
-        "host": parsed.hostname,
-        "port": parsed.port or 3306,
-        "user": parsed.username,
-        "password": parsed.password,
-        "db": parsed.path.lstrip("/")
-    }
+# Rows per chunk read from the file, cleaned and inserted; files are never loaded as a whole
+CHUNK_ROWS = 5000
 
-def csv_insert(csv_path: str):
-    table_name = "bookings"
 
-    print(f"📂 Loading CSV from '{csv_path}'...")
-    df = pd.read_csv(csv_path)
+def read_csv_chunks(csv_path: str, chunk_rows: int = CHUNK_ROWS):
+    """
+    Read a CSV as DataFrames of chunk_rows rows, cells as text, empty cells as NaN.
 
-    print("🧼 Cleaning data...")
-    df = clean_dataframe(df)
+    Cells are kept as written rather than typed per chunk, so a chunk cannot infer
+    another type than the previous ones. Integer columns with empty cells are
+    therefore staged as e.g. "3", not as the "3.0" of a float column.
+    """
+    yield from pd.read_csv(csv_path, dtype=str, chunksize=chunk_rows)
 
-    print("🧻 Remove empty columns...")
-    print_empty_columns(df)
 
+def _xlsx_cell_text(value):
+    """Cell value as the text the booking system writes to its CSV export"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time() else value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
 
-    print("🐷 Column names:")
-    print(df.columns.values)
 
-    print(f"🔌 Connecting to MySQL...")
-    conn_params = parse_mysql_url(DATABASE_URL)
-    connection = pymysql.connect(
-        charset="utf8mb4",
-        cursorclass=pymysql.cursors.DictCursor,
-        **conn_params
-    )
+def read_xlsx_chunks(xlsx_path: str, chunk_rows: int = CHUNK_ROWS):
+    """
+    Read the first worksheet of an XLSX workbook as DataFrames of chunk_rows rows.
 
+    The workbook is opened read-only, so rows are streamed from the file instead of
+    loading the whole sheet. Cells are converted to the text of the CSV export.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(xlsx_path, read_only=True, data_only=True)
     try:
-        create_table_from_df(df, table_name, connection)
-        insert_dataframe_raw(df, table_name, connection)
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(col) if col is not None else "" for col in next(rows, ())]
+        chunk = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            # Read-only rows end at their last non-empty cell
+            cells = [_xlsx_cell_text(value) for value in row[:len(header)]]
+            chunk.append(cells + [None] * (len(header) - len(cells)))
+            if len(chunk) == chunk_rows:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk or not header:
+            yield pd.DataFrame(chunk, columns=header)
     finally:
-        connection.close()
+        workbook.close()
+
+
+def load_bookings(chunks, bind: Engine = None):
+    """
+    Load bookings into the bookings table chunk by chunk, replacing its contents.
+
+    Works on every database SQLAlchemy supports (MySQL, SQLite, ...); DDL and
+    parameter style come from the engine's dialect.
+
+    Args:
+        chunks: DataFrames with the rows of the export, see read_csv_chunks and read_xlsx_chunks
+        bind: Engine to load into, the application engine if not set
+    """
+    table_name = "bookings"
+    table = None
+
+    # One transaction: drop, create and insert are committed together or rolled back
+    with (bind or engine).begin() as connection:
+        for df in chunks:
+            print("🧼 Cleaning data...")
+            df = clean_dataframe(df)
+
+            if table is None:
+                print("🧻 Remove empty columns...")
+                print_empty_columns(df)
+
+                print("🐷 Column names:")
+                print(df.columns.values)
+                table = create_table_from_df(df, table_name, connection)
+            insert_dataframe_raw(df, table, connection)
+
+
+def csv_insert(csv_path: str, bind: Engine = None):
+    """
+    Load a bookings CSV export into the bookings table, replacing its contents.
+
+    Args:
+        csv_path: Path of the CSV export
+        bind: Engine to load into, the application engine if not set
+    """
+    print(f"📂 Loading CSV from '{csv_path}'...")
+    load_bookings(read_csv_chunks(csv_path), bind)
+
+
+def xlsx_insert(xlsx_path: str, bind: Engine = None):
+    """
+    Load a bookings XLSX export into the bookings table, replacing its contents.
+
+    Args:
+        xlsx_path: Path of the XLSX export
+        bind: Engine to load into, the application engine if not set
+    """
+    print(f"📂 Loading XLSX from '{xlsx_path}'...")
+    load_bookings(read_xlsx_chunks(xlsx_path), bind)
+
+
+# Supported booking export formats by file extension
+BOOKING_FILE_LOADERS = {".csv": csv_insert, ".xlsx": xlsx_insert}
 
 
 def print_empty_columns(df):
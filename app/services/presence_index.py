@@ -0,0 +1,304 @@
+"""Per-day presence index of the students.
+
+For every calendar day the index keeps a bitmap of the ids of the students
+present that day, and of those arriving and departing that day. Bitmaps are
+Python ints with bit i set for student id i, so combining days or excluding
+cancelled bookings is a single AND/OR/ANDNOT on C-level big integers:
+
+    index.present(day) & ~index.inactive          # active students on camp
+    index.present_on_all(sunday, friday)          # staying the whole week
+
+Readers query the current PresenceBitmaps without locking; build and apply
+publish a new one instead of modifying it.
+
+The index lives in process memory and is tied to the data version: other
+processes' writes make it rebuild on next use, while the CSV import applies
+the students it wrote incrementally (see StudentTransformerService).
+"""
+import logging
+import threading
+from datetime import date, timedelta
+from functools import reduce
+from operator import and_, or_
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.data_version import get_data_version
+from app.data.orm_models import StudentORM
+
+logger = logging.getLogger(__name__)
+
+# Longest stay indexed, later days of longer (mistyped) stays are not marked present
+MAX_STAY_DAYS = 366
+
+
+def bitmap_from_ids(ids) -> int:
+    """Build a bitmap with the bits of the given ids set"""
+    import numpy as np
+
+    ids = np.asarray(ids, dtype=np.int64)
+    if not len(ids):
+        return 0
+    bits = np.zeros(int(ids.max()) + 1, dtype=bool)
+    bits[ids] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+def bitmap_ids(bitmap: int) -> List[int]:
+    """Ids of the bits set in a bitmap, ascending"""
+    import numpy as np
+
+    if not bitmap:
+        return []
+    raw = np.frombuffer(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little")).tolist()
+
+
+def _days(start_date: date, end_date: date) -> Iterable[date]:
+    for offset in range((end_date - start_date).days + 1):
+        yield start_date + timedelta(days=offset)
+
+
+def _stay_days(arrival: date, departure: date) -> Iterable[date]:
+    """Indexed days of a stay, at most MAX_STAY_DAYS after the arrival"""
+    return _days(arrival, min(departure, arrival + timedelta(days=MAX_STAY_DAYS)))
+
+
+def _covered_ordinals(starts, ends) -> Iterable[int]:
+    """Ordinals covered by at least one of the start..end intervals, ascending"""
+    import numpy as np
+
+    valid = starts <= ends
+    starts, ends = starts[valid], ends[valid]
+    if not len(starts):
+        return
+    order = np.argsort(starts, kind="stable")
+    starts, reach = starts[order], np.maximum.accumulate(ends[order])
+    # An interval starting after every earlier one has ended opens a new covered run
+    opens = np.flatnonzero(np.r_[True, starts[1:] > reach[:-1] + 1])
+    closes = np.r_[opens[1:] - 1, len(starts) - 1]
+    for start, end in zip(starts[opens].tolist(), reach[closes].tolist()):
+        yield from range(start, end + 1)
+
+
+def _bitmaps_by_day(ids, ordinals) -> Dict[date, int]:
+    """Bitmaps of the ids per distinct ordinal"""
+    import numpy as np
+
+    order = np.argsort(ordinals, kind="stable")
+    days, starts = np.unique(ordinals[order], return_index=True)
+    return {date.fromordinal(int(day)): bitmap_from_ids(day_ids)
+            for day, day_ids in zip(days, np.split(ids[order], starts[1:]))}
+
+
+class PresenceBitmaps:
+    """
+    The bitmaps of the index at one data version.
+
+    Build and apply create a new instance and swap it in, an instance is never
+    modified once published, so readers need no lock and every query on one
+    instance sees the same state.
+    """
+    __slots__ = ("_present", "_arrivals", "_departures", "_cancelled", "_expired")
+
+    def __init__(self, present: Dict[date, int], arrivals: Dict[date, int], departures: Dict[date, int],
+                 cancelled: int, expired: int):
+        self._present = present
+        self._arrivals = arrivals
+        self._departures = departures
+        self._cancelled = cancelled
+        self._expired = expired
+
+    def present(self, day: date) -> int:
+        """Students staying on the day, arrival and departure day included"""
+        return self._present.get(day, 0)
+
+    def arriving(self, day: date) -> int:
+        """Students arriving on the day"""
+        return self._arrivals.get(day, 0)
+
+    def departing(self, day: date) -> int:
+        """Students departing on the day"""
+        return self._departures.get(day, 0)
+
+    def on_camp(self, day: date) -> int:
+        """Students staying the whole day: present, neither arriving nor departing"""
+        return self.present(day) & ~self.arriving(day) & ~self.departing(day)
+
+    def present_on_all(self, start_date: date, end_date: date) -> int:
+        """Students present on every day of start_date..end_date, nobody for an empty range"""
+        if start_date > end_date:
+            return 0
+        return reduce(and_, (self.present(day) for day in _days(start_date, end_date)))
+
+    def present_on_any(self, start_date: date, end_date: date) -> int:
+        """Students present on at least one day of start_date..end_date"""
+        return reduce(or_, (self.present(day) for day in _days(start_date, end_date)), 0)
+
+    @property
+    def days(self) -> int:
+        """Number of days with a present bitmap"""
+        return len(self._present)
+
+    @property
+    def cancelled(self) -> int:
+        """Students with cancelled bookings"""
+        return self._cancelled
+
+    @property
+    def inactive(self) -> int:
+        """Students with cancelled or expired bookings"""
+        return self._cancelled | self._expired
+
+
+_EMPTY = PresenceBitmaps({}, {}, {}, 0, 0)
+
+
+class PresenceIndex:
+    """Bitmaps of student ids per day: present, arriving and departing."""
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._bitmaps = _EMPTY
+        self._stays: Dict[int, Tuple[date, date]] = {}
+        self._lock = threading.RLock()
+
+    def snapshot(self) -> PresenceBitmaps:
+        """The current bitmaps, for answering several queries from the same state"""
+        return self._bitmaps
+
+    def build(self, students: Iterable, version: int):
+        """
+        Rebuild the index from all students.
+
+        Only days on which some student is present get a bitmap, and stays are
+        indexed for at most MAX_STAY_DAYS, so a mistyped year in an arrival or
+        departure does not allocate bitmaps for every day in between.
+
+        Args:
+            students: Students or rows with id, arrival, departure and booking_status
+            version: Data version the students were read at
+        """
+        import numpy as np
+
+        students = [s for s in students if s.id is not None]
+        with_stay = [s for s in students if s.arrival and s.departure]
+        ids = np.array([s.id for s in with_stay], dtype=np.int64)
+        arrivals = np.array([s.arrival.toordinal() for s in with_stay], dtype=np.int64)
+        departures = np.array([s.departure.toordinal() for s in with_stay], dtype=np.int64)
+        ends = np.minimum(departures, arrivals + MAX_STAY_DAYS)
+        long_stays = ids[departures > ends]
+        if len(long_stays):
+            logger.warning(f"Presence index covers only {MAX_STAY_DAYS} days of the stays of students "
+                           f"{long_stays[:10].tolist()}{'...' if len(long_stays) > 10 else ''}")
+
+        present = {date.fromordinal(ordinal): bitmap_from_ids(ids[(arrivals <= ordinal) & (ends >= ordinal)])
+                   for ordinal in _covered_ordinals(arrivals, ends)}
+        bitmaps = PresenceBitmaps(
+            present, _bitmaps_by_day(ids, arrivals), _bitmaps_by_day(ids, departures),
+            bitmap_from_ids([s.id for s in students if s.booking_status == "cancelled"]),
+            bitmap_from_ids([s.id for s in students if s.booking_status == "expired"]))
+
+        with self._lock:
+            self._bitmaps = bitmaps
+            self._stays = {s.id: (s.arrival, s.departure) for s in with_stay}
+            self.version = version
+        logger.info(f"Built presence index of {len(students)} students over {len(present)} days")
+
+    def ensure_current(self, session: Session) -> "PresenceIndex":
+        """Rebuild the index from the database if the data changed since it was built"""
+        version = get_data_version()
+        with self._lock:
+            if self.version != version:
+                self.build(session.query(StudentORM.id, StudentORM.arrival, StudentORM.departure,
+                                         StudentORM.booking_status).all(), version)
+        return self
+
+    def apply(self, students: Iterable, since_version: int, version: int) -> bool:
+        """
+        Apply added or changed students to the index without rebuilding it.
+
+        The index is only updated if it reflects since_version, i.e. it has seen
+        every write before these students, and version is the single bump that
+        recorded them, i.e. nobody else wrote in between; otherwise it is rebuilt
+        on next use. The students are applied to copies of the day bitmaps,
+        which replace the current ones once all students are applied.
+
+        Args:
+            students: Students written since since_version
+            since_version: Data version before the students were written
+            version: Data version bumped once after the students were written
+
+        Returns:
+            True if the students were applied, False if the index was stale
+        """
+        with self._lock:
+            if self.version is None or self.version != since_version or version != since_version + 1:
+                self.version = None
+                return False
+            current = self._bitmaps
+            present, arrivals, departures = dict(current._present), dict(current._arrivals), dict(current._departures)
+            cancelled, expired = current._cancelled, current._expired
+            for student in students:
+                bit = 1 << student.id
+                stay = self._stays.pop(student.id, None)
+                if stay:
+                    for day in _stay_days(*stay):
+                        present[day] &= ~bit
+                    arrivals[stay[0]] &= ~bit
+                    departures[stay[1]] &= ~bit
+                cancelled &= ~bit
+                expired &= ~bit
+
+                if student.arrival and student.departure:
+                    self._stays[student.id] = (student.arrival, student.departure)
+                    for day in _stay_days(student.arrival, student.departure):
+                        present[day] = present.get(day, 0) | bit
+                    arrivals[student.arrival] = arrivals.get(student.arrival, 0) | bit
+                    departures[student.departure] = departures.get(student.departure, 0) | bit
+                if student.booking_status == "cancelled":
+                    cancelled |= bit
+                elif student.booking_status == "expired":
+                    expired |= bit
+            self._bitmaps = PresenceBitmaps(present, arrivals, departures, cancelled, expired)
+            self.version = version
+        return True
+
+    def present(self, day: date) -> int:
+        """Students staying on the day, arrival and departure day included"""
+        return self._bitmaps.present(day)
+
+    def arriving(self, day: date) -> int:
+        """Students arriving on the day"""
+        return self._bitmaps.arriving(day)
+
+    def departing(self, day: date) -> int:
+        """Students departing on the day"""
+        return self._bitmaps.departing(day)
+
+    def on_camp(self, day: date) -> int:
+        """Students staying the whole day: present, neither arriving nor departing"""
+        return self._bitmaps.on_camp(day)
+
+    def present_on_all(self, start_date: date, end_date: date) -> int:
+        """Students present on every day of start_date..end_date, nobody for an empty range"""
+        return self._bitmaps.present_on_all(start_date, end_date)
+
+    def present_on_any(self, start_date: date, end_date: date) -> int:
+        """Students present on at least one day of start_date..end_date"""
+        return self._bitmaps.present_on_any(start_date, end_date)
+
+    @property
+    def cancelled(self) -> int:
+        """Students with cancelled bookings"""
+        return self._bitmaps.cancelled
+
+    @property
+    def inactive(self) -> int:
+        """Students with cancelled or expired bookings"""
+        return self._bitmaps.inactive
+
+
+# Shared by the requests of this process
+presence_index = PresenceIndex()
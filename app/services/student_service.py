@@ -1,6 +1,9 @@
 import logging
 from datetime import date
+from typing import Optional
+from app.data.pagination import DEFAULT_PAGE_SIZE
 from app.domain.repositories_interfaces import StudentRepositoryInterface
+from app.services.presence_index import bitmap_ids
 from app.utils.student_utils import is_adult, is_teen, is_kid
 
 logger = logging.getLogger(__name__)
@@ -8,17 +11,70 @@ logger = logging.getLogger(__name__)
 
 class StudentService:
 
-    def __init__(self, student_repository: StudentRepositoryInterface):
+    def __init__(self, student_repository: StudentRepositoryInterface, season_snapshot=None, presence_index=None):
+        """
+        Args:
+            student_repository: Repository for accessing student data
+            season_snapshot: Columnar snapshot (app.data.season_snapshot) used to find the students
+                of a date range without loading all students, None to scan the students
+            presence_index: Current per-day presence index (app.services.presence_index) used to find
+                the students of a day, None to query them
+        """
         self.student_repository = student_repository
+        self.season_snapshot = season_snapshot
+        self.presence_index = presence_index
         self.students = []
 
     def get_all_students(self):
         return self.student_repository.get_all()
 
+    def get_students_page(self, fields: Optional[str] = None, cursor: Optional[str] = None,
+                          limit: int = DEFAULT_PAGE_SIZE, order_by: str = "id",
+                          start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """
+        Get a page of students, selecting only the requested columns.
+
+        Args:
+            fields: Comma separated columns to return, None for all
+            cursor: Cursor of the previous page, None for the first page
+            limit: Maximum number of students
+            order_by: "id" or "arrival" (pages ordered by arrival, then id)
+            start_date: Only students departing on or after this date
+            end_date: Only students arriving on or before this date
+
+        Returns:
+            Tuple of (student dictionaries, next cursor or None)
+        """
+        return self.student_repository.get_page(fields, cursor, limit, order_by, start_date, end_date)
+
     def get_all_students_for_date(self, _date):
+        if self.presence_index is not None:
+            index = self.presence_index.snapshot()
+            return self.student_repository.get_by_ids(bitmap_ids(index.on_camp(_date) & ~index.cancelled))
         return [student for student in self.student_repository.get_all_by_date_range(_date, _date)
                 if student.booking_status != "cancelled"]
 
+    def get_manifest(self, day: date):
+        """
+        Get the arrivals and departures of a day.
+
+        Requires a presence index.
+
+        Args:
+            day: The day of the manifest
+
+        Returns:
+            Dictionary with the arriving and departing students with active bookings
+            and the number of active students present that day
+        """
+        index = self.presence_index.snapshot()
+        return {
+            "date": day,
+            "arrivals": self.student_repository.get_by_ids(bitmap_ids(index.arriving(day) & ~index.inactive)),
+            "departures": self.student_repository.get_by_ids(bitmap_ids(index.departing(day) & ~index.inactive)),
+            "present": (index.present(day) & ~index.inactive).bit_count(),
+        }
+
     def get_students_with_booked_lessons_by_date_range(self, start_date: date, end_date: date):
         """
         Get students with booked surf lessons in the specified date range.
@@ -40,8 +96,7 @@ class StudentService:
         if start_date > end_date:
             raise ValueError("Start date must be before end date")
 
-        students = [student for student in self.student_repository.get_all() if
-                    student.arrival <= end_date and student.departure >= start_date]
+        students = self._students_overlapping(start_date, end_date)
 
         adults = [student for student in students if is_adult(student)]
         logger.debug(f"Found {len(adults)} adult students")
@@ -83,9 +138,15 @@ class StudentService:
         if start_date > end_date:
             raise ValueError("Start date must be before end date")
 
-        students = self.student_repository.get_all()
+        return self._students_overlapping(start_date, end_date)
 
-        return [student for student in students if student.arrival <= end_date and student.departure >= start_date]
+    def _students_overlapping(self, start_date: date, end_date: date):
+        """Students whose stay overlaps start_date..end_date, whatever their booking status"""
+        if self.season_snapshot is not None:
+            ids = sorted(self.season_snapshot.ids_overlapping(start_date, end_date, active_only=False))
+            return self.student_repository.get_by_ids(ids)
+        return [student for student in self.student_repository.get_all()
+                if student.arrival <= end_date and student.departure >= start_date]
 
     def get_students_by_level(self, level: str):
 
@@ -97,5 +158,4 @@ class StudentService:
         return [student for student in students if student.level == level]
 
     def save_all(self, students):
-        for student in students:
-            self.student_repository.save(student)
+        return self.student_repository.save_all(students)
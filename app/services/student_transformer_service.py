@@ -1,31 +1,106 @@
+import logging
+import os
+import shutil
+from dataclasses import replace
+
 from app.data.orm_models import Student
 from app.domain.repositories_interfaces import BookingRawRepositoryInterface, StudentRepositoryInterface
-from deepdiff import DeepDiff
 from fastapi import UploadFile
 import tempfile
-from app.services.loader.raw_csv_insert import csv_insert
+from app.core.data_version import bump_data_version, get_data_version
+from app.core.metrics import import_job_duration_seconds
+
+logger = logging.getLogger(__name__)
+
 
 class StudentTransformerService:
 
     def __init__(self, bookings_repository: BookingRawRepositoryInterface,
-                 student_repository: StudentRepositoryInterface):
+                 student_repository: StudentRepositoryInterface, presence_index=None):
         self.bookings_repository = bookings_repository
         self.student_repository = student_repository
+        # Presence index to update with the imported students, see app.services.presence_index
+        self.presence_index = presence_index
+        self.written_students = []
 
     def import_csv_file(self, file: UploadFile):
+        """
+        Import a bookings export and reconcile the students with it.
+
+        Args:
+            file: Uploaded CSV or XLSX export of the booking system
 
-        # Save to a temp file and pass to existing import logic
-        with tempfile.NamedTemporaryFile(delete=True, suffix=".csv") as tmp:
-            tmp.write(file.file.read())
-            tmp.flush()
-            csv_insert(tmp.name)
-            self.transform_all_bookings_into_students()
+        Raises:
+            ValueError: If the file is neither CSV nor XLSX
+        """
+        # pandas/numpy/openpyxl are only needed for imports, load them on first use
+        from app.services.loader.raw_csv_insert import BOOKING_FILE_LOADERS
+
+        suffix = os.path.splitext(file.filename or "")[1].lower() or ".csv"
+        if suffix not in BOOKING_FILE_LOADERS:
+            raise ValueError(f"Unsupported booking file type '{suffix}'")
 
-    def match_save_students(self, students_to_merge, students_in_db):
+        # The student writes of the import do not bump the data version, it is bumped once at the end
+        since_version = get_data_version()
+        self.written_students = []
+        try:
+            # Save to a temp file and pass to existing import logic
+            with import_job_duration_seconds.time(kind=suffix.lstrip(".")), \
+                    tempfile.NamedTemporaryFile(delete=True, suffix=suffix) as tmp:
+                shutil.copyfileobj(file.file, tmp)
+                tmp.flush()
+                BOOKING_FILE_LOADERS[suffix](tmp.name)
+                self.transform_all_bookings_into_students()
+        finally:
+            version = bump_data_version()
+        if self.presence_index is not None:
+            self.presence_index.apply(self.written_students, since_version, version)
+
+    def save_updates(self, updates):
+        """
+        Write the changed students of the import with one bulk update.
+
+        Args:
+            updates: (id, student with the new values) pairs
+
+        Returns:
+            Number of updated students
+        """
+        if not updates:
+            return 0
+        updated = self.student_repository.update_many(updates, bump_version=False)
+        self.written_students.extend(replace(student, id=id) for id, student in updates)
+        logger.info(f"Updated {updated} of {len(updates)} changed students")
+        return updated
+
+    def save_new_students(self, students):
+        """
+        Write the new students of the import with one batched insert.
+
+        Args:
+            students: New students without ids
+
+        Returns:
+            The saved students
+        """
+        if not students:
+            return []
+        saved_students = self.student_repository.save_all(students, bump_version=False)
+        self.written_students.extend(saved_students)
+        logger.info(f"Added {len(saved_students)} new students")
+        return saved_students
+
+    def match_save_students(self, students_to_merge, students_in_db, updates=None, new_students=None):
         """
         Matches students from CSV (students_to_merge) to existing students in DB (students_in_db),
         and performs create/update operations via repository.
+
+        Changed students are collected in updates and written by save_updates, new students
+        in new_students and written by save_new_students; without these lists they are
+        written before returning.
         """
+        pending_updates = [] if updates is None else updates
+        pending_new_students = [] if new_students is None else new_students
         matched_indices = set()
 
         for incoming_student in students_to_merge:
@@ -45,13 +120,18 @@ class StudentTransformerService:
                 if self._has_changed(incoming_student, match):
                     print(
                         f"🔁 Updating student {incoming_student.booking_number}: {incoming_student.first_name} {incoming_student.last_name}")
-                    self.student_repository.update(match.id, incoming_student)
+                    pending_updates.append((match.id, incoming_student))
                 # else:
                 #     print(f"✅ No change for student {incoming_student.booking_number}: {incoming_student.first_name} {incoming_student.last_name}")
             else:
                 print(
                     f"➕ Adding new student {incoming_student.booking_number}: {incoming_student.first_name} {incoming_student.last_name}")
-                self.student_repository.save(incoming_student)
+                pending_new_students.append(incoming_student)
+
+        if new_students is None:
+            self.save_new_students(pending_new_students)
+        if updates is None:
+            self.save_updates(pending_updates)
 
     def _is_probable_match(self, student1, student2):
         """Basic heuristic to guess if two students are the same person."""
@@ -65,9 +145,12 @@ class StudentTransformerService:
 
     def _has_changed(self, student_new, student_existing):
         """Check and log differences between two Student instances."""
+        from dataclasses import asdict
+        from deepdiff import DeepDiff
+
         diff = DeepDiff(
-            student_existing.__dict__,
-            student_new.__dict__,
+            asdict(student_existing),
+            asdict(student_new),
             ignore_order=True,
             exclude_paths={"root['id']"}
         )
@@ -101,12 +184,16 @@ class StudentTransformerService:
                 tent=incoming_booking.tent)
             )
 
+        updates = []
+        new_students = []
         for booking_number, _students in incoming_students.items():
             students_in_db = self.student_repository.get_by_booking_number(booking_number)
             if not students_in_db:
-                self.student_repository.save_all(_students)
+                new_students.extend(_students)
             else:
-                self.match_save_students(_students, students_in_db)
+                self.match_save_students(_students, students_in_db, updates, new_students)
+        self.save_new_students(new_students)
+        self.save_updates(updates)
 
         return incoming_students
 
@@ -0,0 +1,226 @@
+"""Daily statistics rollup of active students.
+
+For every day the rollup stores the counts of the students arriving on that
+day and of the students departing on that day. The students whose stay
+overlaps a period start..end are exactly those arriving on or before end
+minus those that already departed before start, so any period can be
+answered from two prefix sums over the rollup without scanning students.
+
+Students without arrival/departure or departing before they arrive are not
+included in the rollup.
+
+A rebuild also writes a BUILT marker row, dated before any stay. Student writes
+refresh their days in the same transaction, so a rollup with the marker is
+current and readers find the marker among the rows they read anyway.
+"""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.utils.student_utils import is_adult, is_teen, is_kid
+
+ARRIVAL = "arrival"
+DEPARTURE = "departure"
+# Event of the row marking a built rollup, on the earliest day MySQL's DATE supports
+BUILT = "built"
+BUILT_MARKER_DAY = date(1000, 1, 1)
+
+ROLLUP_METRICS = (
+    "guests", "adults", "teens", "kids",
+    "guests_with_lessons", "guests_without_lessons", "surf_lessons",
+    "beginner", "beginner_plus", "intermediate", "advanced", "teen_students", "kid_students",
+)
+
+# Booking statuses of students that are not part of the rollup
+INACTIVE_BOOKING_STATUSES = ("cancelled", "expired")
+
+_LEVEL_METRICS = {"BEGINNER": "beginner", "BEGINNER PLUS": "beginner_plus",
+                  "INTERMEDIATE": "intermediate", "ADVANCED": "advanced"}
+
+
+def student_rollup_metrics(student) -> Optional[Dict[str, int]]:
+    """
+    Get the rollup metrics a student contributes to.
+
+    Args:
+        student: Student (domain or ORM object)
+
+    Returns:
+        Dictionary of metric to count, None if the student is not part of the rollup
+    """
+    if student.booking_status in INACTIVE_BOOKING_STATUSES:
+        return None
+    if not student.arrival or not student.departure or student.arrival > student.departure:
+        return None
+
+    adult, teen, kid = is_adult(student), is_teen(student), is_kid(student)
+    lessons = student.number_of_surf_lessons or 0
+    metrics = dict.fromkeys(ROLLUP_METRICS, 0)
+    metrics.update(guests=1, adults=int(adult), teens=int(teen), kids=int(kid))
+    if lessons > 0:
+        metrics.update(guests_with_lessons=1, surf_lessons=lessons, teen_students=int(teen), kid_students=int(kid))
+        level_metric = _LEVEL_METRICS.get((student.level or "BEGINNER").strip().upper())
+        if adult and level_metric:
+            metrics[level_metric] = 1
+    elif student.number_of_surf_lessons == 0:
+        metrics["guests_without_lessons"] = 1
+    return metrics
+
+
+def build_rollup_rows(students: Iterable) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Aggregate students into daily_stats and daily_lesson_stats rows.
+
+    Args:
+        students: Students to aggregate
+
+    Returns:
+        Tuple of (daily stats rows, daily lesson stats rows) as dictionaries
+    """
+    stats = defaultdict(lambda: dict.fromkeys(ROLLUP_METRICS, 0))
+    lessons = defaultdict(int)
+
+    for student in students:
+        metrics = student_rollup_metrics(student)
+        if metrics is None:
+            continue
+        for key in ((student.arrival, ARRIVAL), (student.departure, DEPARTURE)):
+            row = stats[key]
+            for metric, value in metrics.items():
+                row[metric] += value
+            if metrics["guests_with_lessons"]:
+                lessons[(*key, student.number_of_surf_lessons)] += 1
+
+    stats_rows = [{"day": day, "event": event, **metrics} for (day, event), metrics in stats.items()]
+    lesson_rows = [{"day": day, "event": event, "number_of_lessons": number, "guests": guests}
+                   for (day, event, number), guests in lessons.items()]
+    return stats_rows, lesson_rows
+
+
+def built_marker_row() -> Dict:
+    """The daily stats row marking a built rollup, all metrics zero"""
+    return {"day": BUILT_MARKER_DAY, "event": BUILT, **dict.fromkeys(ROLLUP_METRICS, 0)}
+
+
+def rollup_is_built(rows: Iterable) -> bool:
+    """Whether daily stats rows read from the rollup include the BUILT marker"""
+    return any(row["event"] == BUILT for row in rows)
+
+
+def overlap_totals(rows: Iterable, periods: Sequence[Tuple[date, date]]) -> List[Dict[str, int]]:
+    """
+    Compute the metric totals of the students overlapping each period.
+
+    Args:
+        rows: Daily stats rows (mappings with day, event and the metrics) up to the last period end
+        periods: (start, end) date pairs
+
+    Returns:
+        One dictionary of metric to total per period
+    """
+    days = {ARRIVAL: [], DEPARTURE: []}
+    values = {ARRIVAL: [], DEPARTURE: []}
+    for row in sorted(rows, key=lambda r: r["day"]):
+        if row["event"] not in days:
+            continue
+        days[row["event"]].append(row["day"])
+        values[row["event"]].append(tuple(row[metric] for metric in ROLLUP_METRICS))
+
+    zero = (0,) * len(ROLLUP_METRICS)
+    prefix = {
+        event: [zero, *accumulate(event_values, lambda a, b: tuple(x + y for x, y in zip(a, b)))]
+        for event, event_values in values.items()
+    }
+
+    totals = []
+    for start, end in periods:
+        arrived = prefix[ARRIVAL][bisect_right(days[ARRIVAL], end)]
+        departed = prefix[DEPARTURE][bisect_left(days[DEPARTURE], start)]
+        totals.append({metric: a - d for metric, a, d in zip(ROLLUP_METRICS, arrived, departed)})
+    return totals
+
+
+def lesson_distribution(lesson_rows: Iterable, start_date: date) -> Dict[int, int]:
+    """
+    Count the students overlapping a period by number of booked lessons.
+
+    Args:
+        lesson_rows: Daily lesson stats rows (mappings with day, event, number_of_lessons and guests)
+            up to the period end
+        start_date: Start of the period
+
+    Returns:
+        Dictionary of number of lessons to students, ascending, without zero counts
+    """
+    counts = defaultdict(int)
+    for row in lesson_rows:
+        if row["event"] == ARRIVAL:
+            counts[row["number_of_lessons"]] += row["guests"]
+        elif row["event"] == DEPARTURE and row["day"] < start_date:
+            counts[row["number_of_lessons"]] -= row["guests"]
+    return {number: guests for number, guests in sorted(counts.items()) if guests}
+
+
+def statistics_from_totals(totals: Dict[str, int], lesson_distribution: Dict[int, int]) -> Dict:
+    """Build the age group, surf lesson and skill level statistics from rollup totals."""
+    with_lessons = totals["guests_with_lessons"]
+    return {
+        "age_groups": {
+            "adults": totals["adults"],
+            "teens": totals["teens"],
+            "kids": totals["kids"],
+            "total": totals["adults"] + totals["teens"] + totals["kids"]
+        },
+        "surf_lessons": {
+            "total_guests": totals["guests"],
+            "guests_with_lessons": with_lessons,
+            "guests_without_lessons": totals["guests_without_lessons"],
+            "average_lessons": round(totals["surf_lessons"] / with_lessons, 2) if with_lessons else 0,
+            "lesson_distribution": lesson_distribution
+        },
+        "skill_levels": {
+            "beginner": totals["beginner"],
+            "beginner_plus": totals["beginner_plus"],
+            "intermediate": totals["intermediate"],
+            "advanced": totals["advanced"],
+            "teens": totals["teen_students"],
+            "kids": totals["kid_students"]
+        }
+    }
+
+
+# Flexible analytics filter to rollup metric, in the order of the response
+_FLEXIBLE_METRICS = (
+    ("total_guests", "guests"), ("adults", "adults"), ("teens", "teens"), ("kids", "kids"),
+    ("surf_lessons", "surf_lessons"), ("beginner", "beginner"), ("beginner_plus", "beginner_plus"),
+    ("intermediate", "intermediate"), ("advanced", "advanced"), ("teen_students", "teen_students"),
+    ("kid_students", "kid_students"),
+)
+
+
+def period_metrics_from_totals(period_start: date, period_end: date, totals: Dict[str, int], filters) -> Dict:
+    """Build one period of the flexible analytics from rollup totals."""
+    period_data = {
+        "period_start": period_start.isoformat(),
+        "period_end": period_end.isoformat(),
+    }
+    for name, metric in _FLEXIBLE_METRICS:
+        if name in filters:
+            period_data[name] = totals[metric]
+    return period_data
+
+
+def month_statistics_from_totals(year: int, month: int, totals: Dict[str, int]) -> Dict:
+    """Build one month of the monthly overview from rollup totals."""
+    return {
+        "month": month,
+        "month_name": date(year, month, 1).strftime("%B"),
+        "total_guests": totals["guests"],
+        "guests_with_lessons": totals["guests_with_lessons"],
+        "total_lessons": totals["surf_lessons"],
+        "adults": totals["adults"],
+        "teens": totals["teens"],
+        "kids": totals["kids"]
+    }
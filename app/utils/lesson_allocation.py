@@ -0,0 +1,116 @@
+"""Vectorized allocation of planned surf lesson days."""
+from datetime import date, timedelta
+from typing import List, Sequence
+
+import numpy as np
+
+from app.domain.models import Student
+
+
+def student_arrays(students: Sequence[Student]):
+    """
+    Extract the arrays needed for lesson allocation.
+
+    Args:
+        students: Students to allocate lessons for
+
+    Returns:
+        Tuple of (arrival ordinals, departure ordinals, number of lessons) as int arrays
+    """
+    count = len(students)
+    arrivals = np.fromiter((s.arrival.toordinal() for s in students), dtype=np.int64, count=count)
+    departures = np.fromiter((s.departure.toordinal() for s in students), dtype=np.int64, count=count)
+    lessons = np.fromiter((s.number_of_surf_lessons or 0 for s in students), dtype=np.int64, count=count)
+    return arrivals, departures, lessons
+
+
+def allocate_lesson_days(
+    arrivals: np.ndarray,
+    departures: np.ndarray,
+    lessons: np.ndarray,
+    start_date: date,
+    days: int = 7,
+    count_from_window_start: bool = True
+) -> np.ndarray:
+    """
+    Compute a students x days matrix of planned lesson days.
+
+    Lessons start the day after arrival and are planned on consecutive days
+    until either all booked lessons are used up or the student departs
+    (no lesson on the departure day).
+
+    Args:
+        arrivals: Arrival dates as ordinals
+        departures: Departure dates as ordinals
+        lessons: Number of booked lessons
+        start_date: First day of the window
+        days: Number of days in the window
+        count_from_window_start: If True, all booked lessons are available from the
+            first day of the window (weekly group export). If False, lessons on days
+            before the window are counted as already taken (forecasts over long ranges).
+
+    Returns:
+        Boolean array of shape (len(students), days)
+    """
+    day_ordinals = start_date.toordinal() + np.arange(days, dtype=np.int64)
+    lesson_start = (arrivals + 1)[:, None]
+
+    eligible = (day_ordinals[None, :] >= lesson_start) & (day_ordinals[None, :] < departures[:, None])
+    if count_from_window_start:
+        return eligible & (np.cumsum(eligible, axis=1) <= lessons[:, None])
+    return eligible & (day_ordinals[None, :] < lesson_start + lessons[:, None])
+
+
+def planned_lesson_days(students: Sequence[Student], start_date: date, days: int = 7,
+                        count_from_window_start: bool = True) -> np.ndarray:
+    """
+    Compute the planned lesson days of students for a window of days.
+
+    Args:
+        students: Students to allocate lessons for
+        start_date: First day of the window
+        days: Number of days in the window
+        count_from_window_start: See allocate_lesson_days
+
+    Returns:
+        Boolean array of shape (len(students), days)
+    """
+    if not students:
+        return np.zeros((0, days), dtype=bool)
+    return allocate_lesson_days(*student_arrays(students), start_date, days, count_from_window_start)
+
+
+def lessons_per_day(students: Sequence[Student], start_date: date, end_date: date) -> List[dict]:
+    """
+    Forecast the number of surf lessons taking place on each day of a date range.
+
+    Args:
+        students: Students to include (usually active students with lessons)
+        start_date: First day of the range
+        end_date: Last day of the range (inclusive)
+
+    Returns:
+        List of {"date": ISO date, "lessons": count} dictionaries, one per day
+    """
+    days = (end_date - start_date).days + 1
+    matrix = planned_lesson_days(students, start_date, days, count_from_window_start=False)
+    counts = matrix.sum(axis=0)
+    return [
+        {"date": (start_date + timedelta(days=i)).isoformat(), "lessons": int(counts[i])}
+        for i in range(days)
+    ]
+
+
+def ages_on(students: Sequence[Student], reference_date: date) -> List:
+    """
+    Compute the age in years of each student on a reference date.
+
+    Args:
+        students: Students to compute ages for
+        reference_date: Date the ages refer to
+
+    Returns:
+        List of ages, "" for students without birthday
+    """
+    reference_ordinal = reference_date.toordinal()
+    return [(reference_ordinal - s.birthday.toordinal()) // 365 if s.birthday else "" for s in students]
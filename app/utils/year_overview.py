@@ -0,0 +1,94 @@
+"""Monthly statistics for one or more years, computed in one pass with NumPy."""
+from datetime import date
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from app.domain.models import Student
+from app.utils.student_utils import is_adult, is_teen, is_kid
+
+# Metrics accumulated per month, in the order of the weight rows built below
+MONTH_METRICS = ("total_guests", "guests_with_lessons", "total_lessons", "adults", "teens", "kids")
+
+
+def month_index(day: date) -> int:
+    """Consecutive month number, so that months can be binned with integer arithmetic."""
+    return day.year * 12 + day.month - 1
+
+
+def monthly_totals(students: Sequence[Student], first_year: int, last_year: int) -> np.ndarray:
+    """
+    Count students per month for every month of a range of years.
+
+    A student is counted in every month their stay overlaps, like filtering the
+    students of each month separately. Each stay adds its weights at its first
+    month and removes them after its last month; a cumulative sum over the
+    months then gives the totals.
+
+    Args:
+        students: Active students
+        first_year: First year of the range
+        last_year: Last year of the range (inclusive)
+
+    Returns:
+        Array of shape (len(MONTH_METRICS), number of months) with the metrics per month
+    """
+    offset = first_year * 12
+    months = (last_year - first_year + 1) * 12
+    students = [s for s in students if s.arrival and s.departure]
+
+    count = len(students)
+    starts = np.fromiter((month_index(s.arrival) for s in students), dtype=np.int64, count=count) - offset
+    ends = np.fromiter((month_index(s.departure) for s in students), dtype=np.int64, count=count) - offset
+    lessons = np.fromiter((s.number_of_surf_lessons for s in students), dtype=np.int64, count=count)
+    with_lessons = lessons > 0
+
+    weights = np.vstack([
+        np.ones(count, dtype=np.int64),
+        with_lessons,
+        np.where(with_lessons, lessons, 0),
+        np.fromiter((is_adult(s) for s in students), dtype=np.int64, count=count),
+        np.fromiter((is_teen(s) for s in students), dtype=np.int64, count=count),
+        np.fromiter((is_kid(s) for s in students), dtype=np.int64, count=count),
+    ]).astype(np.int64)
+
+    # Keep stays that overlap the range and clip them to it
+    overlapping = (starts <= ends) & (ends >= 0) & (starts < months)
+    starts = np.clip(starts[overlapping], 0, months - 1)
+    ends = np.clip(ends[overlapping], 0, months - 1)
+    weights = weights[:, overlapping]
+
+    totals = np.empty((len(MONTH_METRICS), months), dtype=np.int64)
+    for row, metric_weights in enumerate(weights):
+        changes = (np.bincount(starts, weights=metric_weights, minlength=months + 1)
+                   - np.bincount(ends + 1, weights=metric_weights, minlength=months + 1))
+        totals[row] = np.cumsum(changes[:months]).round().astype(np.int64)
+    return totals
+
+
+def year_overview(students: Sequence[Student], years: Sequence[int]) -> Dict[int, List[Dict]]:
+    """
+    Build the monthly overview of each year from a single pass over the students.
+
+    Args:
+        students: Active students overlapping the years
+        years: Years to include
+
+    Returns:
+        Dictionary of year to a list of 12 monthly statistics dictionaries
+    """
+    first_year, last_year = min(years), max(years)
+    totals = monthly_totals(students, first_year, last_year)
+
+    overview = {}
+    for year in years:
+        base = (year - first_year) * 12
+        overview[year] = [
+            {
+                "month": month,
+                "month_name": date(year, month, 1).strftime("%B"),
+                **{metric: int(totals[row, base + month - 1]) for row, metric in enumerate(MONTH_METRICS)}
+            }
+            for month in range(1, 13)
+        ]
+    return overview
@@ -0,0 +1,74 @@
+"""Memory used by a season of Student objects.
+
+Compares the slotted Student with interned categorical fields against the
+previous layout (a dataclass with a per-instance __dict__ and one string
+object per value, as returned by the database driver).
+
+Usage:
+    python -m benchmarks.memory --students 100000
+"""
+import argparse
+import dataclasses
+import gc
+import sys
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from app.domain.models import Student
+from benchmarks.synthetic_season import generate_students
+
+# Previous layout of Student: same fields, per-instance __dict__, no interning
+DictStudent = dataclasses.make_dataclass(
+    "DictStudent", [(f.name, f.type, f) for f in dataclasses.fields(Student)])
+
+
+def _copy_strings(row: Dict) -> Dict:
+    """Give every string its own object, like rows fetched from the database"""
+    return {key: "".join(list(value)) if isinstance(value, str) else value for key, value in row.items()}
+
+
+def measure(build: Callable[[Dict], object], rows: List[Dict]) -> int:
+    """
+    Measure the memory held by the objects built from the rows.
+
+    Returns:
+        Allocated bytes still held after building all objects
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(_copy_strings(row)) for row in rows]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def compare(students: int) -> Dict[str, int]:
+    """
+    Compare the memory of a season of students in both layouts.
+
+    Returns:
+        Dictionary with the bytes held by the dict layout and by the slotted layout
+    """
+    rows = [dict(row, single_parent=False) for row in generate_students(students)]
+    return {
+        "dict_bytes": measure(lambda row: DictStudent(**row), rows),
+        "slots_bytes": measure(lambda row: Student(**row), rows),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100000, help="Number of synthetic students")
+    args = parser.parse_args(argv)
+
+    result = compare(args.students)
+    print(f"{args.students} students")
+    print(f"  __dict__, not interned: {result['dict_bytes'] / 1024 / 1024:8.1f} MiB")
+    print(f"  __slots__, interned:    {result['slots_bytes'] / 1024 / 1024:8.1f} MiB "
+          f"({result['slots_bytes'] / result['dict_bytes']:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Benchmark the services and exports against a synthetic season in SQLite.
+
+Every case is timed (best of several runs, each with a fresh session) and the
+number of SQL statements it issues is recorded. The results are compared with
+the stored baseline for the same season size: a case regresses when it issues
+more queries than the baseline or gets slower than the allowed tolerance.
+
+Usage:
+    python -m benchmarks.run_benchmarks --students 10000
+    python -m benchmarks.run_benchmarks --students 100000 --update-baseline
+"""
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import argparse
+import contextlib
+import json
+import logging
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.db import create_db_engine
+from app.data.orm_models import Base
+from app.data.sql_alchemey_repository_impl import (SQLAlchemyStudentRepositoryImpl, SQLAlchemySurfPlanRepositoryImpl,
+                                                   SQLAlchemyDailyStatsRepositoryImpl)
+from app.services.analytics_service import AnalyticsService
+from app.services.student_service import StudentService
+from app.services.surf_plan_service import SurfPlanService
+from app.services.tide_service_interface import TideServiceMockImpl
+from app.utils.date_utils import TimePeriod
+from benchmarks.synthetic_season import seed_database
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+SEASON_YEAR = 2025
+SEED = 42
+
+# A case only counts as slower when it lost more than this, timings of fast cases are noisy
+MIN_REGRESSION_SECONDS = 0.05
+
+
+class QueryCounter:
+    """Count the statements executed on an engine."""
+
+    def __init__(self, engine: Engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def benchmark_cases() -> Dict[str, Callable[[Session], object]]:
+    """
+    Get the benchmarked calls by name.
+
+    Each call gets a new session, so the identity map does not carry over between runs.
+    """
+    # Exports live in the router module, import it only when benchmarking
+    from app.api import students_router
+
+    week = date(SEASON_YEAR, 7, 6)
+    day = date(SEASON_YEAR, 7, 9)
+    season_start, season_end = date(SEASON_YEAR, 4, 1), date(SEASON_YEAR, 10, 31)
+
+    def analytics(session: Session, rollup: bool = False) -> AnalyticsService:
+        return AnalyticsService(SQLAlchemyStudentRepositoryImpl(session),
+                                daily_stats_repository=SQLAlchemyDailyStatsRepositoryImpl(session) if rollup else None)
+
+    def students(session: Session) -> StudentService:
+        return StudentService(SQLAlchemyStudentRepositoryImpl(session))
+
+    def surf_plans(session: Session) -> SurfPlanService:
+        return SurfPlanService(SQLAlchemySurfPlanRepositoryImpl(session), students(session), TideServiceMockImpl())
+
+    def week_overview_xlsx(session: Session) -> bytes:
+        return students_router.create_excel_week_overview(week, surf_plans(session).generate_surf_groups_for_week(week))
+
+    def students_html(session: Session) -> str:
+        return "".join(students_router.render_student_groups(
+            students_router.group_students_for_html_export(students(session), day)))
+
+    return {
+        "analytics.comprehensive_scan": lambda s: analytics(s).get_comprehensive_statistics(season_start, season_end),
+        "analytics.comprehensive": lambda s: analytics(s, True).get_comprehensive_statistics(season_start, season_end),
+        "analytics.flexible_weekly": lambda s: analytics(s, True).get_flexible_analytics(
+            season_start, season_end, TimePeriod.WEEKLY),
+        "analytics.year_over_year": lambda s: analytics(s, True).get_year_over_year([SEASON_YEAR - 1, SEASON_YEAR]),
+        "analytics.lessons_per_day_forecast": lambda s: analytics(s).get_lessons_per_day_forecast(
+            week, date(SEASON_YEAR, 7, 12)),
+        "students.all": lambda s: students(s).get_all_students(),
+        "students.for_date": lambda s: students(s).get_all_students_for_date(day),
+        "students.booked_lessons_week": lambda s: students(s).get_students_with_booked_lessons_by_date_range(
+            week, date(SEASON_YEAR, 7, 12)),
+        "students.page": lambda s: students(s).get_students_page("id,first_name,arrival", None, 500, "arrival",
+                                                                 season_start, season_end),
+        "surf_plan.groups_for_week": lambda s: surf_plans(s).generate_surf_groups_for_week(week),
+        "surf_plan.plan_for_day": lambda s: surf_plans(s).generate_surf_plan_for_day(day),
+        "export.week_overview_xlsx": week_overview_xlsx,
+        "export.students_xlsx": lambda s: students_router.export_students_to_excel(day, day, s),
+        "export.students_html": students_html,
+    }
+
+
+def run_case(session_factory, counter: QueryCounter, call: Callable, repeat: int) -> Dict:
+    """
+    Run one case and measure it.
+
+    Returns:
+        Dictionary with the best time in seconds and the queries of one call
+    """
+    timings = []
+    queries = None
+    for _ in range(repeat):
+        session = session_factory()
+        try:
+            before = counter.count
+            started = time.perf_counter()
+            # StudentORM.to_domain prints, keep the benchmark output readable
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                call(session)
+            timings.append(time.perf_counter() - started)
+            queries = counter.count - before
+        finally:
+            session.close()
+    return {"seconds": round(min(timings), 4), "queries": queries}
+
+
+def run_benchmarks(students: int, repeat: int = 3, cases: Optional[List[str]] = None,
+                   database_dir: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Seed a SQLite database with a synthetic season and run the benchmark cases.
+
+    Args:
+        students: Number of synthetic students
+        repeat: Runs per case, the fastest one is reported
+        cases: Names of the cases to run, all if not set
+        database_dir: Directory for the database file, a temporary directory if not set
+
+    Returns:
+        Dictionary of case name to {"seconds": ..., "queries": ...}
+    """
+    with tempfile.TemporaryDirectory(dir=database_dir) as tmp_dir:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}")
+        try:
+            Base.metadata.create_all(engine)
+            started = time.perf_counter()
+            seed_database(engine, students, SEASON_YEAR, SEED)
+            logger.info(f"Seeded {students} students in {time.perf_counter() - started:.2f}s")
+
+            session_factory = sessionmaker(bind=engine)
+            # Build the rollup once, outside of the timed calls
+            with session_factory() as session:
+                SQLAlchemyDailyStatsRepositoryImpl(session).rebuild()
+
+            counter = QueryCounter(engine)
+            results = {}
+            for name, call in benchmark_cases().items():
+                if cases and name not in cases:
+                    continue
+                results[name] = run_case(session_factory, counter, call, repeat)
+                logger.info(f"{name}: {results[name]['seconds']:.4f}s, {results[name]['queries']} queries")
+            return results
+        finally:
+            engine.dispose()
+
+
+def find_regressions(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Compare benchmark results with a baseline.
+
+    Args:
+        results: Results of run_benchmarks
+        baseline: Stored results for the same season size
+        tolerance: Allowed relative slowdown, e.g. 0.5 for 50%
+
+    Returns:
+        Descriptions of the regressions, empty if there are none
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["queries"] > expected["queries"]:
+            regressions.append(f"{name}: {result['queries']} queries, baseline {expected['queries']}")
+        allowed = max(expected["seconds"] * (1 + tolerance), expected["seconds"] + MIN_REGRESSION_SECONDS)
+        if result["seconds"] > allowed:
+            regressions.append(f"{name}: {result['seconds']:.4f}s, baseline {expected['seconds']:.4f}s")
+    return regressions
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict[str, Dict]]:
+    """Load the stored baselines, keyed by the number of students"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=10000, help="Number of synthetic students (10k - 1M)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the fastest one counts")
+    parser.add_argument("--case", action="append", dest="cases", help="Only run this case (repeatable)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    # The services log every call, only show the benchmark progress
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    results = run_benchmarks(args.students, args.repeat, args.cases)
+
+    baselines = load_baseline(args.baseline)
+    size = str(args.students)
+    if args.update_baseline:
+        baselines[size] = {**baselines.get(size, {}), **results}
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        logger.info(f"Stored baseline for {size} students in {args.baseline}")
+        return 0
+
+    if size not in baselines:
+        logger.warning(f"No baseline for {size} students, run with --update-baseline to store one")
+        return 0
+
+    regressions = find_regressions(results, baselines[size], args.tolerance)
+    for regression in regressions:
+        logger.error(f"Regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Seeded generator of synthetic seasons for benchmarks.
+
+Extends the handful of hand written students in seed.py to seasons of any
+size with the distributions seen in real bookings: most guests stay a week,
+bookings hold one to five guests, about a tenth of the bookings are cancelled
+or expired and most adults start as beginners. The same seed always gives the
+same students.
+"""
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.data.orm_models import StudentORM
+
+FIRST_NAMES = ["Alice", "Bob", "Carol", "Dan", "Eva", "Frank", "Grace", "Hank", "Ivy", "Jack",
+               "Lena", "Marco", "Nina", "Oscar", "Paula", "Rui", "Sofia", "Tom", "Uma", "Vera"]
+LAST_NAMES = ["Smith", "Johnson", "Lee", "Kim", "Brown", "Green", "Park", "White", "Hall", "Young",
+              "Silva", "Costa", "Müller", "Schmidt", "Rossi", "Dubois", "Novak", "Jansen"]
+
+# (value, weight) pairs
+STAY_LENGTHS = [(3, 5), (4, 5), (5, 8), (6, 7), (7, 45), (10, 10), (14, 15), (21, 5)]
+AGE_GROUPS = [("Adults >18 years", 78), ("Teens 13-18", 12), ("Kids 5-12", 8), (None, 2)]
+ADULT_LEVELS = [("BEGINNER", 50), ("BEGINNER PLUS", 20), ("INTERMEDIATE", 18), ("ADVANCED", 7), (None, 5)]
+BOOKING_STATUSES = [("confirmed", 85), ("pending", 5), ("cancelled", 7), ("expired", 3)]
+SURF_LESSONS = [(0, 30), (3, 15), (5, 30), (7, 10), (10, 15)]
+GUESTS_PER_BOOKING = [(1, 35), (2, 40), (3, 10), (4, 10), (5, 5)]
+
+# Ages of birthdays generated per age group
+_AGE_RANGES = {"Adults >18 years": (19, 60), "Teens 13-18": (13, 18), "Kids 5-12": (5, 12), None: (19, 60)}
+
+
+def _weighted(rng: random.Random, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def generate_students(count: int, season_year: int = 2025, seed: int = 42,
+                      season_start: Optional[date] = None, season_days: int = 200) -> Iterator[Dict]:
+    """
+    Generate synthetic students as StudentORM column dictionaries.
+
+    Arrivals are spread over the season with more guests in the summer months.
+    Guests of one booking share booking number, arrival, departure and tent.
+
+    Args:
+        count: Number of students to generate
+        season_year: Year of the season
+        seed: Random seed, the same seed gives the same students
+        season_start: First arrival day, April 1st of season_year if not set
+        season_days: Number of days arrivals are spread over
+
+    Returns:
+        Iterator of dictionaries with the StudentORM columns (ids start at 1)
+    """
+    rng = random.Random(seed)
+    season_start = season_start or date(season_year, 4, 1)
+    student_id = 0
+    booking = 0
+
+    while student_id < count:
+        booking += 1
+        # Triangular distribution peaks in the middle of the season
+        arrival = season_start + timedelta(days=int(rng.triangular(0, season_days, season_days / 2)))
+        departure = arrival + timedelta(days=_weighted(rng, STAY_LENGTHS))
+        status = _weighted(rng, BOOKING_STATUSES)
+        last_name = rng.choice(LAST_NAMES)
+        tent = f"T{rng.randrange(1, 80)}"
+
+        for _ in range(min(_weighted(rng, GUESTS_PER_BOOKING), count - student_id)):
+            student_id += 1
+            age_group = _weighted(rng, AGE_GROUPS)
+            youngest, oldest = _AGE_RANGES[age_group]
+            lessons = _weighted(rng, SURF_LESSONS)
+            yield {
+                "id": student_id,
+                "first_name": rng.choice(FIRST_NAMES),
+                "last_name": last_name,
+                "birthday": date(season_year - rng.randint(youngest, oldest), rng.randint(1, 12), rng.randint(1, 28)),
+                "gender": rng.choice(["Female", "Male"]),
+                "age_group": age_group,
+                "level": _weighted(rng, ADULT_LEVELS) if age_group in ("Adults >18 years", None) else None,
+                "booking_number": f"BOOK{booking:07d}",
+                "arrival": arrival,
+                "departure": departure,
+                "booking_status": status,
+                "number_of_surf_lessons": lessons,
+                "surf_lesson_package_name": f"{lessons} Surf Lessons" if lessons else None,
+                "tent": tent,
+            }
+
+
+def seed_database(engine: Engine, count: int, season_year: int = 2025, seed: int = 42,
+                  chunk_size: int = 10000) -> int:
+    """
+    Insert a synthetic season into the students table.
+
+    Args:
+        engine: Engine of a database with the schema created
+        count: Number of students to insert
+        season_year: Year of the season
+        seed: Random seed
+        chunk_size: Number of students inserted per executemany batch
+
+    Returns:
+        Number of inserted students
+    """
+    inserted = 0
+    chunk: List[Dict] = []
+    with engine.begin() as connection:
+        for student in generate_students(count, season_year, seed):
+            chunk.append(student)
+            if len(chunk) == chunk_size:
+                connection.execute(insert(StudentORM), chunk)
+                inserted += len(chunk)
+                chunk = []
+        if chunk:
+            connection.execute(insert(StudentORM), chunk)
+            inserted += len(chunk)
+    return inserted
@@ -1,28 +1,55 @@
 from fastapi import FastAPI
-from app.api import students_router, analytics_router, crew_router
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="SurfPlanner API", description="API for surf and tide planning", version="1.0")
-
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-        "http://116.203.228.190:3000"
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include all routers
-app.include_router(students_router.router)
-app.include_router(analytics_router.router)
-app.include_router(crew_router.router)
-
 
+def create_app() -> FastAPI:
+    """
+    Create the SurfPlanner FastAPI application.
+
+    Routers only import lightweight modules at startup; pandas, numpy, PyMySQL
+    and deepdiff are imported by the import/export code paths on first use.
+    """
+    from app.api import students_router, analytics_router, crew_router, internal_router, metrics_router
+    from app.api.pagination import NEXT_CURSOR_HEADER
+    from app.api.responses import DomainJSONResponse
+    from app.core.config import PROFILING_TOKEN
+    from app.core.metrics import MetricsMiddleware
+    from app.core.profiling import ProfilingMiddleware
+    from app.core.query_stats import QueryStatsMiddleware, QUERY_COUNT_HEADER, QUERY_TIME_HEADER
+
+    # Routes returning plain data are still encoded by FastAPI, but dumped with orjson
+    app = FastAPI(title="SurfPlanner API", description="API for surf and tide planning", version="1.0",
+                  default_response_class=DomainJSONResponse)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:3000",
+            "http://127.0.0.1:3000",
+            "http://116.203.228.190:3000"
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Readable by the frontend: query stats and the cursor of the next page of list endpoints
+        expose_headers=[QUERY_COUNT_HEADER, QUERY_TIME_HEADER, NEXT_CURSOR_HEADER],
+    )
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    if PROFILING_TOKEN:
+        app.add_middleware(ProfilingMiddleware)
+
+    # Include all routers
+    app.include_router(students_router.router)
+    app.include_router(analytics_router.router)
+    app.include_router(crew_router.router)
+    app.include_router(internal_router.router)
+    app.include_router(metrics_router.router)
+
+    return app
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+"""Tests for the analytics result cache."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import unittest
+from datetime import date
+from unittest.mock import Mock, patch
+
+from app.domain.repositories_interfaces import StudentRepositoryInterface
+from app.services.analytics_cache import AnalyticsCache
+from app.services.analytics_service import AnalyticsService
+from test.test_helpers import create_test_student
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAnalyticsCache(unittest.TestCase):
+    """Tests for TTL, LRU and statistics of AnalyticsCache."""
+
+    def test_entries_expire_after_ttl(self):
+        """Test that an entry is a miss once its TTL has passed."""
+        clock = FakeClock()
+        cache = AnalyticsCache(ttl_seconds=10, max_entries=10, clock=clock)
+        cache.put("key", 1)
+
+        clock.now = 9
+        self.assertEqual(cache.get("key"), (True, 1))
+        clock.now = 10
+        self.assertEqual(cache.get("key"), (False, None))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the least recently used entry is evicted above max_entries."""
+        cache = AnalyticsCache(ttl_seconds=60, max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+class TestMemoizedAnalyticsService(unittest.TestCase):
+    """Tests for memoization of AnalyticsService methods."""
+
+    def setUp(self):
+        self.mock_repository = Mock(spec=StudentRepositoryInterface)
+        self.mock_repository.get_all.return_value = [create_test_student()]
+        self.cache = AnalyticsCache(ttl_seconds=60, max_entries=10)
+        self.service = AnalyticsService(self.mock_repository, self.cache)
+
+    @patch('app.services.analytics_cache.get_data_version', return_value=1)
+    def test_repeated_call_is_served_from_cache(self, _):
+        """Test that the same call with the same arguments loads students once."""
+        first = self.service.get_age_group_statistics(date(2025, 6, 1), date(2025, 6, 7))
+        second = self.service.get_age_group_statistics(date(2025, 6, 1), date(2025, 6, 7))
+
+        self.assertEqual(first, second)
+        self.mock_repository.get_all.assert_called_once()
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    @patch('app.services.analytics_cache.get_data_version')
+    def test_data_change_invalidates_results(self, get_data_version):
+        """Test that a new data version recomputes the statistics."""
+        get_data_version.return_value = 1
+        self.service.get_age_group_statistics(date(2025, 6, 1), date(2025, 6, 7))
+
+        get_data_version.return_value = 2
+        self.mock_repository.get_all.return_value = []
+        result = self.service.get_age_group_statistics(date(2025, 6, 1), date(2025, 6, 7))
+
+        self.assertEqual(result["total"], 0)
+        self.assertEqual(self.mock_repository.get_all.call_count, 2)
+
+    def test_service_without_cache_always_recomputes(self):
+        """Test that no caching is done when the service has no cache."""
+        service = AnalyticsService(self.mock_repository)
+
+        service.get_age_group_statistics(date(2025, 6, 1), date(2025, 6, 7))
+        service.get_age_group_statistics(date(2025, 6, 1), date(2025, 6, 7))
+
+        self.assertEqual(self.mock_repository.get_all.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
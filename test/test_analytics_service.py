@@ -1,4 +1,7 @@
 """Tests for analytics service."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
 import unittest
 from unittest.mock import Mock
 from datetime import date
@@ -118,6 +121,59 @@ class TestAnalyticsService(unittest.TestCase):
         # Verify period
         self.assertEqual(stats['period']['start_date'], '2025-06-01')
         self.assertEqual(stats['period']['end_date'], '2025-06-07')
+        
+        # All statistics are computed from one load
+        self.mock_repository.get_all.assert_called_once()
+
+    def test_comprehensive_statistics_match_individual_statistics(self):
+        """Test that the single-pass statistics equal the individual statistics."""
+        self.test_students.extend([
+            create_test_student(id=9, age_group=None, level=" advanced ", number_of_surf_lessons=6),
+            create_test_student(id=10, age_group="Adults >18 years", level="PRO", number_of_surf_lessons=1),
+            create_test_student(id=11, booking_status="expired", number_of_surf_lessons=2),
+        ])
+        start, end = date(2025, 6, 1), date(2025, 6, 7)
+        
+        stats = self.analytics_service.get_comprehensive_statistics(start, end)
+        
+        self.assertEqual(stats['age_groups'], self.analytics_service.get_age_group_statistics(start, end))
+        self.assertEqual(stats['surf_lessons'], self.analytics_service.get_surf_lesson_statistics(start, end))
+        self.assertEqual(stats['skill_levels'], self.analytics_service.get_level_distribution(start, end))
+
+    def test_get_lessons_per_day_forecast(self):
+        """Test forecasting lessons per day for active students with lessons."""
+        forecast = self.analytics_service.get_lessons_per_day_forecast(
+            date(2025, 6, 1),
+            date(2025, 6, 7)
+        )
+
+        self.assertEqual(len(forecast), 7)
+        self.assertEqual(forecast[0], {"date": "2025-06-01", "lessons": 0})  # arrival day
+        self.assertEqual(forecast[1], {"date": "2025-06-02", "lessons": 6})  # IDs 1-6
+        self.assertEqual(forecast[2], {"date": "2025-06-03", "lessons": 6})
+        self.assertEqual(forecast[3], {"date": "2025-06-04", "lessons": 4})  # IDs 4 and 6 booked 2
+        self.assertEqual(forecast[6], {"date": "2025-06-07", "lessons": 0})  # departure day
+
+    def test_get_monthly_overview(self):
+        """Test the monthly overview loads students once."""
+        overview = self.analytics_service.get_monthly_overview(2025)
+
+        self.assertEqual(len(overview), 12)
+        self.assertEqual(overview[5]["month_name"], "June")
+        self.assertEqual(overview[5]["total_guests"], 7)
+        self.assertEqual(overview[5]["total_lessons"], 19)
+        self.assertEqual(overview[6]["total_guests"], 0)
+        self.mock_repository.get_all.assert_called_once()
+
+    def test_get_year_over_year(self):
+        """Test comparing years with changes to the previous year."""
+        comparison = self.analytics_service.get_year_over_year([2024, 2025])
+
+        self.assertEqual([entry["year"] for entry in comparison], [2024, 2025])
+        self.assertNotIn("total_guests_change", comparison[0]["months"][5])
+        self.assertEqual(comparison[1]["months"][5]["total_guests_change"], 7)
+        self.assertEqual(comparison[1]["months"][5]["total_lessons_change"], 19)
+        self.mock_repository.get_all.assert_called_once()
 
 
 class TestFlexibleAnalytics(unittest.TestCase):
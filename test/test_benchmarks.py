@@ -0,0 +1,75 @@
+"""Tests for the synthetic season generator and the benchmark regression check."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import json
+import unittest
+from collections import Counter
+
+from benchmarks.run_benchmarks import BASELINE_PATH, find_regressions, run_benchmarks
+from benchmarks.synthetic_season import generate_students
+
+
+class TestSyntheticSeason(unittest.TestCase):
+    """Tests for generate_students."""
+
+    def test_same_seed_gives_same_students(self):
+        """Test that the generator is deterministic for a seed."""
+        self.assertEqual(list(generate_students(500, seed=3)), list(generate_students(500, seed=3)))
+        self.assertNotEqual(list(generate_students(500, seed=3)), list(generate_students(500, seed=4)))
+
+    def test_realistic_season(self):
+        """Test that stays, age groups and bookings follow the configured distributions."""
+        students = list(generate_students(5000))
+
+        self.assertEqual([s["id"] for s in students], list(range(1, 5001)))
+        stay_lengths = Counter((s["departure"] - s["arrival"]).days for s in students)
+        self.assertEqual(stay_lengths.most_common(1)[0][0], 7)
+        self.assertGreater(Counter(s["age_group"] for s in students)["Adults >18 years"], 3000)
+        self.assertTrue(all(s["level"] is None for s in students if s["age_group"] == "Kids 5-12"))
+
+        bookings = {}
+        for student in students:
+            bookings.setdefault(student["booking_number"], set()).add((student["arrival"], student["departure"]))
+        self.assertLess(len(bookings), len(students))
+        self.assertTrue(all(len(stays) == 1 for stays in bookings.values()))
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Tests for running benchmarks and detecting regressions."""
+
+    def test_run_records_time_and_queries(self):
+        """Test that a benchmark run reports the queries of each case."""
+        results = run_benchmarks(300, repeat=1, cases=["analytics.comprehensive", "students.for_date"])
+
+        self.assertEqual(set(results), {"analytics.comprehensive", "students.for_date"})
+        self.assertEqual(results["students.for_date"]["queries"], 1)
+        self.assertGreaterEqual(results["analytics.comprehensive"]["seconds"], 0)
+
+    def test_rollup_analytics_keep_baseline_queries(self):
+        """Test that the rollup analytics issue no more queries than the stored baseline."""
+        cases = ["analytics.comprehensive", "analytics.flexible_weekly", "analytics.year_over_year"]
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)["10000"]
+
+        results = run_benchmarks(300, repeat=1, cases=cases)
+
+        self.assertEqual({case: results[case]["queries"] for case in cases},
+                         {case: baseline[case]["queries"] for case in cases})
+
+    def test_more_queries_or_slower_is_a_regression(self):
+        """Test that extra queries and slowdowns beyond the tolerance are reported."""
+        baseline = {"a": {"seconds": 1.0, "queries": 2}, "b": {"seconds": 1.0, "queries": 2},
+                    "c": {"seconds": 0.001, "queries": 1}}
+        results = {"a": {"seconds": 1.2, "queries": 3}, "b": {"seconds": 1.6, "queries": 2},
+                   "c": {"seconds": 0.01, "queries": 1}, "new": {"seconds": 5.0, "queries": 9}}
+
+        regressions = find_regressions(results, baseline, tolerance=0.5)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("a: 3 queries"))
+        self.assertTrue(regressions[1].startswith("b: 1.6000s"))
+
+
+if __name__ == '__main__':
+    unittest.main()
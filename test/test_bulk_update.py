@@ -0,0 +1,161 @@
+"""Tests for updating many students at once during reconciliation."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import date
+from unittest.mock import Mock, patch
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import create_db_engine
+from app.data.orm_models import Base, StudentORM
+from app.data.sql_alchemey_repository_impl import (SQLAlchemyStudentRepositoryImpl,
+                                                   SQLAlchemyDailyStatsRepositoryImpl)
+from app.services.student_transformer_service import StudentTransformerService
+from test.test_helpers import create_test_student
+
+
+class TestUpdateMany(unittest.TestCase):
+    """Tests for SQLAlchemyStudentRepositoryImpl.update_many."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'bulk.db')}")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        for i in range(1, 301):
+            student = create_test_student(id=i, booking_number=f"B{i}")
+            self.session.add(StudentORM(**{
+                column.name: getattr(student, column.name) for column in StudentORM.__table__.columns
+            }))
+        self.session.commit()
+        self.repository = SQLAlchemyStudentRepositoryImpl(self.session)
+
+        self.updates = []
+        event.listen(self.engine, "before_cursor_execute", self.record_update)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def record_update(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE students"):
+            self.updates.append(executemany)
+
+    def test_updates_in_one_executemany(self):
+        """Test that all changes are written by a single executemany UPDATE."""
+        changes = [(i, create_test_student(id=None, booking_number=f"B{i}", level="ADVANCED",
+                                           departure=date(2025, 6, 10)))
+                   for i in range(1, 201)]
+
+        updated = self.repository.update_many(changes)
+
+        self.assertEqual(updated, 200)
+        self.assertEqual(self.updates, [True])
+        students = {s.id: s for s in self.repository.get_all()}
+        self.assertEqual(students[150].level, "ADVANCED")
+        self.assertEqual(students[150].departure, date(2025, 6, 10))
+        self.assertEqual(students[250].level, "BEGINNER")
+
+    def test_counts_only_existing_students(self):
+        """Test that ids missing from the table are not counted."""
+        changes = [(1, create_test_student(level="INTERMEDIATE")), (999, create_test_student())]
+
+        self.assertEqual(self.repository.update_many(changes), 1)
+        self.assertEqual(self.repository.update_many([]), 0)
+
+    def test_refreshes_daily_stats(self):
+        """Test that the rollup rows of the old and new days are refreshed."""
+        rollup = SQLAlchemyDailyStatsRepositoryImpl(self.session)
+        rollup.ensure_built()
+
+        self.repository.update_many([(i, create_test_student(arrival=date(2025, 7, 1), departure=date(2025, 7, 8)))
+                                     for i in range(1, 51)])
+
+        refreshed = rollup.get_daily_totals(date(2025, 12, 31))
+        rollup.rebuild()
+        self.assertEqual(refreshed, rollup.get_daily_totals(date(2025, 12, 31)))
+
+
+class TestSaveAll(unittest.TestCase):
+    """Tests for SQLAlchemyStudentRepositoryImpl.save_all."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'save_all.db')}")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.repository = SQLAlchemyStudentRepositoryImpl(self.session)
+        self.rollup = SQLAlchemyDailyStatsRepositoryImpl(self.session)
+        self.rollup.ensure_built()
+
+        self.rollup_deletes = []
+        event.listen(self.engine, "before_cursor_execute", self.record_rollup_delete)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def record_rollup_delete(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM daily_stats"):
+            self.rollup_deletes.append(statement)
+
+    def test_saves_in_one_refresh_and_version_bump(self):
+        """Test that many new students refresh the rollup and bump the data version once."""
+        students = [create_test_student(id=None, booking_number=f"B{i}", arrival=date(2025, 6, 1 + i % 20),
+                                        departure=date(2025, 6, 10 + i % 20)) for i in range(100)]
+
+        with patch("app.data.sql_alchemey_repository_impl.bump_data_version") as bump_data_version:
+            saved = self.repository.save_all(students)
+
+        bump_data_version.assert_called_once_with()
+        self.assertEqual(len(self.rollup_deletes), 1)
+        self.assertEqual([s.id for s in saved], list(range(1, 101)))
+        self.assertEqual(saved, self.repository.get_all())
+        refreshed = self.rollup.get_daily_totals(date(2025, 12, 31))
+        self.rollup.rebuild()
+        self.assertEqual(refreshed, self.rollup.get_daily_totals(date(2025, 12, 31)))
+        self.assertEqual(self.repository.save_all([]), [])
+
+    def test_failed_refresh_saves_nothing(self):
+        """Test that the students are not committed when the rollup refresh of the same write fails."""
+        students = [create_test_student(id=None, booking_number=f"B{i}") for i in range(3)]
+
+        with patch.object(SQLAlchemyDailyStatsRepositoryImpl, "_insert", side_effect=RuntimeError("refresh")), \
+                self.assertRaises(RuntimeError):
+            self.repository.save_all(students)
+        self.session.rollback()
+
+        self.assertEqual(self.repository.get_all(), [])
+
+
+class TestMatchSaveStudents(unittest.TestCase):
+    """Tests for collecting the changed students of an import."""
+
+    def test_changed_students_are_updated_together(self):
+        """Test that changed students are written with one bulk update, new ones saved."""
+        repository = Mock()
+        repository.update_many.return_value = 2
+        repository.save_all.side_effect = lambda students, bump_version: [replace(s, id=20) for s in students]
+        service = StudentTransformerService(Mock(), repository)
+        in_db = [create_test_student(id=10, first_name="Ana"), create_test_student(id=11, first_name="Ben"),
+                 create_test_student(id=12, first_name="Cy")]
+        incoming = [replace(in_db[0], id=None, level="ADVANCED"), replace(in_db[1], id=None, tent="T9"),
+                    replace(in_db[2], id=None), create_test_student(id=None, first_name="Dee", gender="F")]
+
+        service.match_save_students(incoming, in_db)
+
+        repository.update_many.assert_called_once_with([(10, incoming[0]), (11, incoming[1])], bump_version=False)
+        repository.update.assert_not_called()
+        repository.save_all.assert_called_once_with([incoming[3]], bump_version=False)
+        repository.save.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""Tests for the crew reference data cache."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import asyncio
+import re
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.async_db import create_async_db_engine
+from app.core.data_version import (CREW_DATA_VERSION, CREW_REFERENCE_VERSION, DATA_VERSION, bump_data_version,
+                                   get_data_version)
+from app.core.db import create_db_engine
+from app.data.async_repository_impl import (AsyncSQLAlchemyCrewMemberRepositoryImpl,
+                                            AsyncSQLAlchemyPositionRepositoryImpl,
+                                            AsyncSQLAlchemyCrewAssignmentRepositoryImpl,
+                                            AsyncSQLAlchemyAccommodationRepositoryImpl)
+from app.data.orm_models import Base
+from app.data.sql_alchemey_repository_impl import (SQLAlchemyCrewMemberRepositoryImpl,
+                                                   SQLAlchemyPositionRepositoryImpl,
+                                                   SQLAlchemyCrewAssignmentRepositoryImpl,
+                                                   SQLAlchemyAccommodationRepositoryImpl,
+                                                   SQLAlchemyAccommodationAssignmentRepositoryImpl)
+from app.domain.models import Accommodation, CrewMember, Position, Team
+from app.services.crew_reference_cache import CrewReferenceCache
+from app.services.crew_service import AsyncCrewService, CrewService
+
+REFERENCE_TABLES = ("crew_members", "positions", "accommodations")
+START = date(2025, 6, 1)
+
+
+class TestCrewReferenceCache(unittest.TestCase):
+    """Tests for CrewService lookups served from the reference cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.tmp_dir.name, 'crew.db')
+        self.engine = create_db_engine(f"sqlite:///{self.database_path}")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.reference_cache = CrewReferenceCache()
+        self.service = self.crew_service(self.reference_cache)
+
+        for i in range(1, 6):
+            self.service.create_crew_member(CrewMember(None, f"Crew{i}", "Member", f"c{i}@test.com", "1",
+                                                       Team.SURF if i % 2 else Team.YOGA, "", ""))
+        self.service.create_position(Position(None, "Instructor", Team.SURF, ""))
+        self.service.create_position(Position(None, "Teacher", Team.YOGA, ""))
+        self.service.create_accommodation(Accommodation(None, "Tent 1", "tent", 4))
+
+        self.reference_queries = []
+        event.listen(self.engine, "before_cursor_execute", self.record_query)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def crew_service(self, reference_cache=None):
+        return CrewService(
+            crew_member_repo=SQLAlchemyCrewMemberRepositoryImpl(self.session),
+            position_repo=SQLAlchemyPositionRepositoryImpl(self.session),
+            crew_assignment_repo=SQLAlchemyCrewAssignmentRepositoryImpl(self.session),
+            accommodation_repo=SQLAlchemyAccommodationRepositoryImpl(self.session),
+            accommodation_assignment_repo=SQLAlchemyAccommodationAssignmentRepositoryImpl(self.session),
+            reference_cache=reference_cache
+        )
+
+    def record_query(self, conn, cursor, statement, parameters, context, executemany):
+        table = re.search(r"\bFROM (\w+)", statement)
+        if statement.startswith("SELECT") and table and table.group(1) in REFERENCE_TABLES:
+            self.reference_queries.append(statement)
+
+    def assign_week(self):
+        for day in range(7):
+            for crew_member_id in range(1, 6):
+                self.service.assign_crew(crew_member_id, 1 if crew_member_id % 2 else 2,
+                                         START + timedelta(days=day))
+
+    def test_validation_loads_each_table_once(self):
+        """Test that validating many assignments reads each reference table once."""
+        self.assign_week()
+        self.service.assign_accommodation(1, 1, START, START + timedelta(days=6))
+
+        self.assertEqual(len(self.reference_queries), len(REFERENCE_TABLES))
+        self.assertEqual(self.reference_cache.loads, 1)
+        with self.assertRaisesRegex(ValueError, "Position with id 9 not found"):
+            self.service.assign_crew(1, 9, START)
+
+    def test_calendar_matches_uncached_calendar(self):
+        """Test that the calendar built from cached references equals the per-row version."""
+        self.assign_week()
+        end = START + timedelta(days=6)
+        self.reference_queries.clear()
+
+        cached = self.service.get_crew_calendar(START, end, Team.SURF)
+
+        self.assertEqual(self.reference_queries, [])
+        self.assertEqual(cached, self.crew_service().get_crew_calendar(START, end, Team.SURF))
+        self.assertEqual(len(cached["calendar"]["2025-06-03"]), 3)
+
+    def test_writes_invalidate_references(self):
+        """Test that creating, updating and deleting through the service invalidates the cache."""
+        self.assertEqual(self.service.get_crew_member_by_id(1).first_name, "Crew1")
+        version = self.reference_cache.version
+
+        self.service.update_crew_member(1, {"first_name": "Renamed"})
+        self.assertEqual(self.service.get_crew_member_by_id(1).first_name, "Renamed")
+
+        created = self.service.create_position(Position(None, "Coach", Team.SURF, ""))
+        self.assertEqual([p.name for p in self.service.get_positions(Team.SURF)], ["Instructor", "Coach"])
+
+        self.service.delete_position(created.id)
+        self.assertIsNone(self.service.get_position_by_id(created.id))
+        self.assertEqual(self.reference_cache.version, version + 3)
+
+    def test_other_worker_writes_reload(self):
+        """Test that a reference version bumped by another worker reloads the cache."""
+        self.service.get_accommodations()
+        self.service.get_accommodations()
+        bump_data_version(CREW_REFERENCE_VERSION)
+        self.service.get_accommodations()
+
+        self.assertEqual(self.reference_cache.loads, 2)
+
+    def test_crew_writes_keep_data_version(self):
+        """Test that crew writes move the crew data version, not the student data version."""
+        data_version = get_data_version(DATA_VERSION)
+        crew_data_version = get_data_version(CREW_DATA_VERSION)
+
+        self.assign_week()
+        self.service.assign_accommodation(1, 1, START, START + timedelta(days=6))
+
+        self.assertEqual(get_data_version(DATA_VERSION), data_version)
+        self.assertEqual(get_data_version(CREW_DATA_VERSION), crew_data_version + 36)
+
+    def test_async_calendar(self):
+        """Test that the async calendar uses the cache and matches the sync calendar."""
+        self.assign_week()
+        end = START + timedelta(days=6)
+
+        async def calendar():
+            engine = create_async_db_engine(f"sqlite+aiosqlite:///{self.database_path}")
+            async with AsyncSession(engine) as session:
+                service = AsyncCrewService(AsyncSQLAlchemyCrewAssignmentRepositoryImpl(session),
+                                           AsyncSQLAlchemyPositionRepositoryImpl(session),
+                                           AsyncSQLAlchemyCrewMemberRepositoryImpl(session),
+                                           AsyncSQLAlchemyAccommodationRepositoryImpl(session),
+                                           reference_cache=CrewReferenceCache())
+                result = await service.get_crew_calendar(START, end, Team.YOGA)
+            await engine.dispose()
+            return result
+
+        self.assertEqual(asyncio.run(calendar()), self.service.get_crew_calendar(START, end, Team.YOGA))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Tests for the daily stats rollup and the analytics answered from it."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import create_db_engine
+from app.data.orm_models import Base, StudentORM, DailyStatsORM
+from app.data.sql_alchemey_repository_impl import (SQLAlchemyStudentRepositoryImpl,
+                                                   SQLAlchemyDailyStatsRepositoryImpl)
+from app.services.analytics_service import AnalyticsService
+from app.utils.daily_stats import build_rollup_rows, overlap_totals
+from app.utils.date_utils import TimePeriod
+from test.test_helpers import create_test_student
+
+AGE_GROUPS = ["Adults >18 years", "Teens 13-18", "Kids 5-12", None]
+LEVELS = ["BEGINNER", "Beginner Plus", "INTERMEDIATE", "ADVANCED", None]
+
+
+def random_students(count, seed=11):
+    rng = random.Random(seed)
+    students = []
+    for i in range(1, count + 1):
+        arrival = date(2025, 1, 1) + timedelta(days=rng.randrange(365))
+        students.append(create_test_student(
+            id=i,
+            age_group=rng.choice(AGE_GROUPS),
+            level=rng.choice(LEVELS),
+            booking_status=rng.choice(["confirmed", "confirmed", "cancelled"]),
+            arrival=arrival,
+            departure=arrival + timedelta(days=rng.randrange(0, 21)),
+            number_of_surf_lessons=rng.choice([0, 0, 3, 5, 10])
+        ))
+    return students
+
+
+class TestOverlapTotals(unittest.TestCase):
+    """Tests for answering periods from the arrival/departure rows."""
+
+    def test_counts_students_overlapping_each_period(self):
+        """Test that stays touching the period boundaries are counted and others are not."""
+        students = [
+            create_test_student(id=1, arrival=date(2025, 6, 1), departure=date(2025, 6, 5)),
+            create_test_student(id=2, arrival=date(2025, 6, 5), departure=date(2025, 6, 9)),
+            create_test_student(id=3, arrival=date(2025, 6, 10), departure=date(2025, 6, 12)),
+        ]
+        stats_rows, _ = build_rollup_rows(students)
+
+        totals = overlap_totals(stats_rows, [(date(2025, 6, 5), date(2025, 6, 5)),
+                                             (date(2025, 6, 6), date(2025, 6, 10)),
+                                             (date(2025, 6, 13), date(2025, 6, 20))])
+
+        self.assertEqual([t["guests"] for t in totals], [2, 2, 0])
+
+
+class TestDailyStatsRollup(unittest.TestCase):
+    """Tests that analytics from the rollup match scanning the students."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'rollup.db')}")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        for student in random_students(200):
+            self.session.add(StudentORM(**{
+                column.name: getattr(student, column.name) for column in StudentORM.__table__.columns
+            }))
+        self.session.commit()
+
+        self.student_repository = SQLAlchemyStudentRepositoryImpl(self.session)
+        self.scanning = AnalyticsService(self.student_repository)
+        self.rollup = AnalyticsService(self.student_repository,
+                                       daily_stats_repository=SQLAlchemyDailyStatsRepositoryImpl(self.session))
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def assert_same_analytics(self):
+        for start, end in [(date(2025, 3, 1), date(2025, 3, 31)), (date(2025, 6, 10), date(2025, 6, 10)),
+                           (date(2024, 12, 1), date(2026, 1, 31))]:
+            self.assertEqual(self.rollup.get_comprehensive_statistics(start, end),
+                             self.scanning.get_comprehensive_statistics(start, end))
+        self.assertEqual(self.rollup.get_flexible_analytics(date(2025, 1, 1), date(2025, 12, 31), TimePeriod.WEEKLY),
+                         self.scanning.get_flexible_analytics(date(2025, 1, 1), date(2025, 12, 31), TimePeriod.WEEKLY))
+        self.assertEqual(self.rollup.get_year_over_year([2025, 2026]), self.scanning.get_year_over_year([2025, 2026]))
+
+    def test_rollup_is_built_lazily_and_matches_scanning(self):
+        """Test that the first rollup query builds the table and gives the scanned results."""
+        self.assertIsNone(self.session.query(DailyStatsORM.day).first())
+
+        self.assert_same_analytics()
+
+        self.assertIsNotNone(self.session.query(DailyStatsORM.day).first())
+
+    def test_rollup_follows_student_writes(self):
+        """Test that saving, updating and deleting students refreshes the affected days."""
+        self.rollup.get_comprehensive_statistics(date(2025, 1, 1), date(2025, 12, 31))
+
+        # StudentORM.from_domain cannot build students, so updates and inserts go through the ORM
+        student = self.session.get(StudentORM, 5)
+        changed_days = [student.arrival, student.departure, date(2025, 3, 2), date(2025, 3, 20)]
+        student.arrival, student.departure = date(2025, 3, 2), date(2025, 3, 20)
+        student.number_of_surf_lessons = 7
+        self.session.add(StudentORM(**{
+            column.name: getattr(create_test_student(id=500, arrival=date(2025, 3, 5), departure=date(2025, 3, 9)),
+                                 column.name)
+            for column in StudentORM.__table__.columns
+        }))
+        self.session.commit()
+        SQLAlchemyDailyStatsRepositoryImpl(self.session).refresh_days(
+            changed_days + [date(2025, 3, 5), date(2025, 3, 9)])
+        self.student_repository.delete(6)
+
+        self.assert_same_analytics()
+
+    def test_students_written_outside_repositories_need_a_rebuild(self):
+        """Test that students written with raw SQL are included after a rebuild."""
+        self.rollup.get_comprehensive_statistics(date(2025, 1, 1), date(2025, 12, 31))
+
+        self.session.execute(text(
+            "INSERT INTO students (id, booking_number, age_group, level, arrival, departure, booking_status, "
+            "number_of_surf_lessons) VALUES (900, 'RAW', 'Adults >18 years', 'BEGINNER', '2025-03-05', '2025-03-09', "
+            "'confirmed', 5)"))
+        self.session.execute(text("UPDATE students SET level = 'ADVANCED' WHERE id = 7"))
+        self.session.commit()
+        SQLAlchemyDailyStatsRepositoryImpl(self.session).rebuild()
+
+        self.assert_same_analytics()
+
+    def test_rollup_without_marker_is_rebuilt(self):
+        """Test that rollup rows written without the BUILT marker are rebuilt on the next read."""
+        repository = SQLAlchemyDailyStatsRepositoryImpl(self.session)
+        repository._insert(*build_rollup_rows(random_students(200)[:50]))
+        self.session.commit()
+
+        self.assert_same_analytics()
+
+    def test_built_rollup_is_read_without_scanning_students(self):
+        """Test that reads of a built rollup neither rebuild it nor query the students table."""
+        repository = SQLAlchemyDailyStatsRepositoryImpl(self.session)
+        repository.ensure_built()
+        statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        with patch.object(SQLAlchemyDailyStatsRepositoryImpl, "rebuild") as rebuild:
+            repository.ensure_built()
+            self.rollup.get_flexible_analytics(date(2025, 1, 1), date(2025, 12, 31), TimePeriod.WEEKLY)
+            self.rollup.get_year_over_year([2025, 2026])
+            self.rollup.get_comprehensive_statistics(date(2025, 1, 1), date(2025, 12, 31))
+
+        rebuild.assert_not_called()
+        self.assertEqual(len(statements), 4)
+        self.assertFalse([statement for statement in statements if "FROM students" in statement])
+
+if __name__ == '__main__':
+    unittest.main()
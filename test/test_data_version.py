@@ -0,0 +1,56 @@
+"""Tests for the data version counters."""
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.core import data_version
+from app.core.data_version import bump_data_version, get_data_version
+
+
+def bump_many(times):
+    for _ in range(times):
+        bump_data_version("test_counter")
+
+
+class TestDataVersion(unittest.TestCase):
+    """Tests for get_data_version and bump_data_version."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.patcher = patch.object(data_version, "EXPORT_CACHE_DIR", self.tmp_dir.name)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp_dir.cleanup()
+
+    def test_concurrent_processes_lose_no_bump(self):
+        """Test that bumps from several worker processes are all counted."""
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=bump_many, args=(50,)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(get_data_version("test_counter"), 200)
+
+    def test_reads_follow_replaced_file(self):
+        """Test that a read after a bump by another process sees the new value."""
+        self.assertEqual(get_data_version("test_counter"), 0)
+        bump_data_version("test_counter")
+        self.assertEqual(get_data_version("test_counter"), 1)
+
+        context = multiprocessing.get_context("fork")
+        worker = context.Process(target=bump_many, args=(1,))
+        worker.start()
+        worker.join()
+
+        self.assertEqual(get_data_version("test_counter"), 2)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, "test_counter")))
+
+
+if __name__ == '__main__':
+    unittest.main()
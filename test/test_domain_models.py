@@ -0,0 +1,34 @@
+"""Tests for the memory layout of the domain models."""
+import unittest
+
+from app.domain.models import Student, Booking, SurfPlan
+from benchmarks.memory import compare
+from test.test_helpers import create_test_student
+
+
+class TestCompactDomainModels(unittest.TestCase):
+    """Tests for slotted domain models with interned categorical fields."""
+
+    def test_models_have_no_instance_dict(self):
+        """Test that the domain objects are slotted."""
+        self.assertFalse(hasattr(create_test_student(), "__dict__"))
+        self.assertFalse(hasattr(SurfPlan(plan_date=None), "__dict__"))
+        self.assertIn("booking_status", Booking.__slots__)
+
+    def test_categorical_fields_share_one_string(self):
+        """Test that equal categorical values of different students are the same object."""
+        first = create_test_student(id=1, age_group="".join(["Teens ", "13-18"]), level="".join(["BEGIN", "NER"]))
+        second = create_test_student(id=2, age_group="".join(["Teens 1", "3-18"]), level="".join(["BEGI", "NNER"]))
+
+        self.assertIs(first.age_group, second.age_group)
+        self.assertIs(first.level, second.level)
+
+    def test_season_uses_less_memory(self):
+        """Test that a season of slotted students takes clearly less memory than the dict layout."""
+        result = compare(2000)
+
+        self.assertLess(result["slots_bytes"], result["dict_bytes"] * 0.7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Tests for the export artifact cache."""
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from app.services.export_cache import ExportCache, etag_matches
+
+
+class TestExportCache(unittest.TestCase):
+    """Tests for ExportCache."""
+
+    def setUp(self):
+        """Set up an empty cache directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ExportCache(cache_dir=self.tmp_dir.name, max_bytes=100)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_depends_on_type_params_and_data_version(self):
+        """Test that every part of the key changes the artifact address."""
+        key = self.cache.make_key("week_overview_xlsx", {"sunday": "2025-06-01"}, data_version=1)
+
+        self.assertEqual(key, self.cache.make_key("week_overview_xlsx", {"sunday": "2025-06-01"}, data_version=1))
+        self.assertNotEqual(key, self.cache.make_key("students_html", {"sunday": "2025-06-01"}, data_version=1))
+        self.assertNotEqual(key, self.cache.make_key("week_overview_xlsx", {"sunday": "2025-06-08"}, data_version=1))
+        self.assertNotEqual(key, self.cache.make_key("week_overview_xlsx", {"sunday": "2025-06-01"}, data_version=2))
+
+    def test_key_uses_current_data_version(self):
+        """Test that bumping the data version invalidates existing keys."""
+        with patch("app.services.export_cache.get_data_version", return_value=1):
+            old_key = self.cache.make_key("students_html", {"date": None})
+        with patch("app.services.export_cache.get_data_version", return_value=2):
+            new_key = self.cache.make_key("students_html", {"date": None})
+
+        self.assertNotEqual(old_key, new_key)
+
+    def test_put_and_get(self):
+        """Test storing and reading an artifact."""
+        self.assertIsNone(self.cache.get("missing"))
+
+        self.cache.put("abc", b"content")
+
+        self.assertEqual(self.cache.get("abc"), b"content")
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently read artifact is evicted first."""
+        self.cache.put("first", b"x" * 40)
+        self.cache.put("second", b"x" * 40)
+        past = time.time() - 60
+        os.utime(os.path.join(self.tmp_dir.name, "second.export"), (past, past))
+        os.utime(os.path.join(self.tmp_dir.name, "first.export"), (past - 60, past - 60))
+
+        # Reading "first" makes "second" the least recently used artifact
+        self.cache.get("first")
+        self.cache.put("third", b"x" * 40)
+
+        self.assertIsNotNone(self.cache.get("first"))
+        self.assertIsNone(self.cache.get("second"))
+        self.assertIsNotNone(self.cache.get("third"))
+
+    def test_does_not_cache_oversized_artifacts(self):
+        """Test that artifacts larger than the cache are not stored."""
+        self.cache.put("big", b"x" * 101)
+
+        self.assertIsNone(self.cache.get("big"))
+
+    def test_etag_matches(self):
+        """Test If-None-Match parsing."""
+        self.assertTrue(etag_matches('"abc"', "abc"))
+        self.assertTrue(etag_matches('"xyz", W/"abc"', "abc"))
+        self.assertTrue(etag_matches("*", "abc"))
+        self.assertFalse(etag_matches('"xyz"', "abc"))
+        self.assertFalse(etag_matches(None, "abc"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for the streaming HTML renderer."""
+import types
+import unittest
+from datetime import date, datetime
+
+from app.domain.models import Group, Slot, SurfPlan
+from app.services.html_renderer import render_crew_calendar, render_student_groups, render_surf_plan
+from test.test_helpers import create_test_student
+
+
+class TestHtmlRenderer(unittest.TestCase):
+    """Tests for html_renderer."""
+
+    def test_render_student_groups_is_lazy(self):
+        """Test that rendering yields chunks instead of building one string."""
+        chunks = render_student_groups({"BEGINNER": [create_test_student()]})
+
+        self.assertIsInstance(chunks, types.GeneratorType)
+        self.assertTrue(next(chunks).startswith("<!DOCTYPE html>"))
+
+    def test_render_student_groups(self):
+        """Test that every group gets a heading and a row per student."""
+        html = "".join(render_student_groups({
+            "BEGINNER": [create_test_student(id=1, first_name="Anna"), create_test_student(id=2, first_name="Ben")],
+            "Kids": [create_test_student(id=3, first_name="Carl", age_group="Kids 5-12")],
+        }))
+
+        self.assertIn("<h2>BEGINNER</h2>", html)
+        self.assertIn("<h2>Kids</h2>", html)
+        self.assertEqual(html.count("<tbody>"), 2)
+        self.assertEqual(html.count("<tr><td>"), 3)
+        self.assertIn("<td>Anna</td>", html)
+        self.assertIn("<td>2025-06-01</td>", html)
+        self.assertTrue(html.rstrip().endswith("</html>"))
+
+    def test_render_escapes_values(self):
+        """Test that free text from bookings is escaped."""
+        html = "".join(render_student_groups({"<Group>": [create_test_student(first_name="<b>Eve</b>", tent=None)]}))
+
+        self.assertIn("&lt;b&gt;Eve&lt;/b&gt;", html)
+        self.assertIn("&lt;Group&gt;", html)
+        self.assertNotIn("<b>Eve</b>", html)
+
+    def test_render_surf_plan(self):
+        """Test rendering a surf plan with slots, groups and non participating guests."""
+        surf_plan = SurfPlan(
+            plan_date=date(2025, 6, 2),
+            slots=[
+                Slot(datetime(2025, 6, 2, 9, 0), [Group(level="Beginner A", age_group="Adults",
+                                                        students=[create_test_student(first_name="Anna")])]),
+                Slot(datetime(2025, 6, 2, 10, 30), [Group(level="Beginner B", age_group="Adults", students=[])]),
+            ],
+            non_participating_guests=[create_test_student(first_name="Nina", number_of_surf_lessons=0)]
+        )
+
+        html = "".join(render_surf_plan(surf_plan))
+
+        self.assertIn("Surf Plan 2025-06-02", html)
+        self.assertIn("<h2>Slot A 09:00</h2>", html)
+        self.assertIn("<h2>Slot B 10:30</h2>", html)
+        self.assertIn("<h3>Beginner A (1)</h3>", html)
+        self.assertIn("<td>Anna</td>", html)
+        self.assertIn("<td>Nina</td>", html)
+
+    def test_render_crew_calendar(self):
+        """Test rendering a crew calendar."""
+        calendar = {
+            "start_date": "2025-06-01",
+            "end_date": "2025-06-02",
+            "team": "SURF",
+            "calendar": {
+                "2025-06-01": [{
+                    "id": 1,
+                    "crew_member": {"id": 1, "first_name": "John", "last_name": "Doe", "team": "SURF"},
+                    "position": {"id": 1, "name": "Lead Instructor", "team": "SURF"},
+                    "assignment_date": "2025-06-01"
+                }],
+                "2025-06-02": [],
+            }
+        }
+
+        html = "".join(render_crew_calendar(calendar))
+
+        self.assertIn("Crew Calendar 2025-06-01 - 2025-06-02 (SURF)", html)
+        self.assertIn("<td>John</td>", html)
+        self.assertIn("<td>Lead Instructor</td>", html)
+        self.assertIn("<h2>2025-06-02</h2>\n<p>-</p>", html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Import-time budget for application startup, measured with python -X importtime."""
+import os
+import subprocess
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that are only needed by import/export endpoints and must not be loaded at startup
+DEFERRED_MODULES = {"pandas", "numpy", "deepdiff", "pymysql", "xlsxwriter", "openpyxl"}
+
+# Budget for the time spent importing our own modules (excluding fastapi/sqlalchemy themselves)
+APP_IMPORT_BUDGET_US = int(os.getenv("IMPORT_TIME_BUDGET_MS", "500")) * 1000
+
+
+def measure_import_times(statement: str = "import main"):
+    """
+    Run a statement in a fresh interpreter with -X importtime.
+
+    Returns:
+        Dictionary of module name to (self time, cumulative time) in microseconds
+    """
+    env = dict(os.environ, DATABASE_URL="sqlite:///:memory:")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    """Startup import-time checks."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.times = measure_import_times()
+
+    def test_heavy_modules_are_deferred(self):
+        """Test that importing the app does not load import/export-only dependencies."""
+        loaded = {module.split(".")[0] for module in self.times}
+
+        self.assertEqual(loaded & DEFERRED_MODULES, set())
+
+    def test_app_import_time_budget(self):
+        """Test that our own modules stay within the startup import budget."""
+        app_self_time = sum(
+            self_us for module, (self_us, _) in self.times.items()
+            if module == "main" or module == "app" or module.startswith("app.")
+        )
+
+        self.assertLess(app_self_time, APP_IMPORT_BUDGET_US,
+                        f"App modules took {app_self_time / 1000:.1f} ms to import")
+
+
+if __name__ == '__main__':
+    unittest.main()
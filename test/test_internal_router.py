@@ -0,0 +1,51 @@
+"""Tests for the authorization of the internal endpoints."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import internal_router
+from app.api.internal_router import INTERNAL_TOKEN_HEADER, require_internal_token, require_profiling_token
+
+TOKEN = "internal-token"
+
+
+class TestInternalRouter(unittest.TestCase):
+    """Tests that every internal endpoint requires a token."""
+
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(internal_router.router)
+        self.client = TestClient(app)
+
+    def test_every_route_requires_a_token(self):
+        """Test that no internal route is reachable without a token dependency."""
+        for route in internal_router.router.routes:
+            calls = {dependency.call for dependency in route.dependant.dependencies}
+            self.assertTrue(calls & {require_internal_token, require_profiling_token}, route.path)
+
+    def test_rejected_without_configured_token(self):
+        """Test that the endpoints are disabled when INTERNAL_TOKEN is not set."""
+        with patch.object(internal_router, "INTERNAL_TOKEN", None):
+            self.assertEqual(self.client.get("/internal/cache/analytics").status_code, 403)
+            self.assertEqual(self.client.get("/internal/cache/analytics",
+                                             headers={INTERNAL_TOKEN_HEADER: ""}).status_code, 403)
+
+    def test_token_required(self):
+        """Test that only requests with the internal token are answered."""
+        with patch.object(internal_router, "INTERNAL_TOKEN", TOKEN):
+            self.assertEqual(self.client.post("/internal/daily-stats/rebuild").status_code, 403)
+            self.assertEqual(self.client.get("/internal/db/queries",
+                                             headers={INTERNAL_TOKEN_HEADER: "wrong"}).status_code, 403)
+            response = self.client.get("/internal/cache/analytics", headers={INTERNAL_TOKEN_HEADER: TOKEN})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("hit_ratio", response.json())
+
+
+if __name__ == '__main__':
+    unittest.main()
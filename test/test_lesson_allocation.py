@@ -0,0 +1,75 @@
+"""Tests for lesson allocation utilities."""
+import unittest
+from datetime import date, timedelta
+
+from app.utils.lesson_allocation import planned_lesson_days, lessons_per_day, ages_on
+from test.test_helpers import create_test_student
+
+
+def _loop_allocation(student, sunday):
+    """Reference implementation: the per-day loop previously used by the weekly export."""
+    lesson_start = student.arrival + timedelta(days=1)
+    planned_lessons = 0
+    row = []
+    for i in range(7):
+        current_day = sunday + timedelta(days=i)
+        if lesson_start <= current_day < student.departure and planned_lessons < student.number_of_surf_lessons:
+            row.append(True)
+            planned_lessons += 1
+        else:
+            row.append(False)
+    return row
+
+
+class TestLessonAllocation(unittest.TestCase):
+    """Tests for lesson_allocation."""
+
+    sunday = date(2025, 6, 1)
+
+    def test_matches_weekly_export_loop(self):
+        """Test that the matrix equals the old per-student loop for a variety of stays."""
+        students = [
+            create_test_student(id=1, arrival=date(2025, 5, 31), departure=date(2025, 6, 7), number_of_surf_lessons=5),
+            create_test_student(id=2, arrival=date(2025, 6, 1), departure=date(2025, 6, 4), number_of_surf_lessons=5),
+            create_test_student(id=3, arrival=date(2025, 5, 20), departure=date(2025, 6, 10), number_of_surf_lessons=3),
+            create_test_student(id=4, arrival=date(2025, 6, 5), departure=date(2025, 6, 12), number_of_surf_lessons=10),
+            create_test_student(id=5, arrival=date(2025, 6, 2), departure=date(2025, 6, 6), number_of_surf_lessons=0),
+        ]
+
+        matrix = planned_lesson_days(students, self.sunday, 7)
+
+        self.assertEqual(matrix.shape, (5, 7))
+        for student, row in zip(students, matrix):
+            self.assertEqual(list(row), _loop_allocation(student, self.sunday), f"student {student.id}")
+
+    def test_no_students(self):
+        """Test that an empty student list gives an empty matrix."""
+        self.assertEqual(planned_lesson_days([], self.sunday, 7).shape, (0, 7))
+
+    def test_lessons_per_day_counts_lessons_taken_before_range(self):
+        """Test that the forecast takes lessons before the range into account."""
+        students = [
+            # Lessons on May 30, 31 and June 1
+            create_test_student(id=1, arrival=date(2025, 5, 29), departure=date(2025, 6, 10), number_of_surf_lessons=3),
+            # Lessons on June 2 and 3
+            create_test_student(id=2, arrival=date(2025, 6, 1), departure=date(2025, 6, 10), number_of_surf_lessons=2),
+        ]
+
+        forecast = lessons_per_day(students, date(2025, 6, 1), date(2025, 6, 4))
+
+        self.assertEqual(forecast, [
+            {"date": "2025-06-01", "lessons": 1},
+            {"date": "2025-06-02", "lessons": 1},
+            {"date": "2025-06-03", "lessons": 1},
+            {"date": "2025-06-04", "lessons": 0},
+        ])
+
+    def test_ages_on(self):
+        """Test age calculation against a fixed reference date."""
+        students = [create_test_student(birthday=date(2000, 1, 1)), create_test_student(birthday=None)]
+
+        self.assertEqual(ages_on(students, date(2025, 6, 1)), [25, ""])
+
+
+if __name__ == '__main__':
+    unittest.main()
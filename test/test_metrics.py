@@ -0,0 +1,86 @@
+"""Tests for the Prometheus metrics."""
+import threading
+import unittest
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Counter, Histogram, MetricsMiddleware, MetricsRegistry, registry
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for recording and rendering metrics."""
+
+    def test_histogram_renders_cumulative_buckets(self):
+        """Test that observations land in cumulative buckets with sum and count."""
+        histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, route="/a")
+
+        self.assertEqual(histogram.render(), [
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/a",le="0.1"} 1',
+            'latency_seconds_bucket{route="/a",le="1"} 3',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+            'latency_seconds_sum{route="/a"} 4.25',
+            'latency_seconds_count{route="/a"} 4',
+        ])
+
+    def test_counts_of_all_threads_are_summed(self):
+        """Test that the per-thread shards add up when rendered."""
+        counter = Counter("jobs_total", "Jobs.", ("kind",))
+        threads = [threading.Thread(target=lambda: [counter.inc(kind="csv") for _ in range(1000)])
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc(kind='x"y')
+
+        self.assertEqual(counter.render()[2:], ['jobs_total{kind="csv"} 4000', 'jobs_total{kind="x\\"y"} 1'])
+
+    def test_registry_renders_all_metrics(self):
+        """Test that the registry output ends with a newline and contains every metric."""
+        metrics = MetricsRegistry()
+        metrics.register(Counter("a_total", "A."))
+        metrics.register(Counter("b_total", "B.")).inc()
+
+        self.assertEqual(metrics.render(), "# HELP a_total A.\n# TYPE a_total counter\n"
+                                           "# HELP b_total B.\n# TYPE b_total counter\nb_total 1\n")
+
+
+class TestMetricsMiddleware(unittest.TestCase):
+    """Tests for the request metrics middleware."""
+
+    def setUp(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def get_item(item_id: int):
+            if item_id == 0:
+                raise HTTPException(status_code=503, detail="unavailable")
+            return {"id": item_id}
+
+        self.client = TestClient(app)
+
+    def test_requests_are_recorded_by_route_template(self):
+        """Test that latency, size, status and errors are labelled with the route template."""
+        self.client.get("/items/1")
+        self.client.get("/items/2")
+        self.client.get("/items/0")
+        self.client.get("/random/path")
+
+        output = registry.render()
+
+        self.assertIn('http_requests_total{method="GET",route="/items/{item_id}",status="200"} 2', output)
+        self.assertIn('http_request_errors_total{method="GET",route="/items/{item_id}"} 1', output)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/items/{item_id}"} 3', output)
+        self.assertIn('http_response_size_bytes_sum{method="GET",route="/items/{item_id}"} ', output)
+        self.assertIn('http_requests_total{method="GET",route="unmatched",status="404"}', output)
+        self.assertIn("http_requests_in_flight 0", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
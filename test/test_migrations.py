@@ -0,0 +1,91 @@
+"""Tests for the index migrations and the query plans using the indexes."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import tempfile
+import unittest
+from datetime import date
+
+from sqlalchemy import and_, create_engine, inspect, select, text
+
+from app.data.migrations import missing_indexes, run_migrations
+from app.data.orm_models import Base, StudentORM, CrewAssignmentORM, AccommodationAssignmentORM
+
+HOT_INDEXES = {
+    "students": {"ix_students_booking_number", "ix_students_arrival_departure"},
+    "crew_assignments": {"ix_crew_assignments_assignment_date", "ix_crew_assignments_crew_member_id"},
+    "accommodation_assignments": {"ix_accommodation_assignments_accommodation_dates"},
+}
+
+
+class TestMigrations(unittest.TestCase):
+    """Tests for adding declared indexes to an existing database."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'migrations.db')}")
+        # Database created before the indexes were declared
+        Base.metadata.create_all(bind=self.engine)
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    conn.execute(text(f"DROP INDEX {index.name}"))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def index_names(self, table):
+        return {index["name"] for index in inspect(self.engine).get_indexes(table)}
+
+    def explain(self, statement):
+        sql = str(statement.compile(self.engine, compile_kwargs={"literal_binds": True}))
+        with self.engine.connect() as conn:
+            return " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+    def test_adds_missing_indexes_once(self):
+        """Test that missing indexes are created and a second run changes nothing."""
+        created = run_migrations(self.engine)
+
+        for table, names in HOT_INDEXES.items():
+            self.assertTrue(names <= set(created))
+            self.assertTrue(names <= self.index_names(table))
+        self.assertEqual(missing_indexes(self.engine), [])
+        self.assertEqual(run_migrations(self.engine), [])
+
+    def test_creates_missing_tables(self):
+        """Test that tables missing from the database are created with their indexes."""
+        with self.engine.begin() as conn:
+            conn.execute(text("DROP TABLE crew_assignments"))
+
+        run_migrations(self.engine)
+
+        self.assertTrue(HOT_INDEXES["crew_assignments"] <= self.index_names("crew_assignments"))
+
+    def test_hot_queries_use_indexes(self):
+        """Test that the key lookups are answered through the declared indexes."""
+        run_migrations(self.engine)
+        day = date(2025, 7, 1)
+
+        plans = {
+            "ix_students_booking_number":
+                select(StudentORM).where(StudentORM.booking_number == "B1"),
+            "ix_students_arrival_departure":
+                select(StudentORM).where(and_(StudentORM.arrival <= day, StudentORM.departure >= day)),
+            "ix_crew_assignments_assignment_date":
+                select(CrewAssignmentORM).where(CrewAssignmentORM.assignment_date.between(day, day)),
+            "ix_crew_assignments_crew_member_id":
+                select(CrewAssignmentORM).where(CrewAssignmentORM.crew_member_id == 1),
+            "ix_accommodation_assignments_accommodation_dates":
+                select(AccommodationAssignmentORM).where(and_(
+                    AccommodationAssignmentORM.accommodation_id == 1,
+                    AccommodationAssignmentORM.start_date <= day,
+                    AccommodationAssignmentORM.end_date >= day)),
+        }
+        for index, statement in plans.items():
+            with self.subTest(index=index):
+                self.assertIn(f"USING INDEX {index}", self.explain(statement))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Tests for keyset pagination and field projection."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import tempfile
+import unittest
+from datetime import date
+
+from sqlalchemy.orm import sessionmaker
+
+from app.api.pagination import NEXT_CURSOR_HEADER, page_response
+from app.core.db import create_db_engine
+from app.data.orm_models import Base, StudentORM, CrewMemberORM
+from app.data.pagination import InvalidPageRequest, encode_cursor
+from app.data.sql_alchemey_repository_impl import (SQLAlchemyStudentRepositoryImpl,
+                                                   SQLAlchemyCrewMemberRepositoryImpl)
+from app.domain.models import Team
+
+
+class TestKeysetPagination(unittest.TestCase):
+    """Tests for get_page on the SQLAlchemy repositories."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'paging.db')}")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+
+        arrivals = [date(2025, 6, 3), None, date(2025, 6, 1), date(2025, 6, 3), date(2025, 6, 2)]
+        for i, arrival in enumerate(arrivals, start=1):
+            self.session.add(StudentORM(id=i, first_name=f"Student {i}", arrival=arrival,
+                                        departure=date(2025, 6, 10), number_of_surf_lessons=i))
+        for i, team in enumerate([Team.SURF, Team.YOGA, Team.SURF], start=1):
+            self.session.add(CrewMemberORM(id=i, first_name=f"Crew {i}", last_name="Member", email="crew@camp",
+                                           phone="1", team=team, skills="", notes=""))
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def collect_pages(self, get_page, **kwargs):
+        pages, cursor = [], None
+        while True:
+            items, cursor = get_page(cursor=cursor, **kwargs)
+            pages.append(items)
+            if cursor is None:
+                return pages
+
+    def test_pages_by_id_cover_all_rows_once(self):
+        """Test that following the cursors returns every student exactly once in id order."""
+        repository = SQLAlchemyStudentRepositoryImpl(self.session)
+
+        pages = self.collect_pages(repository.get_page, fields="id", limit=2)
+
+        self.assertEqual([[row["id"] for row in page] for page in pages], [[1, 2], [3, 4], [5]])
+
+    def test_pages_by_arrival_include_missing_arrivals(self):
+        """Test that ordering by (arrival, id) handles ties and students without arrival."""
+        repository = SQLAlchemyStudentRepositoryImpl(self.session)
+
+        pages = self.collect_pages(repository.get_page, fields="id", limit=2, order_by="arrival")
+
+        self.assertEqual([row["id"] for page in pages for row in page], [2, 3, 5, 1, 4])
+
+    def test_projection_returns_only_requested_fields(self):
+        """Test that only the requested columns are returned."""
+        repository = SQLAlchemyStudentRepositoryImpl(self.session)
+
+        items, _ = repository.get_page(fields="first_name,arrival", limit=1, order_by="arrival")
+
+        self.assertEqual(items, [{"first_name": "Student 2", "arrival": None}])
+
+    def test_date_range_filter(self):
+        """Test that start and end date restrict the page to overlapping stays."""
+        repository = SQLAlchemyStudentRepositoryImpl(self.session)
+
+        items, cursor = repository.get_page(fields="id", end_date=date(2025, 6, 2))
+
+        self.assertEqual([row["id"] for row in items], [3, 5])
+        self.assertIsNone(cursor)
+
+    def test_crew_members_filtered_by_team(self):
+        """Test paging crew members of one team."""
+        repository = SQLAlchemyCrewMemberRepositoryImpl(self.session)
+
+        pages = self.collect_pages(repository.get_page, fields="id,team", limit=1, team=Team.SURF)
+
+        self.assertEqual(pages, [[{"id": 1, "team": Team.SURF}], [{"id": 3, "team": Team.SURF}]])
+
+    def test_invalid_requests_are_rejected(self):
+        """Test that unknown fields, malformed cursors and cursors of another sort key are rejected."""
+        repository = SQLAlchemyStudentRepositoryImpl(self.session)
+
+        with self.assertRaises(InvalidPageRequest):
+            repository.get_page(fields="id,password")
+        with self.assertRaises(InvalidPageRequest):
+            repository.get_page(cursor="not a cursor")
+        with self.assertRaises(InvalidPageRequest):
+            repository.get_page(cursor=encode_cursor([date(2025, 6, 1), 3]), order_by="id")
+
+
+class TestNextCursorHeader(unittest.TestCase):
+    """Tests that browsers may read the next page cursor."""
+
+    def test_cursor_header_is_exposed_to_the_frontend(self):
+        """Test that a cross-origin page response lists X-Next-Cursor in Access-Control-Expose-Headers."""
+        from fastapi.testclient import TestClient
+        from main import create_app
+
+        app = create_app()
+
+        @app.get("/test-page")
+        def test_page():
+            return page_response([{"id": 1}], "next")
+
+        response = TestClient(app).get("/test-page", headers={"Origin": "http://localhost:3000"})
+
+        self.assertEqual(response.headers[NEXT_CURSOR_HEADER], "next")
+        exposed = response.headers["Access-Control-Expose-Headers"].lower().split(", ")
+        self.assertIn(NEXT_CURSOR_HEADER.lower(), exposed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+"""Tests for the per-day presence index."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+from io import BytesIO
+from unittest.mock import Mock, patch
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.data_version import bump_data_version, get_data_version
+from app.core.db import create_db_engine
+from app.data.orm_models import Base, StudentORM
+from app.data.sql_alchemey_repository_impl import SQLAlchemyStudentRepositoryImpl
+from app.services.presence_index import MAX_STAY_DAYS, PresenceIndex, bitmap_from_ids, bitmap_ids
+from app.services.student_service import StudentService
+from app.services.student_transformer_service import StudentTransformerService
+from test.test_helpers import create_test_student
+
+
+def random_students(count, seed=9):
+    rng = random.Random(seed)
+    students = []
+    for i in range(1, count + 1):
+        arrival = date(2025, 6, 1) + timedelta(days=rng.randrange(60))
+        students.append(create_test_student(
+            id=i,
+            booking_status=rng.choice(["confirmed", "confirmed", "cancelled", "expired"]),
+            arrival=arrival,
+            departure=arrival + timedelta(days=rng.randrange(0, 14))
+        ))
+    return students
+
+
+def scanned_ids(students, condition):
+    return [s.id for s in students if condition(s)]
+
+
+class TestBitmaps(unittest.TestCase):
+    """Tests for converting between ids and bitmaps."""
+
+    def test_round_trip(self):
+        """Test that the ids of a bitmap are the ids it was built from, sorted."""
+        self.assertEqual(bitmap_ids(bitmap_from_ids([70, 3, 0, 1000])), [0, 3, 70, 1000])
+        self.assertEqual(bitmap_from_ids([]), 0)
+        self.assertEqual(bitmap_ids(0), [])
+
+
+class TestPresenceIndex(unittest.TestCase):
+    """Tests that the index answers like scanning the students."""
+
+    def setUp(self):
+        self.students = random_students(400)
+        self.index = PresenceIndex()
+        self.index.build(self.students, version=1)
+
+    def assert_matches(self, students):
+        for day in [date(2025, 6, 1), date(2025, 6, 20), date(2025, 7, 31), date(2025, 9, 1)]:
+            self.assertEqual(bitmap_ids(self.index.present(day)),
+                             scanned_ids(students, lambda s: s.arrival <= day <= s.departure))
+            self.assertEqual(bitmap_ids(self.index.on_camp(day)),
+                             scanned_ids(students, lambda s: s.arrival < day < s.departure))
+            self.assertEqual(bitmap_ids(self.index.arriving(day) & ~self.index.inactive),
+                             scanned_ids(students, lambda s: s.arrival == day and s.booking_status == "confirmed"))
+            self.assertEqual(bitmap_ids(self.index.departing(day)),
+                             scanned_ids(students, lambda s: s.departure == day))
+
+    def test_days_match_scanning(self):
+        """Test present, on camp, arriving and departing students of single days."""
+        self.assert_matches(self.students)
+
+    def test_combining_days(self):
+        """Test students present on all and on any day of a week."""
+        sunday, friday = date(2025, 6, 15), date(2025, 6, 20)
+
+        self.assertEqual(bitmap_ids(self.index.present_on_all(sunday, friday)),
+                         scanned_ids(self.students, lambda s: s.arrival <= sunday and s.departure >= friday))
+        self.assertEqual(bitmap_ids(self.index.present_on_any(sunday, friday)),
+                         scanned_ids(self.students, lambda s: s.arrival <= friday and s.departure >= sunday))
+        self.assertEqual(self.index.present_on_all(friday, sunday), 0)
+        self.assertEqual(self.index.present_on_any(friday, sunday), 0)
+
+    def test_apply_changed_and_new_students(self):
+        """Test that applied students give the same index as a rebuild."""
+        changed = [create_test_student(id=5, arrival=date(2025, 7, 30), departure=date(2025, 8, 2)),
+                   create_test_student(id=6, booking_status="cancelled"),
+                   create_test_student(id=401, arrival=date(2025, 6, 19), departure=date(2025, 6, 21))]
+        self.students[4], self.students[5] = changed[0], changed[1]
+        self.students.append(changed[2])
+
+        self.assertTrue(self.index.apply(changed, since_version=1, version=2))
+
+        self.assertEqual(self.index.version, 2)
+        self.assert_matches(self.students)
+
+    def test_apply_to_stale_index(self):
+        """Test that applying to an index that missed a write marks it for rebuild."""
+        self.assertFalse(self.index.apply([create_test_student(id=5)], since_version=2, version=3))
+
+        self.assertIsNone(self.index.version)
+
+    def test_apply_after_another_writer(self):
+        """Test that a version moved by more than the import's own bump marks the index for rebuild."""
+        self.assertFalse(self.index.apply([create_test_student(id=5)], since_version=1, version=3))
+
+        self.assertIsNone(self.index.version)
+
+    def test_apply_publishes_new_bitmaps(self):
+        """Test that a snapshot taken before apply keeps answering from its own state."""
+        before = self.index.snapshot()
+        moved = create_test_student(id=5, arrival=date(2025, 9, 1), departure=date(2025, 9, 3))
+
+        self.index.apply([moved], since_version=1, version=2)
+
+        self.assertEqual(before.arriving(date(2025, 9, 1)), 0)
+        self.assertEqual(bitmap_ids(self.index.arriving(date(2025, 9, 1))), [5])
+
+    def test_mistyped_departure_is_clamped(self):
+        """Test that a stay running for centuries does not get a bitmap for every day."""
+        far_departure = date(2205, 6, 8)
+        students = self.students + [create_test_student(id=401, arrival=date(2025, 6, 1), departure=far_departure)]
+
+        with self.assertLogs("app.services.presence_index", "WARNING"):
+            self.index.build(students, version=1)
+
+        bitmaps = self.index.snapshot()
+        self.assertLess(bitmaps.days, 2 * MAX_STAY_DAYS)
+        self.assertIn(401, bitmap_ids(self.index.present(date(2025, 6, 20))))
+        self.assertEqual(bitmap_ids(self.index.departing(far_departure)), [401])
+        self.assertEqual(self.index.present(date(2100, 1, 1)), 0)
+
+
+class TestPresenceIndexServices(unittest.TestCase):
+    """Tests for the services using the presence index."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'presence.db')}")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        for student in random_students(200):
+            self.session.add(StudentORM(**{
+                column.name: getattr(student, column.name) for column in StudentORM.__table__.columns
+            }))
+        self.session.commit()
+        bump_data_version()
+        self.repository = SQLAlchemyStudentRepositoryImpl(self.session)
+        self.index = PresenceIndex().ensure_current(self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_students_for_date(self):
+        """Test that the students on camp are the ones the date range query returns."""
+        scanning = StudentService(self.repository)
+        indexed = StudentService(self.repository, presence_index=self.index)
+
+        for day in [date(2025, 6, 10), date(2025, 7, 1)]:
+            self.assertEqual(indexed.get_all_students_for_date(day),
+                             sorted(scanning.get_all_students_for_date(day), key=lambda s: s.id))
+
+    def test_manifest(self):
+        """Test the arrivals and departures of a day."""
+        day = date(2025, 6, 20)
+        students = self.repository.get_all()
+        active = [s for s in students if s.booking_status == "confirmed"]
+
+        manifest = StudentService(self.repository, presence_index=self.index).get_manifest(day)
+
+        self.assertEqual(manifest["arrivals"], [s for s in active if s.arrival == day])
+        self.assertEqual(manifest["departures"], [s for s in active if s.departure == day])
+        self.assertEqual(manifest["present"], len([s for s in active if s.arrival <= day <= s.departure]))
+
+    def test_import_applies_written_students(self):
+        """Test that the import updates a current index in place."""
+        written = [create_test_student(id=7, arrival=date(2025, 8, 1), departure=date(2025, 8, 3))]
+        service = StudentTransformerService(Mock(), Mock(), self.index)
+
+        def transform():
+            service.written_students = written
+
+        service.transform_all_bookings_into_students = transform
+        with patch.dict("app.services.loader.raw_csv_insert.BOOKING_FILE_LOADERS", {".csv": Mock()}):
+            service.import_csv_file(Mock(filename="bookings.csv", file=BytesIO(b"")))
+
+        self.assertEqual(self.index.version, get_data_version())
+        self.assertIn(7, bitmap_ids(self.index.arriving(date(2025, 8, 1))))
+
+    def test_import_with_concurrent_writer_rebuilds(self):
+        """Test that a write by another worker during the import leaves the index for rebuild."""
+        service = StudentTransformerService(Mock(), Mock(), self.index)
+
+        def transform():
+            service.written_students = [create_test_student(id=7)]
+            # Another worker writes while the import runs
+            bump_data_version()
+
+        service.transform_all_bookings_into_students = transform
+        with patch.dict("app.services.loader.raw_csv_insert.BOOKING_FILE_LOADERS", {".csv": Mock()}):
+            service.import_csv_file(Mock(filename="bookings.csv", file=BytesIO(b"")))
+
+        self.assertIsNone(self.index.version)
+
+    def test_import_bumps_version_once(self):
+        """Test that the student writes of an import are recorded by a single version bump."""
+        service = StudentTransformerService(Mock(), self.repository, self.index)
+        version = get_data_version()
+
+        def transform():
+            service.save_new_students([create_test_student(id=None, arrival=date(2025, 8, 1),
+                                                           departure=date(2025, 8, 3))])
+            service.save_updates([(3, create_test_student(id=None, arrival=date(2025, 8, 2),
+                                                          departure=date(2025, 8, 3)))])
+
+        service.transform_all_bookings_into_students = transform
+        with patch.dict("app.services.loader.raw_csv_insert.BOOKING_FILE_LOADERS", {".csv": Mock()}):
+            service.import_csv_file(Mock(filename="bookings.csv", file=BytesIO(b"")))
+
+        self.assertEqual(get_data_version(), version + 1)
+        self.assertEqual(self.index.version, version + 1)
+        self.assertEqual(bitmap_ids(self.index.arriving(date(2025, 8, 1))), [201])
+        self.assertEqual(bitmap_ids(self.index.arriving(date(2025, 8, 2))), [3])
+
+if __name__ == '__main__':
+    unittest.main()
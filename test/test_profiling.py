@@ -0,0 +1,88 @@
+"""Tests for profiling single requests."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import pstats
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import profiling
+from app.core.profiling import ProfiledRoute, ProfilingMiddleware, PROFILE_ID_HEADER, PROFILE_TOKEN_HEADER
+
+TOKEN = "secret-token"
+
+
+def slow_sync_work():
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestProfiling(unittest.TestCase):
+    """Tests for the profiling middleware and the profiled sync routes."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.patches = [patch.object(profiling, "PROFILING_TOKEN", TOKEN),
+                        patch.object(profiling, "PROFILE_DIR", self.tmp_dir.name)]
+        for p in self.patches:
+            p.start()
+
+        router = APIRouter(route_class=ProfiledRoute)
+
+        @router.get("/sync")
+        def sync_route():
+            slow_sync_work()
+            return {"ok": True}
+
+        app = FastAPI()
+        app.include_router(router)
+        app.add_middleware(ProfilingMiddleware)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmp_dir.cleanup()
+
+    def test_requests_without_token_are_not_profiled(self):
+        """Test that normal and wrongly authorized requests run without profiler."""
+        self.assertNotIn(PROFILE_ID_HEADER, self.client.get("/sync").headers)
+        self.assertNotIn(PROFILE_ID_HEADER, self.client.get("/sync", headers={PROFILE_TOKEN_HEADER: "wrong"}).headers)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_sync_route_work_appears_in_collapsed_stacks(self):
+        """Test that the threadpool work of a sync route is stored as collapsed stacks."""
+        response = self.client.get("/sync", headers={PROFILE_TOKEN_HEADER: TOKEN})
+
+        self.assertEqual(response.json(), {"ok": True})
+        profile = profiling.load_profile(response.headers[PROFILE_ID_HEADER], self.tmp_dir.name).decode()
+        lines = profile.splitlines()
+        self.assertEqual(lines[0], "# GET /sync")
+        self.assertTrue(any("slow_sync_work (test_profiling.py:" in line for line in lines[1:]))
+        for line in lines[1:]:
+            stack, microseconds = line.rsplit(" ", 1)
+            self.assertGreater(int(microseconds), 0)
+
+    def test_cprofile_stores_pstats(self):
+        """Test that the deterministic profiler stores a pstats dump."""
+        with patch.object(profiling, "PROFILER", "cprofile"):
+            response = self.client.get("/sync?profile_token=" + TOKEN)
+
+        profile_id = response.headers[PROFILE_ID_HEADER]
+        self.assertTrue(profile_id.endswith(".prof"))
+        stats = pstats.Stats(os.path.join(self.tmp_dir.name, profile_id))
+        self.assertTrue(any(function == "slow_sync_work" for _, _, function in stats.stats))
+
+    def test_load_profile_rejects_paths(self):
+        """Test that profile ids cannot point outside of the profile directory."""
+        self.assertIsNone(profiling.load_profile("../secret.collapsed", self.tmp_dir.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Tests for per-request query counting and slow query logging."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import tempfile
+import unittest
+from copy import deepcopy
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.async_db import create_async_db_engine
+from app.core.db import create_db_engine
+from app.core.query_stats import (QueryStatsMiddleware, RequestQueryStats, RouteQueryStats, QUERY_COUNT_HEADER, QUERY_TIME_HEADER,
+                                  route_query_stats)
+
+
+class TestQueryStatsMiddleware(unittest.TestCase):
+    """Tests that queries of sync and async routes are attributed to their request."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        database = os.path.join(self.tmp_dir.name, 'queries.db')
+        self.engine = create_db_engine(f"sqlite:///{database}")
+        self.async_engine = create_async_db_engine(f"sqlite+aiosqlite:///{database}")
+        route_query_stats.clear()
+
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        @app.get("/sync/{count}")
+        def run_sync(count: int):
+            with self.engine.connect() as connection:
+                for _ in range(count):
+                    connection.execute(text("SELECT 1"))
+            return {}
+
+        @app.get("/async")
+        async def run_async():
+            async with self.async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+                await connection.execute(text("SELECT 2"))
+            return {}
+
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_sync_route_query_count_header(self):
+        """Test that the queries of a sync route are counted per request."""
+        first = self.client.get("/sync/3")
+        second = self.client.get("/sync/1")
+
+        self.assertEqual(first.headers[QUERY_COUNT_HEADER], "3")
+        self.assertEqual(second.headers[QUERY_COUNT_HEADER], "1")
+        self.assertIn(QUERY_TIME_HEADER, first.headers)
+
+    def test_async_route_query_count_header(self):
+        """Test that queries issued through the async engine are counted."""
+        response = self.client.get("/async")
+
+        self.assertEqual(response.headers[QUERY_COUNT_HEADER], "2")
+
+    def test_totals_per_route_template(self):
+        """Test that requests are aggregated by route template instead of path."""
+        self.client.get("/sync/3")
+        self.client.get("/sync/1")
+
+        stats = route_query_stats.as_dict()["routes"]["GET /sync/{count}"]
+
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["queries"], 4)
+        self.assertEqual(stats["max_queries"], 3)
+
+    def test_slow_queries_are_logged_with_route(self):
+        """Test that statements over the threshold are logged with the route that issued them."""
+        with patch("app.core.query_stats.SLOW_QUERY_THRESHOLD_MS", 0), \
+                self.assertLogs("app.core.query_stats", level="WARNING") as logs:
+            self.client.get("/sync/1")
+
+        self.assertIn("GET /sync/{count}", logs.output[0])
+        self.assertIn("SELECT 1", logs.output[0])
+        self.assertEqual(route_query_stats.as_dict()["slow_queries"], 1)
+
+
+    def test_failed_statements_leave_no_state(self):
+        """Test that statements raising an error leave nothing behind on the pooled connection."""
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            info = deepcopy(connection.info)
+            for _ in range(3):
+                with self.assertRaises(OperationalError):
+                    connection.execute(text("SELECT * FROM missing"))
+            connection.execute(text("SELECT 1"))
+
+            self.assertEqual(dict(connection.info), info)
+
+
+class TestRouteQueryStats(unittest.TestCase):
+    """Tests for RouteQueryStats."""
+
+    def test_number_of_routes_is_bounded(self):
+        """Test that unknown paths cannot grow the statistics without limit."""
+        stats = RouteQueryStats(max_routes=2)
+
+        for path in ["/a", "/b", "/c"]:
+            stats.record(RequestQueryStats({"method": "GET", "path": path}))
+
+        self.assertEqual(list(stats.as_dict()["routes"]), ["GET /a", "GET /b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
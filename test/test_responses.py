@@ -0,0 +1,51 @@
+"""Tests for the orjson based domain JSON responses."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import json
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.responses import DomainJSONResponse
+from app.domain.models import SurfPlan, Slot, Group, Instructor, CrewMember, Team
+from test.test_helpers import create_test_student
+
+
+class TestDomainJSONResponse(unittest.TestCase):
+    """Tests that orjson renders the same JSON as FastAPI's encoder."""
+
+    def assert_same_as_fastapi(self, content):
+        rendered = json.loads(DomainJSONResponse(content).body)
+        self.assertEqual(rendered, json.loads(json.dumps(jsonable_encoder(content))))
+
+    def test_surf_plan_graph(self):
+        """Test a nested surf plan with slots, groups, students and instructors."""
+        students = [create_test_student(id=i, single_parent=i % 2 == 0) for i in range(50)]
+        plan = SurfPlan(
+            plan_date=date(2025, 7, 9),
+            slots=[Slot(datetime(2025, 7, 9, 10, 30, 15, 123456),
+                        [Group("BEGINNER", "Adults", students[:25], [Instructor("Lara", "L2")])]),
+                   Slot(datetime(2025, 7, 9, 14, 0), [Group("Teens", "Teens", students[25:])])],
+            non_participating_guests=[create_test_student(id=99, number_of_surf_lessons=0)]
+        )
+
+        self.assert_same_as_fastapi(plan)
+
+    def test_groups_dict_and_enums(self):
+        """Test dictionaries of student lists and enum fields."""
+        self.assert_same_as_fastapi({"beginner": [create_test_student()], "kids": []})
+        self.assert_same_as_fastapi([CrewMember(1, "Ana", "Silva", "a@b.c", "1", Team.SURF)])
+
+    def test_non_string_keys_and_fallback_types(self):
+        """Test int keys (lesson distribution) and types orjson does not know natively."""
+        self.assertEqual(json.loads(DomainJSONResponse({"lesson_distribution": {3: 2, 5: 1}}).body),
+                         {"lesson_distribution": {"3": 2, "5": 1}})
+        self.assertEqual(json.loads(DomainJSONResponse({"price": Decimal("1.5"), "tags": {"a"}}).body),
+                         {"price": 1.5, "tags": ["a"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Tests for building domain objects from Core rows on the read paths."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import asyncio
+import tempfile
+import unittest
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.async_db import create_async_db_engine
+from app.core.db import create_db_engine
+from app.data.async_repository_impl import AsyncSQLAlchemyStudentRepositoryImpl
+from app.data.orm_models import (Base, StudentORM, RawBookingORM, CrewMemberORM, PositionORM, CrewAssignmentORM,
+                                 AccommodationORM, AccommodationAssignmentORM)
+from app.data.sql_alchemey_repository_impl import (SQLAlchemyStudentRepositoryImpl, SQLAlchemyBookingRawRepositoryImpl,
+                                                   SQLAlchemyCrewAssignmentRepositoryImpl,
+                                                   SQLAlchemyAccommodationAssignmentRepositoryImpl)
+from app.domain.models import Team
+from test.test_helpers import create_test_student
+
+PACKAGES = ("surf_lesson_adults_main_season_package", "surf_lesson_kids_main_season_package", "surf_course_adults",
+            "surf_course_kids", "surf_lessons", "surf_course", "_5_day_surf_course_teens", "trial_surf_lesson_kids")
+QUANTITIES = ("surf_lesson_adults_main_season_package_qty", "surf_lesson_kids_main_season_package_qty",
+              "surf_course_adults_qty", "surf_course_kids_qty", "surf_lessons_qty", "surf_course_qty",
+              "_5_day_surf_course_teens_from_14____18_years_old_qty", "trial_surf_lesson_kids_qty")
+
+
+def raw_booking(first_name, package=None, **quantities):
+    booking = RawBookingORM(booking_id="B1", booker_id="K1", guest_first_name=first_name, guest_last_name="Doe",
+                            guest_birthday=date(1990, 1, 2), guest_gender="female", guest_group="Adults",
+                            guest_level="BEGINNER", guest_arrival_date=date(2025, 6, 1),
+                            guest_departure_date=date(2025, 6, 8), booking_status="confirmed", guest_diet="vegan",
+                            notes_one="", accommodations="T1")
+    for flag in PACKAGES:
+        setattr(booking, flag, "yes" if flag == package else "no")
+    for quantity in QUANTITIES:
+        setattr(booking, quantity, quantities.get(quantity, 0))
+    return booking
+
+
+class TestRowMappers(unittest.TestCase):
+    """Tests that the mapped read paths return the same objects as to_domain()."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.tmp_dir.name, 'mappers.db')
+        self.engine = create_db_engine(f"sqlite:///{self.database_path}")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def add(self, *objects):
+        self.session.add_all(objects)
+        self.session.commit()
+        self.session.expunge_all()
+
+    def to_domain(self, orm_class):
+        objects = [o.to_domain() for o in self.session.query(orm_class).order_by(*orm_class.__mapper__.primary_key)]
+        self.session.expunge_all()
+        return objects
+
+    def test_students(self):
+        """Test that students are read without entering the identity map."""
+        students = [create_test_student(id=i, booking_number=f"B{i % 3}", number_of_surf_lessons=i % 2)
+                    for i in range(1, 7)]
+        self.add(*[StudentORM(**{column.name: getattr(student, column.name)
+                                 for column in StudentORM.__table__.columns}) for student in students])
+        repository = SQLAlchemyStudentRepositoryImpl(self.session)
+
+        self.assertEqual(sorted(repository.get_all(), key=lambda s: s.id), self.to_domain(StudentORM))
+        self.assertEqual(repository.get_all(), students)
+        self.assertEqual(repository.get_by_id(4), students[3])
+        self.assertIsNone(repository.get_by_id(99))
+        self.assertEqual([s.id for s in repository.get_by_booking_number("B1")], [1, 4])
+        self.assertEqual([s.id for s in repository.get_students_with_booked_lessons()], [1, 3, 5])
+        self.assertEqual(len(self.session.identity_map), 0)
+
+    def test_async_students(self):
+        """Test that the async repository maps the same students."""
+        self.add(*[StudentORM(**{column.name: getattr(create_test_student(id=i), column.name)
+                                 for column in StudentORM.__table__.columns}) for i in range(1, 4)])
+
+        async def get_all():
+            engine = create_async_db_engine(f"sqlite+aiosqlite:///{self.database_path}")
+            async with AsyncSession(engine) as session:
+                students = await AsyncSQLAlchemyStudentRepositoryImpl(session).get_all()
+            await engine.dispose()
+            return students
+
+        self.assertEqual(asyncio.run(get_all()), SQLAlchemyStudentRepositoryImpl(self.session).get_all())
+
+    def test_assignments_with_related(self):
+        """Test that related objects are mapped from the joined columns, None without a match."""
+        self.add(CrewMemberORM(id=1, first_name="Ana", last_name="Lee", email="a@test.com", phone="1",
+                               team=Team.SURF),
+                 PositionORM(id=1, name="Instructor", team=Team.SURF),
+                 AccommodationORM(id=1, name="Tent 1", accommodation_type="tent", capacity=2))
+        self.add(CrewAssignmentORM(id=1, crew_member_id=1, position_id=1, assignment_date=date(2025, 6, 1)),
+                 CrewAssignmentORM(id=2, crew_member_id=1, position_id=9, assignment_date=date(2025, 6, 2)),
+                 AccommodationAssignmentORM(id=1, crew_member_id=1, accommodation_id=1, start_date=date(2025, 6, 1),
+                                            end_date=date(2025, 6, 8)))
+        crew_assignments = SQLAlchemyCrewAssignmentRepositoryImpl(self.session)
+        accommodation_assignments = SQLAlchemyAccommodationAssignmentRepositoryImpl(self.session)
+
+        mapped = crew_assignments.get_all()
+        self.assertEqual(mapped, self.to_domain(CrewAssignmentORM))
+        self.assertEqual(mapped[0].crew_member.skills, "")
+        self.assertEqual(mapped[0].position.team, Team.SURF)
+        self.assertIsNone(mapped[1].position)
+        bare = crew_assignments.get_by_date_range(date(2025, 6, 1), date(2025, 6, 1), with_related=False)
+        self.assertEqual([(a.id, a.crew_member) for a in bare], [(1, None)])
+        self.assertEqual(accommodation_assignments.get_all(), self.to_domain(AccommodationAssignmentORM))
+
+    def test_bookings(self):
+        """Test that bookings get the package name and lesson count of to_domain()."""
+        self.add(raw_booking("Ana", "surf_course_kids"), raw_booking("Ben"),
+                 raw_booking("Cy", "trial_surf_lesson_kids", surf_course_qty=2, trial_surf_lesson_kids_qty=1))
+
+        bookings = sorted(SQLAlchemyBookingRawRepositoryImpl(self.session).get_all(), key=lambda b: b.first_name)
+
+        self.assertEqual(bookings, sorted(self.to_domain(RawBookingORM), key=lambda b: b.first_name))
+        self.assertEqual([b.surf_lesson_package_name for b in bookings],
+                         ["surf course kids", "No package booked", "trial surf lesson kids"])
+        self.assertEqual(bookings[2].number_of_surf_lessons, 3)
+        self.assertEqual(bookings[0].arrival, date(2025, 6, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
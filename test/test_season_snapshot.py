@@ -0,0 +1,177 @@
+"""Tests for the columnar season snapshot."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy.orm import sessionmaker
+
+from app.core.data_version import bump_data_version
+from app.core.db import create_db_engine
+from app.data.orm_models import Base, StudentORM
+from app.data.season_snapshot import (build_season_snapshot, current_season_snapshot, encode_students,
+                                      open_snapshot, wait_for_rebuild, write_snapshot)
+from app.data.sql_alchemey_repository_impl import SQLAlchemyStudentRepositoryImpl
+from app.services.analytics_cache import AnalyticsCache
+from app.services.analytics_service import AnalyticsService
+from app.services.student_service import StudentService
+from test.test_helpers import create_test_student
+
+AGE_GROUPS = ["Adults >18 years", "Teens 13-18", "Kids 5-12", None]
+
+
+def random_students(count, seed=5):
+    rng = random.Random(seed)
+    students = []
+    for i in range(1, count + 1):
+        arrival = date(2025, 5, 1) + timedelta(days=rng.randrange(120))
+        students.append(create_test_student(
+            id=i,
+            age_group=rng.choice(AGE_GROUPS),
+            level=rng.choice(["BEGINNER", "INTERMEDIATE", "ADVANCED", None]),
+            booking_number=f"B{i // 3}",
+            booking_status=rng.choice(["confirmed", "confirmed", "cancelled", "expired"]),
+            arrival=arrival,
+            departure=arrival + timedelta(days=rng.randrange(0, 15)),
+            number_of_surf_lessons=rng.choice([0, 3, 5, 10])
+        ))
+    return students
+
+
+class TestSeasonSnapshotFiles(unittest.TestCase):
+    """Tests for writing and memory-mapping snapshots."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_columns_are_memory_mapped(self):
+        """Test that an opened snapshot maps the written columns instead of loading them."""
+        write_snapshot(encode_students(random_students(50)), 3, self.directory)
+
+        snapshot = open_snapshot(self.directory)
+
+        self.assertEqual(snapshot.version, 3)
+        self.assertEqual(len(snapshot), 50)
+        self.assertIsInstance(snapshot.arrival, np.memmap)
+        self.assertEqual(snapshot.id.tolist(), list(range(1, 51)))
+
+    def test_publishing_keeps_open_snapshots_readable(self):
+        """Test that readers of a replaced snapshot keep their data and only two snapshots stay on disk."""
+        write_snapshot(encode_students(random_students(10)), 1, self.directory)
+        old = open_snapshot(self.directory)
+
+        write_snapshot(encode_students(random_students(20)), 2, self.directory)
+        write_snapshot(encode_students(random_students(30)), 3, self.directory)
+
+        self.assertEqual(len(old), 10)
+        self.assertEqual(int(old.lessons.sum()), sum(s.number_of_surf_lessons for s in random_students(10)))
+        self.assertEqual(open_snapshot(self.directory).version, 3)
+        self.assertEqual(len([entry for entry in os.scandir(self.directory) if entry.is_dir()]), 2)
+
+    def test_no_snapshot_written(self):
+        """Test that opening an empty directory gives None."""
+        self.assertIsNone(open_snapshot(self.directory))
+
+
+class TestSeasonSnapshotQueries(unittest.TestCase):
+    """Tests that answers from the snapshot match scanning the students."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp_dir.name, "snapshot")
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'snapshot.db')}")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        for student in random_students(300):
+            self.session.add(StudentORM(**{
+                column.name: getattr(student, column.name) for column in StudentORM.__table__.columns
+            }))
+        self.session.commit()
+        self.student_repository = SQLAlchemyStudentRepositoryImpl(self.session)
+        self.snapshot = current_season_snapshot(self.session, self.directory)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_lessons_per_day_forecast(self):
+        """Test that the forecast from the snapshot equals the scanned forecast."""
+        scanning = AnalyticsService(self.student_repository)
+        from_snapshot = AnalyticsService(self.student_repository, season_snapshot=self.snapshot)
+
+        for start, end in [(date(2025, 6, 1), date(2025, 6, 30)), (date(2025, 4, 1), date(2025, 10, 1)),
+                           (date(2025, 7, 4), date(2025, 7, 4))]:
+            self.assertEqual(from_snapshot.get_lessons_per_day_forecast(start, end),
+                             scanning.get_lessons_per_day_forecast(start, end))
+
+    def test_students_of_a_week(self):
+        """Test that the students of a week, including single parents, equal the scanned ones."""
+        scanning = StudentService(self.student_repository)
+        from_snapshot = StudentService(self.student_repository, self.snapshot)
+        sunday, friday = date(2025, 6, 15), date(2025, 6, 20)
+
+        self.assertEqual(from_snapshot.get_students_by_date_range(sunday, friday),
+                         scanning.get_students_by_date_range(sunday, friday))
+        self.assertEqual(from_snapshot.get_students_with_booked_lessons_by_date_range(sunday, friday),
+                         scanning.get_students_with_booked_lessons_by_date_range(sunday, friday))
+
+    def test_snapshot_follows_data_version(self):
+        """Test that a data change is rebuilt in the background while reads fall back to the database."""
+        session_factory = sessionmaker(bind=self.engine)
+        self.assertIs(current_season_snapshot(self.session, self.directory, session_factory), self.snapshot)
+
+        self.session.query(StudentORM).filter(StudentORM.id > 100).delete()
+        self.session.commit()
+        bump_data_version()
+
+        self.assertIsNone(current_season_snapshot(self.session, self.directory, session_factory))
+        wait_for_rebuild(self.directory, timeout=10)
+        snapshot = current_season_snapshot(self.session, self.directory, session_factory)
+        self.assertEqual(len(snapshot), 100)
+        self.assertGreater(snapshot.version, self.snapshot.version)
+        self.assertEqual(len(self.snapshot), 300)
+
+    def test_stale_snapshot_is_not_cached_under_new_version(self):
+        """Test that the forecast after a write counts the new student, also once the rebuild is published."""
+        session_factory = sessionmaker(bind=self.engine)
+        cache = AnalyticsCache()
+        start, end = date(2025, 7, 6), date(2025, 7, 12)
+
+        def forecast():
+            snapshot = current_season_snapshot(self.session, self.directory, session_factory)
+            return AnalyticsService(self.student_repository, cache, season_snapshot=snapshot) \
+                .get_lessons_per_day_forecast(start, end)
+
+        forecast()
+        self.session.add(StudentORM(**{
+            column.name: getattr(create_test_student(id=900, arrival=start, departure=end,
+                                                     number_of_surf_lessons=5), column.name)
+            for column in StudentORM.__table__.columns
+        }))
+        self.session.commit()
+        bump_data_version()
+
+        expected = AnalyticsService(self.student_repository).get_lessons_per_day_forecast(start, end)
+        self.assertEqual(forecast(), expected)
+        wait_for_rebuild(self.directory, timeout=10)
+        self.assertEqual(forecast(), expected)
+
+    def test_build_publishes_snapshot(self):
+        """Test that building writes a snapshot of all students."""
+        path = build_season_snapshot(self.session, self.directory)
+
+        self.assertEqual(open_snapshot(self.directory).path, path)
+        self.assertEqual(len(open_snapshot(self.directory)), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
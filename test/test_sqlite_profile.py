@@ -0,0 +1,101 @@
+"""Tests for the SQLite profile and the portable bookings loader."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import asyncio
+import tempfile
+import unittest
+
+from sqlalchemy import text
+
+from app.core.async_db import create_async_db_engine
+from app.core.config import SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE
+from app.core.db import create_db_engine
+from app.services.loader.raw_csv_insert import csv_insert
+
+BOOKINGS_CSV = """Booking ID,Booker ID,Guest First Name,Guest Arrival Date,5-day Surf Course (teens from 14 - 18 years old),Discount %
+B1,K1,Ana,2025-06-01,yes,10
+B1,K1,Ben,2025-06-01,,
+B2,K2,Cy,2025-06-03,no,
+"""
+
+
+class TestSqliteProfile(unittest.TestCase):
+    """Tests for the PRAGMAs set on SQLite connections."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "profile.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def pragma(self, conn, name):
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_file_database(self):
+        """Test that file databases run in WAL mode with the tuned settings."""
+        engine = create_db_engine(f"sqlite:///{self.path}")
+        with engine.connect() as conn:
+            self.assertEqual(self.pragma(conn, "journal_mode"), "wal")
+            self.assertEqual(self.pragma(conn, "synchronous"), 1)  # NORMAL
+            self.assertEqual(self.pragma(conn, "mmap_size"), SQLITE_MMAP_SIZE)
+            self.assertEqual(self.pragma(conn, "cache_size"), -SQLITE_CACHE_SIZE_KB)
+        engine.dispose()
+
+    def test_memory_database(self):
+        """Test that in-memory databases keep their memory journal."""
+        engine = create_db_engine("sqlite:///:memory:")
+        with engine.connect() as conn:
+            self.assertEqual(self.pragma(conn, "journal_mode"), "memory")
+            self.assertEqual(self.pragma(conn, "cache_size"), -SQLITE_CACHE_SIZE_KB)
+        engine.dispose()
+
+    def test_async_engine(self):
+        """Test that aiosqlite connections get the same profile."""
+        async def journal_mode():
+            engine = create_async_db_engine(f"sqlite+aiosqlite:///{self.path}")
+            async with engine.connect() as conn:
+                mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            await engine.dispose()
+            return mode
+
+        self.assertEqual(asyncio.run(journal_mode()), "wal")
+
+
+class TestCsvInsert(unittest.TestCase):
+    """Tests for loading the bookings CSV through the engine."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'bookings.db')}")
+        self.csv_path = os.path.join(self.tmp_dir.name, "bookings.csv")
+        with open(self.csv_path, "w") as f:
+            f.write(BOOKINGS_CSV)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_loads_into_sqlite(self):
+        """Test that the CSV is loaded with cleaned column names and NULLs for empty cells."""
+        csv_insert(self.csv_path, bind=self.engine)
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(
+                'SELECT guest_first_name, "5_day_surf_course_teens_from_14___18_years_old", discount_percent '
+                'FROM bookings ORDER BY guest_first_name')).all()
+        self.assertEqual([tuple(row) for row in rows],
+                         [("Ana", "yes", "10"), ("Ben", None, None), ("Cy", "no", None)])
+
+    def test_reimport_replaces_bookings(self):
+        """Test that loading again replaces the previous bookings."""
+        csv_insert(self.csv_path, bind=self.engine)
+        csv_insert(self.csv_path, bind=self.engine)
+
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT COUNT(*) FROM bookings")).scalar(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
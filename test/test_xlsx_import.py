@@ -0,0 +1,91 @@
+"""Tests for importing bookings from XLSX exports."""
+import os
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+import tempfile
+import unittest
+from datetime import datetime
+
+from openpyxl import Workbook
+from sqlalchemy import text
+
+from app.core.db import create_db_engine
+from app.services.loader.raw_csv_insert import csv_insert, read_csv_chunks, read_xlsx_chunks, xlsx_insert
+
+HEADER = ["Booking ID", "Booker ID", "Guest First Name", "Guest Arrival Date", "Surf Lessons Qty", "Discount %"]
+ROWS = [
+    ["B1", "K1", "Ana", datetime(2025, 6, 1), 5, 10.5],
+    ["B1", "K1", "Ben", datetime(2025, 6, 1), None, None],
+    ["B2", "K2", "Cy", datetime(2025, 6, 3), 3.0, None],
+]
+CSV = """Booking ID,Booker ID,Guest First Name,Guest Arrival Date,Surf Lessons Qty,Discount %
+B1,K1,Ana,2025-06-01,5,10.5
+B1,K1,Ben,2025-06-01,,
+B2,K2,Cy,2025-06-03,3,
+"""
+
+
+class TestXlsxImport(unittest.TestCase):
+    """Tests that XLSX exports are staged like the CSV export."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'bookings.db')}")
+        self.xlsx_path = os.path.join(self.tmp_dir.name, "bookings.xlsx")
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(HEADER)
+        for row in ROWS:
+            sheet.append(row)
+        sheet.append([None] * len(HEADER))
+        workbook.save(self.xlsx_path)
+
+        self.csv_path = os.path.join(self.tmp_dir.name, "bookings.csv")
+        with open(self.csv_path, "w") as f:
+            f.write(CSV)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def staged_bookings(self):
+        with self.engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(text("SELECT * FROM bookings ORDER BY guest_first_name"))]
+
+    def test_rows_are_read_in_chunks(self):
+        """Test that the sheet is streamed in chunks and empty rows are skipped."""
+        chunks = list(read_xlsx_chunks(self.xlsx_path, chunk_rows=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(list(chunks[0].columns), HEADER)
+
+    def test_xlsx_is_staged_like_csv(self):
+        """Test that an XLSX export gives the same bookings rows as the CSV export."""
+        csv_insert(self.csv_path, bind=self.engine)
+        from_csv = self.staged_bookings()
+
+        xlsx_insert(self.xlsx_path, bind=self.engine)
+
+        self.assertEqual(self.staged_bookings(), from_csv)
+        self.assertEqual(from_csv[0], ("B1", "K1", "Ana", "2025-06-01", "5", "10.5"))
+
+    def test_stored_values_are_pinned(self):
+        """Test that integer columns with gaps are staged without a fraction from CSV and XLSX."""
+        expected = [("B1", "K1", "Ana", "2025-06-01", "5", "10.5"),
+                    ("B1", "K1", "Ben", "2025-06-01", None, None),
+                    ("B2", "K2", "Cy", "2025-06-03", "3", None)]
+
+        for insert, path in ((csv_insert, self.csv_path), (xlsx_insert, self.xlsx_path)):
+            with self.subTest(path=os.path.basename(path)):
+                insert(path, bind=self.engine)
+                self.assertEqual(self.staged_bookings(), expected)
+
+    def test_csv_chunks_keep_text(self):
+        """Test that a chunk of only integers is staged like a chunk with gaps."""
+        chunks = list(read_csv_chunks(self.csv_path, chunk_rows=1))
+
+        self.assertEqual([chunk["Surf Lessons Qty"].dropna().tolist() for chunk in chunks], [["5"], [], ["3"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
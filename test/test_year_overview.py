@@ -0,0 +1,76 @@
+"""Tests for the single-pass year overview."""
+import random
+import unittest
+from datetime import date, timedelta
+
+from app.utils.student_utils import is_adult, is_teen, is_kid
+from app.utils.year_overview import year_overview
+from test.test_helpers import create_test_student
+
+AGE_GROUPS = ["Adults >18 years", "Teens 13-18", "Kids 5-12", None]
+
+
+def month_statistics_by_filtering(students, year, month):
+    """Reference implementation: filter the students of the month and count them."""
+    start = date(year, month, 1)
+    end = (date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)) - timedelta(days=1)
+    in_month = [s for s in students if s.arrival <= end and s.departure >= start]
+    with_lessons = [s for s in in_month if s.number_of_surf_lessons > 0]
+    return {
+        "month": month,
+        "month_name": start.strftime("%B"),
+        "total_guests": len(in_month),
+        "guests_with_lessons": len(with_lessons),
+        "total_lessons": sum(s.number_of_surf_lessons for s in with_lessons),
+        "adults": sum(1 for s in in_month if is_adult(s)),
+        "teens": sum(1 for s in in_month if is_teen(s)),
+        "kids": sum(1 for s in in_month if is_kid(s)),
+    }
+
+
+class TestYearOverview(unittest.TestCase):
+    """Tests for year_overview."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.students = []
+        for i in range(300):
+            arrival = date(2023, 11, 1) + timedelta(days=rng.randrange(800))
+            self.students.append(create_test_student(
+                id=i,
+                age_group=rng.choice(AGE_GROUPS),
+                arrival=arrival,
+                departure=arrival + timedelta(days=rng.randrange(0, 70)),
+                number_of_surf_lessons=rng.choice([0, 0, 3, 5, 10])
+            ))
+
+    def test_matches_filtering_each_month(self):
+        """Test that binning gives the same counts as filtering every month separately."""
+        overview = year_overview(self.students, [2024, 2025])
+
+        for year in (2024, 2025):
+            expected = [month_statistics_by_filtering(self.students, year, month) for month in range(1, 13)]
+            self.assertEqual(overview[year], expected)
+
+    def test_non_contiguous_years(self):
+        """Test that years with gaps in between are returned in the requested order."""
+        overview = year_overview(self.students, [2025, 2023])
+
+        self.assertEqual(list(overview), [2025, 2023])
+        self.assertEqual(overview[2023][10], month_statistics_by_filtering(self.students, 2023, 11))
+
+    def test_students_without_dates_or_outside_range_are_ignored(self):
+        """Test that incomplete stays and stays outside the years are not counted."""
+        students = [
+            create_test_student(id=1, arrival=None, departure=date(2024, 6, 1)),
+            create_test_student(id=2, arrival=date(2020, 1, 1), departure=date(2020, 1, 5)),
+            create_test_student(id=3, arrival=date(2024, 6, 10), departure=date(2024, 5, 20)),
+        ]
+
+        overview = year_overview(students, [2024])
+
+        self.assertTrue(all(month["total_guests"] == 0 for month in overview[2024]))
+
+
+if __name__ == '__main__':
+    unittest.main()